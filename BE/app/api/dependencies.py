@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from fastapi import Cookie, HTTPException, Response, status
+import hmac
+
+from fastapi import Cookie, Header, HTTPException, Response, status
 
 from app.core.config import settings
 from app.core.security import decode_access_token
@@ -14,6 +16,33 @@ async def get_authenticated_user_id(token: str | None = Cookie(default=None, ali
     return decode_access_token(token)
 
 
+async def get_optional_user_id(token: str | None = Cookie(default=None, alias=AUTH_COOKIE_NAME)) -> str | None:
+    if not token:
+        return None
+    try:
+        return decode_access_token(token)
+    except HTTPException:
+        return None
+
+
+async def require_admin_token(token: str | None = Header(default=None, alias="X-Admin-Token")) -> None:
+    expected = settings.admin_token
+    if not expected:
+        # 토큰이 설정되지 않은 환경에서는 관리자 API 자체를 노출하지 않음
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not token or not hmac.compare_digest(token, expected):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin token")
+
+
+async def require_metrics_token(authorization: str | None = Header(default=None)) -> None:
+    expected = settings.metrics_token
+    if not expected:
+        return
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token, expected):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+
+
 def set_auth_cookie(response: Response, token: str) -> None:
     secure = not settings.debug
     same_site = "lax" if settings.debug else "none"
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.v1 import auth, checklists, llm, ocr, rooms, stt
+from app.api.v1 import admin, auth, checklists, llm, ocr, rooms, stt
 
 api_router = APIRouter(prefix="/v1")
 
@@ -10,3 +10,4 @@ api_router.include_router(rooms.router, tags=["rooms"])
 api_router.include_router(llm.router, tags=["llm"])
 api_router.include_router(stt.router, tags=["stt"])
 api_router.include_router(ocr.router, tags=["ocr"])
+api_router.include_router(admin.router, tags=["admin"])
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app.api.dependencies import require_admin_token
+from app.core.config import settings
+from app.jobs import get_job_queue
+from app.services.ocr_service import OCR_REPARSE_JOB
+from app.sessions.manager import get_session_manager
+
+router = APIRouter(prefix="/admin", dependencies=[Depends(require_admin_token)])
+
+
+@router.get("/stt/sessions")
+async def list_stt_session_resources() -> Dict[str, Any]:
+    """이 워커가 소유한 STT 세션별 리소스 사용량(열린 파일, 스레드, 큐 바이트, 경과 시간)."""
+    return await get_session_manager().resource_usage()
+
+
+@router.get("/stt/sessions/{session_id}/timeline")
+async def get_stt_session_timeline(session_id: str) -> Dict[str, Any]:
+    """세션 플라이트 레코더 덤프: 단계별 타임라인(offer, ICE, 첫 프레임, 첫 부분 결과, final, 저장)과 첫 단어까지 걸린 시간."""
+    record = await get_session_manager().flight_record(session_id)
+    if record is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session timeline not found on this worker")
+    return record
+
+
+@router.post("/stt/sessions/reap")
+async def reap_idle_stt_sessions() -> Dict[str, List[str]]:
+    """유휴 타임아웃을 넘긴 세션을 즉시 정리."""
+    return {"reaped": await get_session_manager().reap_idle()}
+
+
+@router.get("/jobs")
+async def get_job_queue_status() -> Dict[str, Any]:
+    """백그라운드 작업 큐: 종류/상태별 건수와 최근 dead-letter 작업(마지막 오류 포함)."""
+    queue = get_job_queue()
+    dead = await queue.list_dead()
+    return {
+        "counts": await queue.counts(),
+        "dead": [
+            {
+                "job_id": job.job_id,
+                "kind": job.kind,
+                "attempts": job.attempts,
+                "last_error": job.last_error,
+                "payload": job.payload,
+            }
+            for job in dead
+        ],
+    }
+
+
+@router.post("/jobs/{job_id}/retry")
+async def retry_dead_job(job_id: str) -> Dict[str, str]:
+    """dead 상태 작업을 시도 횟수를 초기화해 다시 대기열에 넣음."""
+    if not await get_job_queue().retry(job_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Dead job not found")
+    return {"job_id": job_id, "status": "queued"}
+
+
+@router.post("/ocr/reparse", status_code=status.HTTP_202_ACCEPTED)
+async def reparse_ocr_records(
+    force: bool = Query(False, description="현재 스키마 버전으로 파싱된 레코드까지 모두 재파싱"),
+) -> Dict[str, str]:
+    """저장된 원본 OCR 결과로 OpenAI 파싱만 다시 실행하는 일괄 작업을 큐에 등록 (스키마/프롬프트 변경 후, 재OCR 없음)."""
+    if not settings.jobs_enabled:
+        # 큐를 처리할 워커가 없으면 작업이 영원히 queued 로 남으므로 등록하지 않음
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Job queue is disabled (JOBS_ENABLED=false); run a job worker to re-parse OCR records.",
+        )
+    job_id = await get_job_queue().enqueue(OCR_REPARSE_JOB, {"force": force}, max_attempts=3)
+    return {"job_id": job_id, "status": "queued"}
@@ -6,6 +6,8 @@ from fastapi import APIRouter, Depends, File, HTTPException, Path, Query, Upload
 from fastapi.responses import JSONResponse
 
 from app.api.dependencies import get_authenticated_user_id
+from app.core.config import settings
+from app.core.uploads import UploadSource
 from app.models import OcrDetailResponse, OcrListResponse, OcrUploadResponse
 from app.services import OcrService, get_ocr_service
 
@@ -25,16 +27,22 @@ async def upload_ocr_document(
     service: OcrService = Depends(get_ocr_service),
 ) -> OcrUploadResponse:
     filename = file.filename
-    content = await file.read()
-    if not content:
+    # 본문은 Starlette가 이미 임시 파일로 스풀함, 메모리로 읽지 않고 파트 단위로 S3에 업로드
+    source = UploadSource(file.file)
+    if not source.size:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Empty file upload.")
+    if source.size > settings.upload_max_document_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Document exceeds the upload size limit.",
+        )
 
     return await service.upload_document(
         user_id,
         room_id,
         filename,
         file_type,
-        content,
+        source,
         file.content_type,
     )
 
@@ -5,6 +5,8 @@ from typing import List
 from fastapi import APIRouter, Depends, File, HTTPException, Path, UploadFile, status
 
 from app.api.dependencies import get_authenticated_user_id
+from app.core.config import settings
+from app.core.uploads import UploadSource
 from app.models import RoomCreateRequest, RoomDetailResponse, RoomPhoto
 from app.services import RoomService, get_room_service
 
@@ -76,15 +78,20 @@ async def upload_room_photo(
     service: RoomService = Depends(get_room_service),
 ) -> RoomPhoto:
     filename = file.filename or "photo.jpg"
-    content = await file.read()
-    if not content:
+    source = UploadSource(file.file)
+    if not source.size:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Empty file upload.")
+    if source.size > settings.upload_max_photo_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Photo exceeds the upload size limit.",
+        )
 
     photo = await service.attach_photo(
         user_id,
         room_id,
         filename,
-        content,
+        source,
         file.content_type,
     )
     if not photo:
@@ -8,10 +8,32 @@ from datetime import datetime
 from typing import Any, Dict
 from uuid import uuid4
 
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+import shutil
+from pathlib import Path as FilePath
 
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Path,
+    Query,
+    UploadFile,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+
+from app.api.dependencies import get_authenticated_user_id, get_optional_user_id
 from app.core.config import get_settings
-from app.sessions.manager import SessionManager
+from app.core.logging import bind_session
+from app.core.security import create_watch_token, verify_watch_token
+from app.sessions.admission import SessionAdmissionError
+from app.services import RoomService, STTService, get_room_service, get_stt_service
+from app.sessions.batch import recording_path
+from app.sessions.manager import get_session_manager
+from app.use_cases import STTBatchTranscriptionUseCase, get_stt_batch_use_case
 from app.sessions.stt_session import STTSession
 
 import logging
@@ -19,7 +41,7 @@ import logging
 logger = logging.getLogger(__name__)
 
 settings = get_settings()
-session_manager = SessionManager(settings=settings)
+session_manager = get_session_manager()
 
 router = APIRouter(prefix="/stt")
 
@@ -38,8 +60,169 @@ async def _ensure_session(session: Optional[STTSession], websocket: WebSocket) -
     return session
 
 
+async def _reject_session(websocket: WebSocket, exc: SessionAdmissionError) -> None:
+    await websocket.send_json(
+        {
+            "event": "error",
+            "data": {
+                "code": "SESSION_REJECTED",
+                "reason": exc.reason,
+                "message": exc.message,
+                "retryAfter": exc.retry_after,
+            },
+        },
+    )
+    # 1013 = Try Again Later
+    await websocket.close(code=1013)
+
+
+@router.get("/sessions/{session_id}")
+async def get_session_owner(
+    session_id: str = Path(..., description="STT session id"),
+    user_id: str = Depends(get_authenticated_user_id),
+) -> Dict[str, Any]:
+    record = await session_manager.lookup(session_id)
+    if not record or record.user_id != user_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found.")
+    return record.to_dict()
+
+
+@router.post("/sessions/{session_id}/stop", status_code=status.HTTP_202_ACCEPTED)
+async def stop_session(
+    session_id: str = Path(..., description="STT session id"),
+    user_id: str = Depends(get_authenticated_user_id),
+) -> Dict[str, Any]:
+    record = await session_manager.lookup(session_id)
+    if not record or record.user_id != user_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found.")
+    await session_manager.request_stop(session_id)
+    return {"session_id": session_id, "worker_id": record.worker_id, "stop_requested": True}
+
+
+@router.post("/sessions/{session_id}/watch-token")
+async def issue_watch_token(
+    session_id: str = Path(..., description="STT session id"),
+    user_id: str = Depends(get_authenticated_user_id),
+) -> Dict[str, Any]:
+    """세션 소유자가 다른 기기/보호자에게 실시간 자막 관전 권한을 공유하기 위한 토큰 발급."""
+    record = await session_manager.lookup(session_id)
+    if not record or record.user_id != user_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found.")
+    return {"session_id": session_id, "token": create_watch_token(session_id, user_id)}
+
+
+@router.post("/batch", status_code=status.HTTP_202_ACCEPTED)
+async def create_batch_transcription(
+    room_id: str = Form(...),
+    session_id: Optional[str] = Form(default=None),
+    file: Optional[UploadFile] = File(default=None),
+    user_id: str = Depends(get_authenticated_user_id),
+    rooms: RoomService = Depends(get_room_service),
+    batch: STTBatchTranscriptionUseCase = Depends(get_stt_batch_use_case),
+    stt: STTService = Depends(get_stt_service),
+) -> Dict[str, Any]:
+    """기존 세션 녹음(session_id) 또는 업로드한 오디오 파일을 오프라인으로 재인식해 방 결과로 저장."""
+    if not await rooms.get_room(user_id, room_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Room not found.")
+
+    if file is not None:
+        suffix = FilePath(file.filename or "").suffix or ".wav"
+        target = FilePath(settings.storage_dir) / "batch" / f"{uuid4().hex}{suffix}"
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            with target.open("wb") as out:
+                await asyncio.to_thread(shutil.copyfileobj, file.file, out)
+        except OSError:
+            target.unlink(missing_ok=True)
+            raise
+        job = await batch.submit(room_id, target, delete_after=True)
+    elif session_id:
+        source = recording_path(settings, session_id)
+        if source is None or not await _owns_session(user_id, session_id, rooms, stt):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Recording not found.")
+        job = await batch.submit(room_id, source)
+    else:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="session_id or file is required.")
+    return job.to_dict()
+
+
+async def _owns_session(user_id: str, session_id: str, rooms: RoomService, stt: STTService) -> bool:
+    """진행 중이면 세션 레지스트리, 종료된 세션이면 결과를 저장한 방의 소유자로 세션 소유자를 확인."""
+    record = await session_manager.lookup(session_id)
+    if record is not None:
+        return record.user_id == user_id
+    room_id = await stt.get_session_room_id(session_id)
+    return room_id is not None and bool(await rooms.get_room(user_id, room_id))
+
+
+@router.get("/batch/{job_id}")
+async def get_batch_transcription(
+    job_id: str = Path(..., description="Batch transcription job id"),
+    user_id: str = Depends(get_authenticated_user_id),
+    rooms: RoomService = Depends(get_room_service),
+    batch: STTBatchTranscriptionUseCase = Depends(get_stt_batch_use_case),
+) -> Dict[str, Any]:
+    job = await batch.get_job(job_id)
+    if not job or not await rooms.get_room(user_id, job.room_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found.")
+    return job.to_dict()
+
+
+@router.websocket("/ws/{session_id}/watch")
+async def watch_session(
+    websocket: WebSocket,
+    session_id: str,
+    token: Optional[str] = Query(default=None),
+    user_id: Optional[str] = Depends(get_optional_user_id),
+) -> None:
+    """Read-only live transcript of a running session (owner cookie or watch token)."""
+    record = await session_manager.lookup(session_id)
+    allowed = record is not None and (
+        (user_id is not None and record.user_id == user_id)
+        or (token is not None and verify_watch_token(token, session_id))
+    )
+    if not allowed:
+        await websocket.close(code=1008)
+        return
+
+    await websocket.accept()
+    observer = await session_manager.subscribe(session_id, websocket)
+    if observer is None:
+        await websocket.send_json(
+            {
+                "event": "error",
+                "data": {
+                    "code": "WATCH_UNAVAILABLE",
+                    "message": "세션이 다른 워커에 있거나 관전자 수 한도에 도달했습니다.",
+                    "workerId": record.worker_id,
+                },
+            },
+        )
+        await websocket.close(code=1013)
+        return
+
+    # Observers never send anything meaningful; the receive side only detects disconnects.
+    receiver = asyncio.create_task(_drain_until_disconnect(websocket))
+    try:
+        await asyncio.wait({receiver, observer.done}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        receiver.cancel()
+        await observer.close()
+
+
+async def _drain_until_disconnect(websocket: WebSocket) -> None:
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+
+
 @router.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket) -> None:
+async def websocket_endpoint(
+    websocket: WebSocket,
+    user_id: Optional[str] = Depends(get_optional_user_id),
+) -> None:
     await websocket.accept()
     session: Optional[STTSession] = None
     session_id: Optional[str] = None
@@ -63,15 +246,23 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
 
             event = payload.get("event")
             data = payload.get("data") or {}
+            if session is not None:
+                session.touch()
 
             logger.debug("Received event=%s data=%s", event, data)
 
             if event == "session.init":
                 if session is None:
-                    session = await session_manager.create_session(websocket)
+                    try:
+                        session = await session_manager.create_session(websocket, user_id=user_id)
+                    except SessionAdmissionError as exc:
+                        await _reject_session(websocket, exc)
+                        return
                     session_id = session.session_id
+                    bind_session(session_id)
                     logger.info("Created STT session %s", session_id)
                 session.configure(data)
+                await session_manager.set_room(session.session_id, session.room_id)
                 await websocket.send_json(
                     {
                         "event": "session.ready",
@@ -80,8 +271,13 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
                 )
             elif event == "rtc.offer":
                 if session is None:
-                    session = await session_manager.create_session(websocket)
+                    try:
+                        session = await session_manager.create_session(websocket, user_id=user_id)
+                    except SessionAdmissionError as exc:
+                        await _reject_session(websocket, exc)
+                        return
                     session_id = session.session_id
+                    bind_session(session_id)
                 try:
                     answer = await session.handle_offer(data)
                 except ValueError as exc:
@@ -41,6 +41,60 @@ class Settings(BaseSettings):
     rtc_language: str = Field(default="ko-KR", alias="RTC_LANGUAGE")
     stt_model: str = Field(default="default", alias="STT_MODEL")
     stt_use_enhanced: bool = Field(default=True, alias="STT_USE_ENHANCED")
+    # Opus 패킷을 디코딩/리샘플링 없이 Ogg로 감싸 OGG_OPUS 인코딩으로 전송 (녹음 WAV는 세션 종료 시 변환)
+    stt_opus_passthrough: bool = Field(default=False, alias="STT_OPUS_PASSTHROUGH")
+
+    # 인식 백엔드: google | null(요청만 소비, 벤치마크용) | fake(부하 테스트용 가짜 결과) | replay(녹화된 인식 응답 재생)
+    stt_backend: str = Field(default="google", alias="STT_BACKEND")
+    stt_replay_path: Optional[Path] = Field(default=None, alias="STT_REPLAY_PATH")
+    stt_replay_realtime: bool = Field(default=True, alias="STT_REPLAY_REALTIME")
+    # 세션별 Google 인식 응답을 logs_dir/recognition/{session_id}.sttr 로 기록(오프라인 재생/회귀 테스트용)
+    stt_record_responses: bool = Field(default=False, alias="STT_RECORD_RESPONSES")
+    # inline: API 프로세스에서 처리 | process: 세션 파이프라인을 워커 프로세스 풀에서 처리(GIL 회피)
+    stt_execution_mode: str = Field(default="inline", alias="STT_EXECUTION_MODE")
+    stt_worker_processes: int = Field(default=0, alias="STT_WORKER_PROCESSES")  # 0이면 CPU 코어 수
+
+    # 워커 간 세션 소유권 공유: memory(단일 워커) | sqlite(컨테이너 내 워커들) | mongo(노드 간)
+    # 워커 수는 uvicorn 표준 환경변수 WEB_CONCURRENCY로 지정
+    stt_session_registry: str = Field(default="memory", alias="STT_SESSION_REGISTRY")
+    stt_registry_path: Path = Field(default=Path("./data/stt_sessions.db"), alias="STT_REGISTRY_PATH")
+    stt_registry_heartbeat_sec: float = Field(default=5.0, alias="STT_REGISTRY_HEARTBEAT_SEC")
+
+    # 세션 수락 제어: 0이면 제한 없음. 노드 한도는 같은 호스트의 모든 워커 합계(레지스트리 기준)
+    stt_max_sessions_per_node: int = Field(default=0, alias="STT_MAX_SESSIONS_PER_NODE")
+    stt_max_sessions_per_user: int = Field(default=0, alias="STT_MAX_SESSIONS_PER_USER")
+    # 부하 기반 거절: CPU 사용률(0~1, 코어 수로 정규화, 운영 권장 0.85)과 세션 오디오 큐 평균 적체율(0~1, 운영 권장 0.5) 임계값. 0이면 비활성
+    stt_admission_cpu_threshold: float = Field(default=0.0, alias="STT_ADMISSION_CPU_THRESHOLD")
+    stt_admission_backlog_threshold: float = Field(default=0.0, alias="STT_ADMISSION_BACKLOG_THRESHOLD")
+    stt_admission_retry_after_sec: float = Field(default=5.0, alias="STT_ADMISSION_RETRY_AFTER_SEC")
+
+    # 유휴/좀비 세션 정리: 오디오 수신 후 무음 지속 시간, 오디오 수신 전 시그널링 무응답 시간(0이면 비활성)
+    stt_idle_audio_timeout_sec: float = Field(default=60.0, alias="STT_IDLE_AUDIO_TIMEOUT_SEC")
+    stt_idle_signal_timeout_sec: float = Field(default=60.0, alias="STT_IDLE_SIGNAL_TIMEOUT_SEC")
+    stt_reaper_interval_sec: float = Field(default=10.0, alias="STT_REAPER_INTERVAL_SEC")
+
+    # 실시간 자막 관전자(읽기 전용 WebSocket): 세션당 최대 수, 관전자별 송신 큐 길이(넘치면 연결 종료)
+    stt_max_observers_per_session: int = Field(default=4, alias="STT_MAX_OBSERVERS_PER_SESSION")
+    stt_observer_queue_size: int = Field(default=256, alias="STT_OBSERVER_QUEUE_SIZE")
+
+    # 세션 자막 메모리 상한: 최근 N개 세그먼트/QA만 메모리에 두고 나머지는 storage_dir/transcripts/ 로 내림(0이면 전부 메모리)
+    stt_transcript_memory_segments: int = Field(default=1000, alias="STT_TRANSCRIPT_MEMORY_SEGMENTS")
+
+    # 세션별 플라이트 레코더(타임라인 이벤트 링 버퍼) 크기, 오류로 끝난 세션은 logs_dir/flight/{session_id}.json 으로 덤프
+    stt_flight_recorder_size: int = Field(default=256, alias="STT_FLIGHT_RECORDER_SIZE")
+    stt_flight_dump_on_error: bool = Field(default=True, alias="STT_FLIGHT_DUMP_ON_ERROR")
+    # 종료된 세션의 타임라인을 관리자 API로 조회할 수 있도록 워커당 보관하는 개수
+    stt_flight_retained_sessions: int = Field(default=32, alias="STT_FLIGHT_RETAINED_SESSIONS")
+
+    # 녹음 파일 일괄(오프라인) 재인식: 청크 길이(초), 동시 스트림 수, 청크별 재시도 횟수
+    stt_batch_chunk_sec: float = Field(default=60.0, alias="STT_BATCH_CHUNK_SEC")
+    stt_batch_concurrency: int = Field(default=4, alias="STT_BATCH_CONCURRENCY")
+    stt_batch_retries: int = Field(default=2, alias="STT_BATCH_RETRIES")
+    # 청크 스트림 전송 속도(실시간 대비 배수). Google 스트리밍 인식은 실시간보다 빠른 전송을 거부하므로 1.0 유지, 0 이하면 속도 제한 없음
+    stt_batch_stream_speed: float = Field(default=1.0, alias="STT_BATCH_STREAM_SPEED")
+    # 일괄 재인식 작업 상태 기록 보관 시간(완료/실패 후, Mongo TTL로 삭제)과 종료 시 진행 중 작업을 기다리는 시간(JOBS_ENABLED=false일 때)
+    stt_batch_job_retention_sec: float = Field(default=24 * 3600.0, alias="STT_BATCH_JOB_RETENTION_SEC")
+    stt_batch_shutdown_grace_sec: float = Field(default=30.0, alias="STT_BATCH_SHUTDOWN_GRACE_SEC")
 
     ice_servers_json: Optional[str] = Field(default=None, alias="ICE_SERVERS_JSON")
     ice_servers: list[dict[str, Any]] = Field(
@@ -51,6 +105,46 @@ class Settings(BaseSettings):
     storage_dir: Path = Field(default=Path("./data/recordings"), alias="STORAGE_DIR")
     analysis_dir: Path = Field(default=Path("./data/analysis"), alias="ANALYSIS_DIR")
     logs_dir: Path = Field(default=Path("./data/logs"), alias="LOGS_DIR")
+    # 로그는 QueueHandler로 별도 스레드에서 기록. LOG_FILE 지정 시 콘솔과 함께 회전 파일에도 기록
+    log_level: str = Field(default="INFO", alias="LOG_LEVEL")
+    log_file: Optional[Path] = Field(default=None, alias="LOG_FILE")
+    # 프레임/청크 단위(20ms) 디버그 로그는 처음 몇 건 이후 N건마다 한 번만 기록
+    log_hot_path_sample_every: int = Field(default=50, alias="LOG_HOT_PATH_SAMPLE_EVERY")
+    # /metrics (Prometheus 텍스트 포맷) 노출 여부. 기본 비활성, METRICS_TOKEN 지정 시 `Authorization: Bearer <토큰>` 필요
+    # 지표는 워커 프로세스별로 집계되므로 WEB_CONCURRENCY>1이면 워커마다 별도 스크레이프 대상(포트)을 두거나 단일 워커로 운영
+    metrics_enabled: bool = Field(default=False, alias="METRICS_ENABLED")
+    metrics_token: Optional[str] = Field(default=None, alias="METRICS_TOKEN")
+
+    # ----- Background jobs (OCR / LLM 리포트) -----
+    # 활성화 시 업로드/리포트 요청은 Mongo jobs 컬렉션에 적재 후 즉시 queued 반환, 처리는 `python -m app.worker`가 담당
+    jobs_enabled: bool = Field(default=False, alias="JOBS_ENABLED")
+    job_worker_concurrency: int = Field(default=2, alias="JOB_WORKER_CONCURRENCY")
+    job_poll_interval_sec: float = Field(default=1.0, alias="JOB_POLL_INTERVAL_SEC")
+    # 리스 만료 전까지 하트비트로 연장. 워커가 죽으면 만료 후 다른 워커가 재시도
+    job_lease_sec: float = Field(default=120.0, alias="JOB_LEASE_SEC")
+    # 최대 시도 횟수 초과 시 dead 상태로 보관(dead-letter), /admin/jobs 에서 재시도 가능
+    job_max_attempts: int = Field(default=5, alias="JOB_MAX_ATTEMPTS")
+    job_backoff_base_sec: float = Field(default=5.0, alias="JOB_BACKOFF_BASE_SEC")
+    job_backoff_max_sec: float = Field(default=600.0, alias="JOB_BACKOFF_MAX_SEC")
+    # 업로드 바이트를 워커와 공유하는 로컬 스풀 디렉토리(같은 볼륨이면 워커가 S3 재다운로드 생략)
+    ocr_spool_dir: Path = Field(default=Path("./data/ocr_spool"), alias="OCR_SPOOL_DIR")
+    # 워커가 지우지 못한 스풀 파일(다른 노드에서 처리된 작업 등)을 API가 주기적으로 정리. 기준 나이 = (리스 + 최대 백오프) × 최대 시도 횟수
+    ocr_spool_sweep_interval_sec: float = Field(default=600.0, alias="OCR_SPOOL_SWEEP_INTERVAL_SEC")
+    # 같은 PDF(SHA-256) 재업로드 시 Upstage/OpenAI 호출 없이 ocr_cache 결과 재사용
+    # 키: (content_hash, contract_type, schema_version, model) — 스키마/프롬프트 수정이나 모델 변경 시 자동 무효화
+    ocr_cache_enabled: bool = Field(default=True, alias="OCR_CACHE_ENABLED")
+    # 스키마/프롬프트 변경 후 일괄 재파싱(POST /admin/ocr/reparse) 시 동시 OpenAI 호출 수
+    ocr_reparse_concurrency: int = Field(default=4, alias="OCR_REPARSE_CONCURRENCY")
+
+    # ----- Uploads -----
+    # 초과 시 413. Content-Length 선검사 + 수신 중 누적 바이트 검사(본문 전체를 스풀하기 전에 차단)
+    upload_max_document_bytes: int = Field(default=60 * 1024 * 1024, alias="UPLOAD_MAX_DOCUMENT_BYTES")
+    upload_max_photo_bytes: int = Field(default=20 * 1024 * 1024, alias="UPLOAD_MAX_PHOTO_BYTES")
+    # 일괄 재인식용 오디오 업로드 (16kHz mono PCM WAV 기준 약 2시간)
+    upload_max_audio_bytes: int = Field(default=256 * 1024 * 1024, alias="UPLOAD_MAX_AUDIO_BYTES")
+    # S3 멀티파트 파트 크기(최소 5MiB)와 동시 전송 파트 수. 업로드당 메모리 상한 ≈ 파트 크기 × 동시 수
+    upload_part_size_bytes: int = Field(default=8 * 1024 * 1024, alias="UPLOAD_PART_SIZE_BYTES")
+    upload_part_concurrency: int = Field(default=3, alias="UPLOAD_PART_CONCURRENCY")
 
     # ----- Q&A parameters -----
     qa_time_window_sec: int = Field(default=15, alias="QA_TIME_WINDOW_SEC")
@@ -63,6 +157,8 @@ class Settings(BaseSettings):
     secret_key: str = Field(default="local-secret-key", alias="SECRET_KEY")
     algorithm: str = Field(default="HS256", alias="ALGORITHM")
     access_token_expires: int = Field(default=3600, alias="ACCESS_TOKEN_EXPIRES")
+    # 운영용 /admin 엔드포인트 토큰(X-Admin-Token 헤더). 미설정 시 관리자 API 비활성
+    admin_token: Optional[str] = Field(default=None, alias="ADMIN_TOKEN")
 
     # ----- External APIs (incoming에서 추가) -----
     upstage_api_url: str = Field(
@@ -73,6 +169,19 @@ class Settings(BaseSettings):
 
     openai_api_key: Optional[str] = Field(default=None, alias="OPENAI_API_KEY")
     openai_model: str = Field(default="gpt-4o-mini", alias="OPENAI_MODEL")
+    # OCR 프롬프트에 스키마를 압축 삽입(공백 제거 + 주석성 키 제거 + 반복 하위 스키마 $ref). 기본은 기존 indent=2
+    # 켜면 스키마 버전이 바뀌어 저장된 결과가 재파싱 대상이 됨 — benchmarks/ocr_prompt.py --live 로 필드 정확도 손실이 없는지 확인 후 사용
+    ocr_prompt_compact: bool = Field(default=False, alias="OCR_PROMPT_COMPACT")
+    # 섹션 스키마(schema/<계약서 타입>/)가 있으면 섹션별 요청을 동시에 보내 병합 — 파싱 대기 시간 단축, 실패한 섹션만 재시도
+    # OCR 텍스트가 섹션 수만큼 반복 전송되므로 입력 토큰은 늘어남
+    ocr_parse_sections: bool = Field(default=False, alias="OCR_PARSE_SECTIONS")
+    ocr_section_max_attempts: int = Field(default=3, alias="OCR_SECTION_MAX_ATTEMPTS")
+    # 요청당 입력 토큰 상한(프롬프트 + OCR 텍스트). 넘으면 OCR 텍스트를 페이지 단위 청크로 나눠 동시에 파싱 후 병합, 0이면 비활성
+    ocr_prompt_max_tokens: int = Field(default=16000, alias="OCR_PROMPT_MAX_TOKENS")
+    ocr_chunk_concurrency: int = Field(default=4, alias="OCR_CHUNK_CONCURRENCY")
+    # 여러 페이지 PDF는 요청당 OCR_PAGES_PER_REQUEST 페이지씩 나눠 Upstage에 동시에 요청(최대 OCR_PAGE_CONCURRENCY)하고 페이지 순서대로 이어 붙임, 0이면 통째로 전송
+    ocr_pages_per_request: int = Field(default=1, alias="OCR_PAGES_PER_REQUEST")
+    ocr_page_concurrency: int = Field(default=4, alias="OCR_PAGE_CONCURRENCY")
 
     def model_post_init(self, __context: Any) -> None:  # type: ignore[override]
         # GOOGLE_APPLICATION_CREDENTIALS 정규화 및 환경변수 설정
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import contextvars
+import logging
+import logging.handlers
+import queue
+import threading
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from app.core.config import Settings
+
+LOG_FORMAT = "%(asctime)s %(levelname)s [%(session_id)s] %(name)s: %(message)s"
+
+_session_id: contextvars.ContextVar[str] = contextvars.ContextVar("stt_session_id", default="-")
+
+_lock = threading.Lock()
+_listeners: List[Tuple[logging.Logger, logging.Handler, logging.handlers.QueueListener]] = []
+_file_loggers: Dict[Path, logging.Logger] = {}
+
+
+def bind_session(session_id: str) -> contextvars.Token:
+    """Tag every record logged from the current context (task, and threads started from it) with ``session_id``."""
+    return _session_id.set(session_id)
+
+
+def session_context(session_id: str) -> contextvars.Context:
+    """A copy of the current context bound to ``session_id``, for ``asyncio.create_task(..., context=...)``."""
+    context = contextvars.copy_context()
+    context.run(_session_id.set, session_id)
+    return context
+
+
+class SessionContextFilter(logging.Filter):
+    """Adds ``record.session_id``; installed on the queue handler so it runs in the caller's context."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "session_id"):
+            record.session_id = _session_id.get()
+        return True
+
+
+class SampledLog:
+    """Level-guarded, rate-sampled log point for per-frame / per-chunk code.
+
+    ``due()`` is the whole cost when the level is off (one cached level check)
+    and is true for the first ``burst`` calls and then every ``every``-th, so
+    debug logging of a 50 Hz loop stays readable and cheap::
+
+        if self._frame_log.due():
+            logger.debug("Session %s frame #%d", session_id, self._frame_log.count)
+    """
+
+    __slots__ = ("_logger", "_level", "_every", "_burst", "count")
+
+    def __init__(self, logger: logging.Logger, every: int = 50, level: int = logging.DEBUG, burst: int = 3) -> None:
+        self._logger = logger
+        self._level = level
+        self._every = max(every, 1)
+        self._burst = burst
+        self.count = 0
+
+    def due(self) -> bool:
+        if not self._logger.isEnabledFor(self._level):
+            return False
+        self.count += 1
+        return self.count <= self._burst or self.count % self._every == 0
+
+
+class InProcessQueueHandler(logging.handlers.QueueHandler):
+    """``QueueHandler`` that leaves message formatting to the listener thread.
+
+    The stock ``prepare()`` formats every record on the calling thread so it
+    can be pickled; the queue never leaves this process, so the record is
+    enqueued as-is. Log arguments must therefore not be mutated after the call.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class UTCISOFormatter(logging.Formatter):
+    """Formats ``asctime`` as a naive UTC ISO-8601 timestamp, the format debug files have always used."""
+
+    def formatTime(self, record: logging.LogRecord, datefmt: str | None = None) -> str:
+        return datetime.fromtimestamp(record.created, UTC).replace(tzinfo=None).isoformat()
+
+
+def _attach_queue(logger: logging.Logger, handlers: List[logging.Handler]) -> logging.handlers.QueueHandler:
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    handler = InProcessQueueHandler(log_queue)
+    handler.addFilter(SessionContextFilter())
+    logger.addHandler(handler)
+    _listeners.append((logger, handler, listener))
+    return handler
+
+
+def configure_logging(settings: Settings) -> None:
+    """Route the root logger through a ``QueueHandler``; formatting and I/O happen on a listener thread.
+
+    Idempotent, so the app and pool workers can both call it.
+    """
+
+    with _lock:
+        root = logging.getLogger()
+        if any(logger is root for logger, _, _ in _listeners):
+            return
+
+        formatter = logging.Formatter(LOG_FORMAT)
+        handlers: List[logging.Handler] = [logging.StreamHandler()]
+        if settings.log_file:
+            path = Path(settings.log_file)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            handlers.append(
+                logging.handlers.RotatingFileHandler(path, maxBytes=50 * 1024 * 1024, backupCount=5, encoding="utf-8"),
+            )
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        _attach_queue(root, handlers)
+        root.setLevel(settings.log_level.upper())
+
+
+def file_logger(path: Path) -> logging.Logger:
+    """A logger writing ``[UTC ISO timestamp] message`` lines to ``path`` through its own queue listener.
+
+    The file is opened once and kept open, instead of per message.
+    """
+
+    path = Path(path)
+    with _lock:
+        cached = _file_loggers.get(path)
+        if cached is not None:
+            return cached
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        file_handler = logging.FileHandler(path, encoding="utf-8")
+        file_handler.setFormatter(UTCISOFormatter("[%(asctime)s] %(message)s"))
+        logger = logging.getLogger(f"app.file.{path}")
+        logger.propagate = False
+        logger.setLevel(logging.DEBUG)
+        _attach_queue(logger, [file_handler])
+        _file_loggers[path] = logger
+        return logger
+
+
+def shutdown_logging() -> None:
+    """Flush and stop the listener threads and detach their queue handlers."""
+
+    with _lock:
+        attached = list(_listeners)
+        _listeners.clear()
+        _file_loggers.clear()
+    for logger, queue_handler, listener in attached:
+        logger.removeHandler(queue_handler)
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
@@ -0,0 +1,337 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import os
+import resource
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; covers sub-millisecond Mongo commands up to minute-long OCR/LLM calls.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelValues = Tuple[str, ...]
+# (labels, value) pairs reported by a scrape-time collector.
+Sample = Tuple[Dict[str, str], float]
+Collector = Callable[[], Iterable[Tuple[str, str, str, List[Sample]]]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[LabelValues, object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self._child()
+            self._children[()] = self._default
+
+    def _child(self) -> object:
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        """Child for one label combination; cache it on hot paths to skip the lookup."""
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            with self._lock:
+                child = self._children.setdefault(key, self._child())
+        return child
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in list(self._children.items()):
+            lines.extend(self._render_child(values, child))
+        return lines
+
+    def _render_child(self, values: LabelValues, child) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}"]
+
+
+class _Value:
+    """One counter or gauge series; a lock because recognition threads update them too."""
+
+    __slots__ = ("value", "_lock")
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default.dec(amount)
+
+    def set(self, value: float) -> None:
+        self._default.set(value)
+
+
+class _HistogramValue:
+    __slots__ = ("_upper", "counts", "sum", "_lock")
+
+    def __init__(self, upper: Tuple[float, ...]) -> None:
+        self._upper = upper
+        # Per-bucket (non-cumulative) counts, the last one being +Inf; summed at render time.
+        self.counts = [0] * (len(upper) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self._upper, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.buckets = tuple(sorted(float(bucket) for bucket in buckets if not math.isinf(bucket)))
+        super().__init__(name, documentation, labelnames)
+
+    def _child(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default.observe(value)
+
+    def _render_child(self, values: LabelValues, child: _HistogramValue) -> List[str]:
+        with child._lock:
+            counts = list(child.counts)
+            total = child.sum
+        lines: List[str] = []
+        cumulative = 0
+        for upper, count in zip(self.buckets + (math.inf,), counts):
+            cumulative += count
+            le = f'le="{_format_value(upper)}"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, values, le)} {cumulative}")
+        labels = _format_labels(self.labelnames, values)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """In-process metric registry rendered in the Prometheus text exposition format.
+
+    Updating a metric is a lock-guarded add on a pre-created series, so
+    instrumented hot paths pay well under a microsecond. Values that already
+    live elsewhere (active sessions, queue depth, executor threads) are not
+    mirrored on every change; a collector reads them when ``/metrics`` is
+    scraped.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Collector] = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} already registered with a different shape")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))  # type: ignore[return-value]
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))  # type: ignore[return-value]
+
+    def register_collector(self, collector: Collector) -> None:
+        """Add a callable yielding ``(name, type, help, samples)`` for gauges computed at scrape time."""
+        with self._lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+
+    def unregister_collector(self, collector: Collector) -> None:
+        with self._lock:
+            if collector in self._collectors:
+                self._collectors.remove(collector)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        for collector in collectors:
+            try:
+                families = list(collector())
+            except Exception as exc:  # pragma: no cover - a broken collector must not fail the scrape
+                logger.warning("Metrics collector %r failed: %s", collector, exc)
+                continue
+            for name, kind, documentation, samples in families:
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    rendered = _format_labels(list(labels), list(labels.values()))
+                    lines.append(f"{name}{rendered} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+EXTERNAL_CALL_SECONDS = REGISTRY.histogram(
+    "external_call_duration_seconds",
+    "Latency of calls to backing services (mongo, s3, upstage, openai, google_stt).",
+    ("service", "operation"),
+)
+EXTERNAL_CALL_ERRORS = REGISTRY.counter(
+    "external_call_errors_total",
+    "Failed calls to backing services.",
+    ("service", "operation"),
+)
+
+
+class track_call:
+    """Time a backing-service call into ``external_call_duration_seconds``; exceptions also count as errors.
+
+    Works around ``await`` and inside worker threads::
+
+        with track_call("s3", "put_object"):
+            client.put_object(...)
+    """
+
+    __slots__ = ("_service", "_operation", "_started")
+
+    def __init__(self, service: str, operation: str) -> None:
+        self._service = service
+        self._operation = operation
+        self._started = 0.0
+
+    def __enter__(self) -> "track_call":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        # Cancellation (a BaseException) is not the backend's fault.
+        failed = exc_type is not None and issubclass(exc_type, Exception)
+        observe_call(self._service, self._operation, time.perf_counter() - self._started, failed=failed)
+
+
+def observe_call(service: str, operation: str, seconds: float, failed: bool = False) -> None:
+    EXTERNAL_CALL_SECONDS.labels(service, operation).observe(seconds)
+    if failed:
+        EXTERNAL_CALL_ERRORS.labels(service, operation).inc()
+
+
+def _runtime_metrics() -> Iterable[Tuple[str, str, str, List[Sample]]]:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    yield "process_cpu_seconds_total", "counter", "User and system CPU time of this process.", [
+        ({}, round(usage.ru_utime + usage.ru_stime, 3)),
+    ]
+    try:
+        with open("/proc/self/statm") as statm:
+            rss = int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        yield "process_resident_memory_bytes", "gauge", "Resident memory of this process.", [({}, rss)]
+        yield "process_open_fds", "gauge", "Open file descriptors.", [({}, len(os.listdir("/proc/self/fd")))]
+    except OSError:  # pragma: no cover - non-Linux
+        pass
+    yield "process_threads", "gauge", "Live Python threads.", [({}, threading.active_count())]
+
+    # asyncio.to_thread work (S3 calls, inline recognition streams) shares the loop's default executor;
+    # busy == max_workers with a growing queue means new sessions and uploads wait for a thread.
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    executor = getattr(loop, "_default_executor", None)
+    max_workers = getattr(executor, "_max_workers", None) or min(32, (os.cpu_count() or 1) + 4)
+    threads = len(getattr(executor, "_threads", ()))
+    idle_semaphore = getattr(executor, "_idle_semaphore", None)
+    idle = min(getattr(idle_semaphore, "_value", 0), threads)
+    work_queue = getattr(executor, "_work_queue", None)
+    yield "executor_max_workers", "gauge", "Size limit of the event loop's default thread pool.", [({}, max_workers)]
+    yield "executor_threads", "gauge", "Default thread pool threads by state.", [
+        ({"state": "busy"}, threads - idle),
+        ({"state": "idle"}, idle),
+    ]
+    yield "executor_queued_tasks", "gauge", "Work items waiting for a default thread pool thread.", [
+        ({}, work_queue.qsize() if work_queue is not None else 0),
+    ]
+
+
+REGISTRY.register_collector(_runtime_metrics)
@@ -38,6 +38,29 @@ def decode_access_token(token: str) -> str:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token") from exc
 
     user_id = payload.get("sub")
-    if not user_id:
+    # Scoped tokens (e.g. stt.watch) are handed to third parties and must not act as a login.
+    if not user_id or payload.get("scope"):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
     return user_id
+
+
+def create_watch_token(session_id: str, owner_id: str, expires_delta: timedelta | None = None) -> str:
+    """Generate a token that lets its holder observe one STT session's live transcript."""
+
+    expires = expires_delta or timedelta(seconds=settings.ACCESS_TOKEN_EXPIRES)
+    payload = {
+        "sub": owner_id,
+        "sid": session_id,
+        "scope": "stt.watch",
+        "exp": datetime.now(timezone.utc) + expires,
+        "iat": datetime.now(timezone.utc),
+    }
+    return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def verify_watch_token(token: str, session_id: str) -> bool:
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except jwt.InvalidTokenError:
+        return False
+    return payload.get("scope") == "stt.watch" and payload.get("sid") == session_id
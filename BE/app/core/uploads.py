@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+from typing import Any, Awaitable, BinaryIO, Callable, Dict, Optional, Pattern, Sequence, Tuple
+
+Message = Dict[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+
+_HASH_CHUNK = 1024 * 1024
+
+
+class UploadTooLarge(Exception):
+    def __init__(self, limit: int) -> None:
+        super().__init__(f"Upload exceeds the {limit // (1024 * 1024)} MiB limit.")
+        self.limit = limit
+
+
+class UploadSource:
+    """Random-access view over an upload that Starlette already spooled to a temporary file.
+
+    Readers take their own offsets under a lock, so the S3 part uploads and
+    OCR can read the same file concurrently without ever holding all of it
+    in memory.
+    """
+
+    def __init__(self, file: BinaryIO) -> None:
+        self._file = file
+        self._lock = threading.Lock()
+        self._sha256: Optional[str] = None
+        file.seek(0, os.SEEK_END)
+        self.size = file.tell()
+        file.seek(0)
+
+    def read_at(self, offset: int, length: int) -> bytes:
+        with self._lock:
+            self._file.seek(offset)
+            return self._file.read(length)
+
+    def sha256(self) -> str:
+        """Hex SHA-256 of the content, read in 1 MiB chunks (blocking; memoized)."""
+        if self._sha256 is None:
+            digest = hashlib.sha256()
+            for offset in range(0, self.size, _HASH_CHUNK):
+                digest.update(self.read_at(offset, _HASH_CHUNK))
+            self._sha256 = digest.hexdigest()
+        return self._sha256
+
+    def open(self) -> "_SourceReader":
+        """An independent file-like reader (for httpx multipart bodies, ``shutil.copyfileobj``)."""
+        return _SourceReader(self)
+
+
+class _SourceReader(io.RawIOBase):
+    def __init__(self, source: UploadSource) -> None:
+        self._source = source
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        data = self._source.read_at(self._position, len(buffer))
+        buffer[: len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        base = {os.SEEK_SET: 0, os.SEEK_CUR: self._position, os.SEEK_END: self._source.size}[whence]
+        self._position = max(base + offset, 0)
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+
+class BodySizeLimitMiddleware:
+    """Reject request bodies over a per-route limit with 413 before they are spooled.
+
+    ``Content-Length`` is checked up front; chunked bodies are counted as
+    they arrive and cut off at the limit (the truncated form then fails to
+    parse, and that error response is replaced by the 413).
+    """
+
+    def __init__(self, app: Any, limits: Sequence[Tuple[str, int]]) -> None:
+        self.app = app
+        self._limits: Sequence[Tuple[Pattern[str], int]] = [
+            (re.compile(pattern), limit) for pattern, limit in limits if limit > 0
+        ]
+
+    def _limit_for(self, path: str) -> Optional[int]:
+        for pattern, limit in self._limits:
+            if pattern.search(path):
+                return limit
+        return None
+
+    async def __call__(self, scope: Dict[str, Any], receive: Receive, send: Send) -> None:
+        limit = self._limit_for(scope["path"]) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            await _send_too_large(send, limit)
+            return
+
+        received = 0
+        exceeded = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, exceeded
+            if exceeded:
+                return {"type": "http.request", "body": b"", "more_body": False}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    exceeded = True
+                    return {"type": "http.request", "body": b"", "more_body": False}
+            return message
+
+        response_started = False
+
+        async def guarded_send(message: Message) -> None:
+            nonlocal response_started
+            if exceeded:
+                if message["type"] == "http.response.start" and not response_started:
+                    response_started = True
+                    await _send_too_large(send, limit)
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        await self.app(scope, limited_receive, guarded_send)
+
+
+async def _send_too_large(send: Send, limit: int) -> None:
+    body = json.dumps({"detail": str(UploadTooLarge(limit))}).encode("utf-8")
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        },
+    )
+    await send({"type": "http.response.body", "body": body})
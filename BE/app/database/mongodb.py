@@ -9,10 +9,26 @@ from motor.motor_asyncio import (
     AsyncIOMotorCollection,
     AsyncIOMotorDatabase,
 )
+from pymongo import monitoring
 
 from app.core.config import settings
+from app.core.metrics import observe_call
 
-_client = AsyncIOMotorClient(settings.MONGODB_URI)
+
+class _CommandMetrics(monitoring.CommandListener):
+    """Times every driver command into ``external_call_duration_seconds{service="mongo"}``."""
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        pass
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        observe_call("mongo", event.command_name, event.duration_micros / 1_000_000)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        observe_call("mongo", event.command_name, event.duration_micros / 1_000_000, failed=True)
+
+
+_client = AsyncIOMotorClient(settings.MONGODB_URI, event_listeners=[_CommandMetrics()])
 _database: AsyncIOMotorDatabase = _client[settings.MONGODB_DB_NAME]
 
 
@@ -36,6 +52,11 @@ def get_ocr_collection() -> AsyncIOMotorCollection:
     return get_collection("ocr_jobs")
 
 
+def get_ocr_cache_collection() -> AsyncIOMotorCollection:
+    """Convenience accessor for the content-addressed OCR result cache."""
+    return get_collection("ocr_cache")
+
+
 def get_llm_collection() -> AsyncIOMotorCollection:
     """Convenience accessor for the LLM reports collection."""
     return get_collection("llm_reports")
@@ -46,6 +67,16 @@ def get_stt_collection() -> AsyncIOMotorCollection:
     return get_collection("stt_results")
 
 
+def get_stt_batch_jobs_collection() -> AsyncIOMotorCollection:
+    """Convenience accessor for the offline batch transcription job records."""
+    return get_collection("stt_batch_jobs")
+
+
+def get_jobs_collection() -> AsyncIOMotorCollection:
+    """Convenience accessor for the background job queue collection."""
+    return get_collection("jobs")
+
+
 @asynccontextmanager
 async def get_session() -> AsyncGenerator[AsyncIOMotorClientSession, None]:
     """Yield an async MongoDB client session suitable for transactional work."""
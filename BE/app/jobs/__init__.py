@@ -0,0 +1,14 @@
+from .queue import DEAD, DONE, QUEUED, RUNNING, Job, JobQueue, get_job_queue
+from .worker import JobHandler, JobWorker
+
+__all__ = [
+    "DEAD",
+    "DONE",
+    "QUEUED",
+    "RUNNING",
+    "Job",
+    "JobQueue",
+    "get_job_queue",
+    "JobHandler",
+    "JobWorker",
+]
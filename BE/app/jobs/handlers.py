@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict
+
+from app.jobs.queue import Job
+from app.jobs.worker import JobHandler
+from app.services.llm_service import LLM_REPORT_JOB, get_llm_service
+from app.services.ocr_service import OCR_JOB, OCR_REPARSE_JOB, get_ocr_service
+from app.use_cases.stt.batch_usecase import STT_BATCH_JOB, get_stt_batch_use_case
+
+
+async def run_ocr_job(job: Job) -> None:
+    service = get_ocr_service()
+    user_id, ocr_id = job.payload["user_id"], job.payload["ocr_id"]
+    spool_path = job.payload.get("spool_path")
+    try:
+        await service.process_document(user_id, ocr_id, spool_path, job.payload.get("content_hash"))
+    except Exception as exc:
+        if job.final_attempt:
+            await service.mark_failed(user_id, ocr_id, str(exc)[:500], spool_path)
+        raise
+
+
+async def run_ocr_reparse_job(job: Job) -> None:
+    await get_ocr_service().reparse_stored(force=job.payload.get("force", False))
+
+
+async def run_llm_report_job(job: Job) -> None:
+    service = get_llm_service()
+    user_id, room_id = job.payload["user_id"], job.payload["room_id"]
+    try:
+        await service.run_report(user_id, room_id)
+    except Exception as exc:
+        if job.final_attempt:
+            await service.mark_failed(user_id, room_id, str(exc)[:500])
+        raise
+
+
+async def run_stt_batch_job(job: Job) -> None:
+    use_case = get_stt_batch_use_case()
+    job_id, path = job.payload["job_id"], Path(job.payload["path"])
+    delete_after = job.payload.get("delete_after", False)
+    try:
+        await use_case.run(job_id, path, delete_after)
+    except Exception as exc:
+        if job.final_attempt:
+            await use_case.mark_failed(job_id, str(exc)[:500], path, delete_after)
+        raise
+
+
+HANDLERS: Dict[str, JobHandler] = {
+    OCR_JOB: run_ocr_job,
+    OCR_REPARSE_JOB: run_ocr_reparse_job,
+    LLM_REPORT_JOB: run_llm_report_job,
+    STT_BATCH_JOB: run_stt_batch_job,
+}
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import logging
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+from uuid import uuid4
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ASCENDING, ReturnDocument
+
+from app.core.config import Settings, get_settings
+from app.database.mongodb import get_jobs_collection
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+DEAD = "dead"
+
+
+@dataclass
+class Job:
+    job_id: str
+    kind: str
+    payload: Dict[str, Any]
+    attempts: int
+    max_attempts: int
+    status: str = QUEUED
+    last_error: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+
+    @property
+    def final_attempt(self) -> bool:
+        return self.attempts >= self.max_attempts
+
+    @classmethod
+    def from_document(cls, document: Dict[str, Any]) -> "Job":
+        return cls(
+            job_id=document["_id"],
+            kind=document["kind"],
+            payload=document.get("payload") or {},
+            attempts=document.get("attempts", 0),
+            max_attempts=document.get("max_attempts", 1),
+            status=document.get("status", QUEUED),
+            last_error=document.get("last_error"),
+            created_at=document.get("created_at") or datetime.utcnow(),
+        )
+
+
+def backoff_seconds(attempts: int, base: float, cap: float) -> float:
+    """Exponential backoff with jitter, so jobs failed by one outage do not all retry in the same second."""
+    ceiling = min(cap, base * (2 ** max(attempts - 1, 0)))
+    return random.uniform(ceiling / 2, ceiling)
+
+
+class JobQueue:
+    """Durable job queue on a Mongo collection.
+
+    A job is leased with a single ``find_one_and_update`` that flips it to
+    ``running`` and stamps ``lease_until``; workers extend the lease with
+    :meth:`heartbeat`. A job whose lease expired (its worker died) is leased
+    again by the next poll. Failures are rescheduled with exponential backoff
+    until ``max_attempts``, after which the job stays in the collection with
+    status ``dead`` (the dead letters) until retried by an operator.
+    """
+
+    def __init__(self, collection: AsyncIOMotorCollection, settings: Settings) -> None:
+        self._collection = collection
+        self._settings = settings
+
+    async def ensure_indexes(self) -> None:
+        await self._collection.create_index([("status", ASCENDING), ("kind", ASCENDING), ("run_at", ASCENDING)])
+        await self._collection.create_index([("status", ASCENDING), ("lease_until", ASCENDING)])
+
+    async def enqueue(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        *,
+        max_attempts: Optional[int] = None,
+        delay_sec: float = 0.0,
+    ) -> str:
+        now = datetime.utcnow()
+        job_id = uuid4().hex
+        await self._collection.insert_one(
+            {
+                "_id": job_id,
+                "kind": kind,
+                "payload": payload,
+                "status": QUEUED,
+                "attempts": 0,
+                "max_attempts": max_attempts or max(self._settings.job_max_attempts, 1),
+                "run_at": now + timedelta(seconds=delay_sec),
+                "lease_until": None,
+                "worker_id": None,
+                "last_error": None,
+                "created_at": now,
+                "updated_at": now,
+            },
+        )
+        logger.info("Enqueued %s job %s", kind, job_id)
+        return job_id
+
+    async def lease(self, worker_id: str, kinds: Sequence[str]) -> Optional[Job]:
+        """Claim the oldest due job of ``kinds`` (or one whose lease expired), or None."""
+
+        now = datetime.utcnow()
+        document = await self._collection.find_one_and_update(
+            {
+                "kind": {"$in": list(kinds)},
+                "$or": [
+                    {"status": QUEUED, "run_at": {"$lte": now}},
+                    {"status": RUNNING, "lease_until": {"$lt": now}},
+                ],
+            },
+            {
+                "$set": {
+                    "status": RUNNING,
+                    "worker_id": worker_id,
+                    "lease_until": now + timedelta(seconds=self._settings.job_lease_sec),
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("run_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER,
+        )
+        if document is None:
+            return None
+        job = Job.from_document(document)
+        if job.attempts > job.max_attempts:
+            # Its workers kept dying mid-run (lease expiry does not go through fail()).
+            await self._bury(job.job_id, worker_id, job.last_error or "lease expired on every attempt")
+            return None
+        return job
+
+    async def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """Extend the lease; False means another worker took the job over and this run should stop."""
+
+        now = datetime.utcnow()
+        result = await self._collection.update_one(
+            {"_id": job_id, "worker_id": worker_id, "status": RUNNING},
+            {"$set": {"lease_until": now + timedelta(seconds=self._settings.job_lease_sec), "updated_at": now}},
+        )
+        return result.matched_count == 1
+
+    async def complete(self, job_id: str, worker_id: str) -> None:
+        now = datetime.utcnow()
+        await self._collection.update_one(
+            {"_id": job_id, "worker_id": worker_id},
+            {"$set": {"status": DONE, "lease_until": None, "finished_at": now, "updated_at": now}},
+        )
+
+    async def fail(self, job: Job, worker_id: str, error: str) -> bool:
+        """Reschedule with backoff, or dead-letter on the last attempt. Returns True if dead-lettered."""
+
+        if job.final_attempt:
+            await self._bury(job.job_id, worker_id, error)
+            return True
+
+        delay = backoff_seconds(job.attempts, self._settings.job_backoff_base_sec, self._settings.job_backoff_max_sec)
+        now = datetime.utcnow()
+        await self._collection.update_one(
+            {"_id": job.job_id, "worker_id": worker_id},
+            {
+                "$set": {
+                    "status": QUEUED,
+                    "run_at": now + timedelta(seconds=delay),
+                    "lease_until": None,
+                    "last_error": error,
+                    "updated_at": now,
+                },
+            },
+        )
+        logger.warning("Job %s (%s) failed attempt %d, retrying in %.0fs: %s", job.job_id, job.kind, job.attempts, delay, error)
+        return False
+
+    async def _bury(self, job_id: str, worker_id: str, error: str) -> None:
+        now = datetime.utcnow()
+        await self._collection.update_one(
+            {"_id": job_id, "worker_id": worker_id},
+            {"$set": {"status": DEAD, "lease_until": None, "last_error": error, "dead_at": now, "updated_at": now}},
+        )
+        logger.error("Job %s moved to dead letters: %s", job_id, error)
+
+    async def retry(self, job_id: str) -> bool:
+        """Requeue a dead job with a fresh attempt budget."""
+
+        now = datetime.utcnow()
+        result = await self._collection.update_one(
+            {"_id": job_id, "status": DEAD},
+            {"$set": {"status": QUEUED, "attempts": 0, "run_at": now, "worker_id": None, "updated_at": now}},
+        )
+        return result.modified_count == 1
+
+    async def counts(self) -> Dict[str, Dict[str, int]]:
+        """Job counts by kind and status."""
+
+        counts: Dict[str, Dict[str, int]] = {}
+        cursor = self._collection.aggregate(
+            [{"$group": {"_id": {"kind": "$kind", "status": "$status"}, "count": {"$sum": 1}}}],
+        )
+        async for row in cursor:
+            counts.setdefault(row["_id"]["kind"], {})[row["_id"]["status"]] = row["count"]
+        return counts
+
+    async def list_dead(self, limit: int = 50) -> List[Job]:
+        cursor = self._collection.find({"status": DEAD}).sort("dead_at", -1).limit(limit)
+        return [Job.from_document(document) async for document in cursor]
+
+
+_job_queue: Optional[JobQueue] = None
+
+
+def get_job_queue() -> JobQueue:
+    """Return the JobQueue singleton."""
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = JobQueue(get_jobs_collection(), get_settings())
+    return _job_queue
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+from typing import Awaitable, Callable, Dict, Optional, Set
+
+from app.core.config import Settings
+from app.jobs.queue import Job, JobQueue
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[Job], Awaitable[None]]
+
+
+class JobWorker:
+    """Leases jobs of the registered kinds and runs up to ``concurrency`` of them at a time.
+
+    Each running job gets a heartbeat task that extends its lease every
+    third of ``job_lease_sec``; if the lease was lost (another worker took
+    over after a stall), the run is cancelled so the job is not processed
+    twice.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handlers: Dict[str, JobHandler],
+        settings: Settings,
+        worker_id: Optional[str] = None,
+    ) -> None:
+        self._queue = queue
+        self._handlers = handlers
+        self._settings = settings
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._slots = asyncio.Semaphore(max(settings.job_worker_concurrency, 1))
+        self._running: Set[asyncio.Task[None]] = set()
+        self._stopping = asyncio.Event()
+
+    async def run(self) -> None:
+        logger.info("Job worker %s started for %s", self.worker_id, ", ".join(sorted(self._handlers)))
+        while not self._stopping.is_set():
+            await self._slots.acquire()
+            if self._stopping.is_set():
+                # stop() arrived while every slot was busy: do not start work shutdown cannot finish.
+                self._slots.release()
+                break
+            try:
+                job = await self._queue.lease(self.worker_id, list(self._handlers))
+            except Exception as exc:  # pragma: no cover - transient Mongo errors
+                logger.warning("Job lease failed: %s", exc)
+                job = None
+            if job is None:
+                self._slots.release()
+                await self._sleep(self._settings.job_poll_interval_sec)
+                continue
+            task = asyncio.create_task(self._execute(job))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+        # Let in-flight jobs finish; anything cut short is re-leased once its lease expires.
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+        logger.info("Job worker %s stopped", self.worker_id)
+
+    async def run_once(self) -> bool:
+        """Lease and run a single job; False if none was due."""
+        job = await self._queue.lease(self.worker_id, list(self._handlers))
+        if job is None:
+            return False
+        await self._slots.acquire()
+        await self._execute(job)
+        return True
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def _sleep(self, seconds: float) -> None:
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _execute(self, job: Job) -> None:
+        handler_task = asyncio.create_task(self._handlers[job.kind](job))
+        heartbeat = asyncio.create_task(self._heartbeat(job, handler_task))
+        try:
+            await handler_task
+        except asyncio.CancelledError:
+            logger.warning("Job %s (%s) lost its lease and was abandoned", job.job_id, job.kind)
+        except Exception as exc:
+            logger.exception("Job %s (%s) failed on attempt %d", job.job_id, job.kind, job.attempts)
+            await self._queue.fail(job, self.worker_id, f"{type(exc).__name__}: {exc}"[:500])
+        else:
+            await self._queue.complete(job.job_id, self.worker_id)
+            logger.info("Job %s (%s) done on attempt %d", job.job_id, job.kind, job.attempts)
+        finally:
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+            self._slots.release()
+
+    async def _heartbeat(self, job: Job, handler_task: asyncio.Task[None]) -> None:
+        interval = max(self._settings.job_lease_sec / 3, 0.5)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                alive = await self._queue.heartbeat(job.job_id, self.worker_id)
+            except Exception as exc:  # pragma: no cover - transient Mongo errors
+                logger.warning("Heartbeat for job %s failed: %s", job.job_id, exc)
+                continue
+            if not alive:
+                handler_task.cancel()
+                return
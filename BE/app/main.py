@@ -1,13 +1,24 @@
 from __future__ import annotations
 
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, Response
 from starlette.staticfiles import StaticFiles
 
 from app.api import v1_router
+from app.api.dependencies import require_metrics_token
 from app.core.config import get_settings
-from app.sessions.manager import SessionManager
+from app.core.logging import configure_logging, shutdown_logging
+from app.core.metrics import CONTENT_TYPE, REGISTRY
+from app.core.uploads import BodySizeLimitMiddleware
+from app.services.ocr_service import run_spool_sweeper
+from app.sessions.manager import get_session_manager
+from app.use_cases.stt.batch_usecase import shutdown_stt_batch_use_case
+from app.use_cases.ocr.services.schema_loader import get_schema_loader
 
 
 import logging
@@ -16,12 +27,35 @@ logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    # 종료 시 shutdown_logging과 짝을 이루도록 시작 시점에 설정 (재시작되는 lifespan마다 다시 연결)
+    configure_logging(settings)
+    session_manager = get_session_manager()
+    await session_manager.start()
+    # OCR 프롬프트(템플릿 + 스키마) 미리 컴파일, 첫 업로드에서 파일 읽기/JSON 직렬화 생략
+    get_schema_loader().warm()
+    # 큐 모드에서 워커가 지우지 못한 OCR 스풀 파일 정리
+    sweeper = asyncio.create_task(run_spool_sweeper()) if settings.jobs_enabled else None
+    try:
+        yield
+    finally:
+        if sweeper is not None:
+            sweeper.cancel()
+            await asyncio.gather(sweeper, return_exceptions=True)
+        await shutdown_stt_batch_use_case()
+        await session_manager.shutdown()
+        shutdown_logging()
+
+
 app = FastAPI(
     title="BMR STT Backend",
     version="0.1.0",
     debug=settings.debug,
     redirect_slashes=False,
-    docs_url="/docs"
+    docs_url="/docs",
+    lifespan=lifespan,
 )
 
 allowed_origins = {
@@ -38,6 +72,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 업로드 본문이 한도를 넘으면 스풀 전에 413으로 거절
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    limits=[
+        (r"^/v1/ocr/uploads/", settings.upload_max_document_bytes),
+        (r"^/v1/rooms/[^/]+/photos$", settings.upload_max_photo_bytes),
+        (r"^/v1/stt/batch$", settings.upload_max_audio_bytes),
+    ],
+)
+
 app.mount(
     "/recordings",
     StaticFiles(directory=settings.storage_dir, html=False),
@@ -49,4 +93,12 @@ app.mount(
 async def health_check() -> JSONResponse:
     return JSONResponse({"status": "ok"})
 
+
+if settings.metrics_enabled:
+
+    @app.get("/metrics", tags=["health"], include_in_schema=False, dependencies=[Depends(require_metrics_token)])
+    async def metrics() -> Response:
+        return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
 app.include_router(v1_router)
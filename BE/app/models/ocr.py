@@ -33,6 +33,18 @@ class OcrBase(BaseModel):
         default=None,
         description="Storage key for the uploaded document within object storage.",
     )
+    content_hash: Optional[str] = Field(
+        default=None,
+        description="SHA-256 of the uploaded document (ocr_cache key).",
+    )
+    schema_version: Optional[str] = Field(
+        default=None,
+        description="Prompt/schema version the detail was parsed with; stale records are re-parsed.",
+    )
+    parse_model: Optional[str] = Field(
+        default=None,
+        description="OpenAI model the detail was parsed with.",
+    )
 
 
 class OcrDetailResponse(BaseModel):
@@ -1,6 +1,8 @@
 from .room_repository import RoomRepository
 from .ocr_repository import OcrRepository
+from .ocr_cache_repository import OcrCacheRepository
 from .llm_repository import LlmRepository
 from .stt_repository import STTRepository
+from .stt_batch_job_repository import STTBatchJobRepository
 
-__all__ = ["RoomRepository", "OcrRepository", "LlmRepository", "STTRepository"]
+__all__ = ["RoomRepository", "OcrRepository", "OcrCacheRepository", "LlmRepository", "STTRepository", "STTBatchJobRepository"]
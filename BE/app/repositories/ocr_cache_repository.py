@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import logging
+import re
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger(__name__)
+
+
+class OcrCacheRepository:
+    """OCR results keyed by document content rather than by upload.
+
+    ``_id`` is ``content_hash:contract_type:schema_version:model``, so an
+    exact lookup and a "any entry for this document" prefix lookup (to reuse
+    the raw Upstage response after a schema or model change) both use the
+    ``_id`` index.
+    """
+
+    def __init__(self, collection: AsyncIOMotorCollection) -> None:
+        self._collection = collection
+
+    @staticmethod
+    def cache_key(content_hash: str, contract_type: str, schema_version: str, model: str) -> str:
+        return f"{content_hash}:{contract_type}:{schema_version}:{model}"
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return await self._collection.find_one({"_id": key}, {"raw": 1, "parsed": 1})
+
+    async def find_raw(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        return await self._collection.find_one(
+            {"_id": {"$regex": f"^{re.escape(content_hash)}:"}},
+            {"raw": 1},
+        )
+
+    async def put(
+        self,
+        key: str,
+        *,
+        content_hash: str,
+        contract_type: str,
+        schema_version: str,
+        model: str,
+        raw: Dict[str, Any],
+        parsed: Dict[str, Any],
+    ) -> None:
+        document = {
+            "content_hash": content_hash,
+            "contract_type": contract_type,
+            "schema_version": schema_version,
+            "model": model,
+            "raw": raw,
+            "parsed": parsed,
+        }
+        try:
+            # Two concurrent misses for the same document both parse; the first write wins.
+            await self._collection.update_one(
+                {"_id": key},
+                {"$setOnInsert": document | {"created_at": datetime.utcnow()}},
+                upsert=True,
+            )
+        except PyMongoError as exc:  # e.g. a raw response over the 16 MB document limit
+            logger.warning("Failed to cache OCR result %s: %s", key, exc)
@@ -1,11 +1,18 @@
 from __future__ import annotations
 
-from typing import List, Optional
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 from motor.motor_asyncio import AsyncIOMotorClientSession, AsyncIOMotorCollection
+from pymongo.errors import DocumentTooLarge
 
 from app.models import OcrBase
 
+logger = logging.getLogger(__name__)
+
+# The raw Upstage response (text + layout) is kept on the record for re-parsing but never read by the API.
+_WITHOUT_RAW = {"ocr_raw": 0}
+
 
 class OcrRepository:
     def __init__(self, collection: AsyncIOMotorCollection) -> None:
@@ -36,11 +43,11 @@ class OcrRepository:
         )
 
     async def get(self, user_id: str, ocr_id: str) -> Optional[OcrBase]:
-        document = await self._collection.find_one({"_id": ocr_id, "user_id": user_id})
+        document = await self._collection.find_one({"_id": ocr_id, "user_id": user_id}, _WITHOUT_RAW)
         return self._deserialize(document)
 
     async def list_by_room(self, user_id: str, room_id: str) -> List[OcrBase]:
-        cursor = self._collection.find({"user_id": user_id, "room_id": room_id}).sort("created_at", -1)
+        cursor = self._collection.find({"user_id": user_id, "room_id": room_id}, _WITHOUT_RAW).sort("created_at", -1)
         records: List[OcrBase] = []
         async for document in cursor:
             record = self._deserialize(document)
@@ -56,6 +63,33 @@ class OcrRepository:
         )
         return result.modified_count == 1
 
+    async def store_raw(self, user_id: str, ocr_id: str, raw: Dict[str, Any]) -> None:
+        try:
+            await self._collection.update_one({"_id": ocr_id, "user_id": user_id}, {"$set": {"ocr_raw": raw}})
+        except DocumentTooLarge:
+            # Over Mongo's 16 MB limit; this record can only be re-processed with OCR.
+            logger.warning("Raw OCR output for %s is too large to store", ocr_id)
+
+    async def iter_reparse_candidates(
+        self,
+        schema_version: str,
+        model: str,
+        *,
+        force: bool = False,
+        batch_size: int = 50,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Done records with stored raw OCR output parsed with another schema version/model (all of them if ``force``)."""
+
+        query: Dict[str, Any] = {"status": "done", "ocr_raw": {"$exists": True}}
+        if not force:
+            query["$or"] = [{"schema_version": {"$ne": schema_version}}, {"parse_model": {"$ne": model}}]
+        cursor = self._collection.find(
+            query,
+            {"user_id": 1, "content_hash": 1, "ocr_raw": 1},
+        ).batch_size(batch_size)
+        async for document in cursor:
+            yield document
+
     def _deserialize(self, document: Optional[dict]) -> Optional[OcrBase]:
         if not document:
             return None
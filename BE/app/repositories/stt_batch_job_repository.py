@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import logging
+from datetime import UTC, datetime, timedelta
+from typing import Any, Dict, Optional
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger(__name__)
+
+
+class STTBatchJobRepository:
+    """Status records of offline batch transcription jobs.
+
+    Records live in Mongo so any API worker can answer ``GET /stt/batch/{job_id}``
+    and a restart does not lose them. Finished records carry ``expires_at``
+    and are removed by a TTL index once the retention period has passed.
+    """
+
+    def __init__(self, collection: AsyncIOMotorCollection, retention_sec: float) -> None:
+        self._collection = collection
+        self._retention = timedelta(seconds=retention_sec)
+        self._indexed = False
+
+    async def _ensure_indexes(self) -> None:
+        if self._indexed:
+            return
+        try:
+            await self._collection.create_index("expires_at", expireAfterSeconds=0)
+            self._indexed = True
+        except PyMongoError as exc:
+            logger.warning("Failed to create the batch job TTL index: %s", exc)
+
+    async def create(self, job: Dict[str, Any]) -> None:
+        await self._ensure_indexes()
+        await self._collection.insert_one({"_id": job["job_id"], **job})
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        document = await self._collection.find_one({"_id": job_id})
+        if document is None:
+            return None
+        document.pop("_id", None)
+        document.pop("expires_at", None)
+        return document
+
+    async def update(self, job_id: str, fields: Dict[str, Any]) -> None:
+        await self._collection.update_one({"_id": job_id}, {"$set": fields})
+
+    async def finish(self, job_id: str, fields: Dict[str, Any]) -> None:
+        """Record the final state and schedule the record for expiry."""
+        now = datetime.now(UTC)
+        await self.update(job_id, fields | {"finished_at": now.timestamp(), "expires_at": now + self._retention})
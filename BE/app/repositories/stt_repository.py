@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List
+from typing import Any, Dict, List, Optional
 from motor.motor_asyncio import AsyncIOMotorCollection
 
 from app.models import STTResult, TranscriptSegment
@@ -32,23 +32,34 @@ class STTRepository:
 
     async def upsert_result(self, result: STTResult) -> None:
         payload = result.model_dump()
-        payload["_id"] = result.room_id
+        await self.upsert_documents(result.room_id, payload["qa"], payload["transcript"], payload["created_at"])
+
+    async def upsert_documents(
+        self,
+        room_id: str,
+        qa: List[Dict[str, Any]],
+        transcript: Dict[str, Any],
+        created_at: datetime | None = None,
+        session_id: Optional[str] = None,
+    ) -> None:
         now = datetime.utcnow()
-        payload["updated_at"] = now
-        payload.setdefault("created_at", now)
-
-        await self._collection.update_one(
-            {"_id": result.room_id},
-            {
-                "$set": {
-                    "qa": payload["qa"],
-                    "transcript": payload["transcript"],
-                    "updated_at": payload["updated_at"],
-                },
-                "$setOnInsert": {
-                    "created_at": payload["created_at"],
-                    "room_id": result.room_id,
-                },
+        update: Dict[str, Any] = {
+            "$set": {
+                "qa": qa,
+                "transcript": transcript,
+                "updated_at": now,
+            },
+            "$setOnInsert": {
+                "created_at": created_at or now,
+                "room_id": room_id,
             },
-            upsert=True,
-        )
+        }
+        if session_id:
+            # Remember which live sessions wrote this room so their recordings can be traced back to an owner.
+            update["$addToSet"] = {"session_ids": session_id}
+
+        await self._collection.update_one({"_id": room_id}, update, upsert=True)
+
+    async def find_room_id_by_session(self, session_id: str) -> Optional[str]:
+        document = await self._collection.find_one({"session_ids": session_id}, {"room_id": 1})
+        return document.get("room_id") if document else None
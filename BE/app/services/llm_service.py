@@ -3,7 +3,9 @@ from __future__ import annotations
 from datetime import UTC, datetime
 from typing import Any, Dict, List, Optional
 
+from app.core.config import settings
 from app.database.mongodb import get_llm_collection, get_session
+from app.jobs.queue import JobQueue, get_job_queue
 from app.models import LLMReportAck, LLMReportDetail, LLMReportTriggerPayload
 from app.repositories import LlmRepository
 from app.services.ocr_service import get_ocr_service
@@ -12,10 +14,13 @@ from app.use_cases.llm.llm_usecase import get_llm_usecase
 from app.services.room_service import get_room_service
 from app.services.stt_service import get_stt_service
 
+LLM_REPORT_JOB = "llm.report"
+
 
 class LlmService:
-    def __init__(self, repository: LlmRepository) -> None:
+    def __init__(self, repository: LlmRepository, jobs: Optional[JobQueue] = None) -> None:
         self._repository = repository
+        self._jobs = jobs
 
     async def create_report(
         self,
@@ -23,10 +28,31 @@ class LlmService:
         room_id: str,
         payload: Optional[LLMReportTriggerPayload] = None,
     ) -> LLMReportAck:
+        if self._jobs is not None:
+            # crew 실행은 워커가 처리, GET /llm/reports/{room_id} 로 상태(queued → processing → done) 확인
+            await self._persist_report(self._placeholder(user_id, room_id, "queued"))
+            await self._jobs.enqueue(LLM_REPORT_JOB, {"user_id": user_id, "room_id": room_id})
+            return LLMReportAck(room_id=room_id, status="queued", user_id=user_id)
+
         report = await self._generate_report(user_id, room_id, payload)
         await self._persist_report(report)
         return LLMReportAck(room_id=room_id, status=report.status, user_id=user_id)
 
+    async def run_report(self, user_id: str, room_id: str) -> None:
+        """Generate and store a queued report (job worker side)."""
+        await self._persist_report(self._placeholder(user_id, room_id, "processing"))
+        report = await self._generate_report(user_id, room_id, None)
+        await self._persist_report(report)
+
+    async def mark_failed(self, user_id: str, room_id: str, error: str) -> None:
+        report = self._placeholder(user_id, room_id, "failed")
+        report.detail = {"error": error}
+        await self._persist_report(report)
+
+    @staticmethod
+    def _placeholder(user_id: str, room_id: str, status: str) -> LLMReportDetail:
+        return LLMReportDetail(room_id=room_id, user_id=user_id, status=status, created_at=datetime.now(UTC))
+
     async def get_report(self, user_id: str, room_id: str) -> LLMReportDetail:
         report = await self._repository.get(user_id, room_id)
         if report:
@@ -72,4 +98,4 @@ class LlmService:
 
 def get_llm_service() -> LlmService:
     repository = LlmRepository(get_llm_collection())
-    return LlmService(repository)
+    return LlmService(repository, get_job_queue() if settings.jobs_enabled else None)
@@ -1,19 +1,34 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+import shutil
+import time
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 from uuid import uuid4
 
+from app.core.config import settings
+from app.core.uploads import UploadSource
 from app.database.mongodb import get_ocr_collection, get_session
+from app.jobs.queue import JobQueue, get_job_queue
 from app.models import OcrBase, OcrDetailResponse, OcrUploadResponse
 from app.repositories import OcrRepository
 from app.services.storage_service import StorageService, get_storage_service
-from app.use_cases.ocr.ocr_usecase import get_ocr_usecase
+from app.use_cases.ocr.ocr_usecase import OcrResult, get_ocr_usecase
+
+logger = logging.getLogger(__name__)
+
+OCR_JOB = "ocr.process"
+OCR_REPARSE_JOB = "ocr.reparse"
+PENDING_STATUSES = {"queued", "processing"}
+
 
 class OcrService:
-    def __init__(self, repository: OcrRepository, storage: StorageService) -> None:
+    def __init__(self, repository: OcrRepository, storage: StorageService, jobs: Optional[JobQueue] = None) -> None:
         self._repository = repository
         self._storage = storage
+        self._jobs = jobs
 
     async def upload_document(
         self,
@@ -22,7 +37,7 @@ class OcrService:
         room_id: str,
         filename: str,
         file_type: Optional[str],
-        content: bytes,
+        source: UploadSource,
         content_type: Optional[str],
     ) -> OcrUploadResponse:
         # safe_report_id = report_id or "unassigned"
@@ -31,24 +46,60 @@ class OcrService:
         ocr_id = file_stem
         object_key = f"ocr/{user_id}/{filename}"
 
-        await self._storage.upload_bytes(
+        upload = self._storage.upload_source(
             object_key,
-            content,
+            source,
             content_type=content_type or "application/octet-stream",
         )
-        ocr_usecase = get_ocr_usecase()
-        record = OcrBase(
-            ocr_id=ocr_id,
-            user_id=user_id,
-            room_id=room_id,
-            file_type=safe_file_type,
-            status="done",
-            detail=await ocr_usecase.process(object_key),  # 추후 합치면 제공될 예정!
-            object_key=object_key,
-        )
+        if self._jobs is not None:
+            # 캐시 히트면 바로 done, 아니면 OCR + 파싱은 워커가 처리 (GET /ocr/{room_id} 의 202 응답으로 진행 상태 확인)
+            uploaded, prepared = await asyncio.gather(upload, self._prepare_job(source), return_exceptions=True)
+            if isinstance(prepared, BaseException):
+                raise prepared
+            content_hash, result, spool_path = prepared
+            try:
+                if isinstance(uploaded, BaseException):
+                    raise uploaded
+                record = OcrBase(
+                    ocr_id=ocr_id,
+                    user_id=user_id,
+                    room_id=room_id,
+                    file_type=safe_file_type,
+                    status="queued",
+                    object_key=object_key,
+                    content_hash=content_hash,
+                )
+                if result is not None:
+                    record = record.model_copy(update=self._result_fields(result))
+                async with get_session() as session:
+                    await self._repository.upsert(record, session=session)
+                if result is not None:
+                    await self._repository.store_raw(user_id, ocr_id, result.raw)
+                else:
+                    payload = {"user_id": user_id, "ocr_id": ocr_id, "content_hash": content_hash}
+                    if spool_path is not None:
+                        payload["spool_path"] = str(spool_path)
+                    await self._jobs.enqueue(OCR_JOB, payload)
+            except BaseException:
+                # 워커에 넘기지 못한 스풀 파일은 여기서 정리 (S3 업로드/저장/enqueue 실패)
+                self._discard_spool(spool_path)
+                raise
+        else:
+            # S3 업로드와 해시/캐시 조회/OCR을 동시에 진행, OCR은 스풀된 요청 파일을 그대로 사용 (S3 재다운로드 없음)
+            _, (content_hash, result) = await asyncio.gather(upload, self._run_inline(object_key, source))
+            record = OcrBase(
+                ocr_id=ocr_id,
+                user_id=user_id,
+                room_id=room_id,
+                file_type=safe_file_type,
+                object_key=object_key,
+                content_hash=content_hash,
+                **self._result_fields(result),
+            )
 
-        async with get_session() as session:
-            await self._repository.upsert(record, session=session)
+            async with get_session() as session:
+                await self._repository.upsert(record, session=session)
+            await self._repository.store_raw(user_id, ocr_id, result.raw)
 
         url = await self._storage.generate_presigned_url(object_key)
         return OcrUploadResponse(ocr_id=ocr_id, status=record.status, object_url=url)
@@ -62,7 +113,7 @@ class OcrService:
         pending = False
 
         for record in records:
-            if record.status != "done":
+            if record.status in PENDING_STATUSES:
                 pending = True
             object_url = None
             if record.object_key:
@@ -82,12 +133,178 @@ class OcrService:
 
         return responses, pending
 
+    async def _run_inline(self, object_key: str, source: UploadSource) -> Tuple[str, OcrResult]:
+        usecase = get_ocr_usecase()
+        content_hash = await asyncio.to_thread(source.sha256)
+        result = await usecase.lookup(content_hash)
+        if result is None:
+            with source.open() as document:
+                result = await usecase.run(object_key, document=document, content_hash=content_hash)
+        return content_hash, result
+
+    async def _prepare_job(self, source: UploadSource) -> Tuple[str, Optional[OcrResult], Optional[Path]]:
+        content_hash = await asyncio.to_thread(source.sha256)
+        result = await get_ocr_usecase().lookup(content_hash)
+        # 워커가 같은 볼륨을 보면 스풀 파일을 읽고, 다른 노드에서 재시도되면 S3에서 받음
+        spool_path = await self._spool(source) if result is None else None
+        return content_hash, result, spool_path
+
+    @staticmethod
+    def _result_fields(result: OcrResult) -> Dict[str, Any]:
+        return {
+            "status": "done",
+            "detail": result.parsed,
+            "schema_version": result.schema_version,
+            "parse_model": result.model,
+        }
+
+    async def process_document(
+        self,
+        user_id: str,
+        ocr_id: str,
+        spool_path: Optional[str] = None,
+        content_hash: Optional[str] = None,
+    ) -> None:
+        """Run OCR and parsing for a queued upload (job worker side).
+
+        Reads the API's spooled copy when this worker shares its volume and
+        falls back to S3 otherwise (e.g. a retry on another node).
+        """
+        record = await self._repository.get(user_id, ocr_id)
+        if record is None or not record.object_key:
+            raise LookupError(f"OCR record {ocr_id} not found")
+
+        await self._repository.update(user_id, ocr_id, {"status": "processing"})
+        document = self._open_spool(spool_path)
+        try:
+            result = await get_ocr_usecase().run(record.object_key, document=document, content_hash=content_hash)
+        finally:
+            if document is not None:
+                document.close()
+        await self._repository.update(user_id, ocr_id, self._result_fields(result) | {"content_hash": content_hash})
+        await self._repository.store_raw(user_id, ocr_id, result.raw)
+        self._discard_spool(spool_path)
+
+    async def reparse_stored(self, force: bool = False) -> Dict[str, int]:
+        """Re-run only the OpenAI stage over stored raw OCR output (job worker side).
+
+        Picks done records parsed with an older schema version or model (all of
+        them if ``force``) and re-parses up to ``ocr_reparse_concurrency`` at a
+        time. Without ``force`` a retried job continues where it stopped.
+        """
+        usecase = get_ocr_usecase()
+        schema_version, model = usecase.current_version()
+        concurrency = max(settings.ocr_reparse_concurrency, 1)
+        pending: asyncio.Queue[Optional[Dict[str, Any]]] = asyncio.Queue(maxsize=concurrency * 2)
+        counts = {"reparsed": 0, "failed": 0}
+
+        async def _reparse_worker() -> None:
+            while (item := await pending.get()) is not None:
+                try:
+                    result = await usecase.reparse(item["ocr_raw"], content_hash=item.get("content_hash"))
+                    await self._repository.update(item["user_id"], item["_id"], self._result_fields(result))
+                    counts["reparsed"] += 1
+                except Exception as exc:
+                    counts["failed"] += 1
+                    logger.warning("Re-parse of OCR record %s failed: %s", item["_id"], exc)
+
+        workers = [asyncio.create_task(_reparse_worker()) for _ in range(concurrency)]
+        try:
+            async for item in self._repository.iter_reparse_candidates(schema_version, model, force=force):
+                await pending.put(item)
+            for _ in workers:
+                await pending.put(None)
+            await asyncio.gather(*workers)
+        except BaseException:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            raise
+
+        logger.info(
+            "Re-parsed %d OCR records to schema %s / %s (%d failed)",
+            counts["reparsed"], schema_version, model, counts["failed"],
+        )
+        return counts
+
+    async def mark_failed(self, user_id: str, ocr_id: str, error: str, spool_path: Optional[str] = None) -> None:
+        await self._repository.update(user_id, ocr_id, {"status": "failed", "detail": {"error": error}})
+        self._discard_spool(spool_path)
+
+    async def _spool(self, source: UploadSource) -> Optional[Path]:
+        path = Path(settings.ocr_spool_dir) / f"{uuid4().hex}.pdf"
+
+        def _write() -> None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with source.open() as reader, path.open("wb") as out:
+                shutil.copyfileobj(reader, out)
+
+        try:
+            await asyncio.to_thread(_write)
+        except OSError as exc:  # pragma: no cover - the worker downloads from S3 instead
+            logger.warning("Failed to spool OCR upload to %s: %s", path, exc)
+            path.unlink(missing_ok=True)
+            return None
+        return path
+
+    @staticmethod
+    def _open_spool(spool_path: Optional[str]):
+        if not spool_path:
+            return None
+        try:
+            return Path(spool_path).open("rb")
+        except OSError:
+            return None
+
+    @staticmethod
+    def _discard_spool(spool_path: Optional[str]) -> None:
+        if spool_path:
+            Path(spool_path).unlink(missing_ok=True)
+
     async def list_details(self, user_id: str, room_id: str) -> List[Dict[str, Any]]:
         records = await self._repository.list_by_room(user_id, room_id)
         return [record.detail for record in records]
 
 
+def sweep_ocr_spool(max_age_sec: float) -> int:
+    """Delete spool files older than ``max_age_sec`` (blocking). Returns how many were removed.
+
+    The worker removes a spool file when its job finishes, but only if it
+    runs on the same volume; files left by jobs that ran elsewhere are only
+    ever cleaned up here. Past that age no retry can still be pending, and a
+    late one falls back to S3 anyway.
+    """
+    spool_dir = Path(settings.ocr_spool_dir)
+    if not spool_dir.is_dir():
+        return 0
+    cutoff = time.time() - max_age_sec
+    removed = 0
+    for path in spool_dir.glob("*.pdf"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except FileNotFoundError:
+            continue
+    return removed
+
+
+async def run_spool_sweeper() -> None:
+    """Sweep OCR_SPOOL_DIR every OCR_SPOOL_SWEEP_INTERVAL_SEC (API lifespan task while jobs are enabled)."""
+    max_age = (settings.job_lease_sec + settings.job_backoff_max_sec) * max(settings.job_max_attempts, 1)
+    interval = max(settings.ocr_spool_sweep_interval_sec, 1.0)
+    while True:
+        try:
+            removed = await asyncio.to_thread(sweep_ocr_spool, max_age)
+        except OSError as exc:  # pragma: no cover - transient filesystem errors
+            logger.warning("OCR spool sweep failed: %s", exc)
+        else:
+            if removed:
+                logger.info("Removed %d stale OCR spool file(s)", removed)
+        await asyncio.sleep(interval)
+
+
 def get_ocr_service() -> OcrService:
     repository = OcrRepository(get_ocr_collection())
     storage = get_storage_service()
-    return OcrService(repository, storage)
+    return OcrService(repository, storage, get_job_queue() if settings.jobs_enabled else None)
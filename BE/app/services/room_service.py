@@ -6,6 +6,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional
 from uuid import uuid4
 
+from app.core.uploads import UploadSource
 from app.database.mongodb import get_rooms_collection, get_session
 from app.models import RoomBase, RoomCreateRequest, RoomDetailResponse, RoomPhoto
 from app.repositories import RoomRepository
@@ -65,7 +66,7 @@ class RoomService:
         user_id: str,
         room_id: str,
         filename: str,
-        content: bytes,
+        source: UploadSource,
         content_type: Optional[str],
     ) -> Optional[RoomPhoto]:
         room = await self._repository.get_room(user_id, room_id)
@@ -76,9 +77,9 @@ class RoomService:
         safe_filename = self._sanitize_filename(filename)
         object_key = f"rooms/{user_id}/{room_id}/{photo_id}/{safe_filename}"
 
-        await self._storage.upload_bytes(
+        await self._storage.upload_source(
             object_key,
-            content,
+            source,
             content_type=content_type or "application/octet-stream",
         )
 
@@ -7,6 +7,11 @@ import boto3
 from botocore.client import Config
 
 from app.core.config import settings
+from app.core.metrics import track_call
+from app.core.uploads import UploadSource
+
+# S3 rejects multipart parts smaller than this (except the last one).
+_MIN_PART_SIZE = 5 * 1024 * 1024
 
 
 class StorageService:
@@ -43,10 +48,84 @@ class StorageService:
             }
             if content_type:
                 params["ContentType"] = content_type
-            self._client.put_object(**params)
+            with track_call("s3", "put_object"):
+                self._client.put_object(**params)
 
         await asyncio.to_thread(_upload)
 
+    async def upload_source(
+        self,
+        key: str,
+        source: UploadSource,
+        *,
+        content_type: Optional[str] = None,
+    ) -> None:
+        """Upload a spooled upload, as S3 multipart parts when it is larger than one part.
+
+        Each part is read from the source inside its upload thread, so at most
+        ``upload_part_concurrency`` parts are in memory at a time.
+        """
+
+        part_size = max(settings.upload_part_size_bytes, _MIN_PART_SIZE)
+        if source.size <= part_size:
+            data = await asyncio.to_thread(source.read_at, 0, source.size)
+            await self.upload_bytes(key, data, content_type=content_type)
+            return
+
+        def _create() -> str:
+            params = {"Bucket": self._bucket, "Key": key}
+            if content_type:
+                params["ContentType"] = content_type
+            with track_call("s3", "create_multipart_upload"):
+                return self._client.create_multipart_upload(**params)["UploadId"]
+
+        upload_id = await asyncio.to_thread(_create)
+        semaphore = asyncio.Semaphore(max(settings.upload_part_concurrency, 1))
+
+        async def _upload_part(number: int, offset: int) -> dict:
+            def _send() -> dict:
+                body = source.read_at(offset, part_size)
+                with track_call("s3", "upload_part"):
+                    response = self._client.upload_part(
+                        Bucket=self._bucket,
+                        Key=key,
+                        UploadId=upload_id,
+                        PartNumber=number,
+                        Body=body,
+                    )
+                return {"PartNumber": number, "ETag": response["ETag"]}
+
+            async with semaphore:
+                return await asyncio.to_thread(_send)
+
+        def _complete(parts: list[dict]) -> None:
+            with track_call("s3", "complete_multipart_upload"):
+                self._client.complete_multipart_upload(
+                    Bucket=self._bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    MultipartUpload={"Parts": parts},
+                )
+
+        def _abort() -> None:
+            with track_call("s3", "abort_multipart_upload"):
+                self._client.abort_multipart_upload(Bucket=self._bucket, Key=key, UploadId=upload_id)
+
+        tasks = [
+            asyncio.create_task(_upload_part(number, offset))
+            for number, offset in enumerate(range(0, source.size, part_size), start=1)
+        ]
+        try:
+            parts = await asyncio.gather(*tasks)
+            await asyncio.to_thread(_complete, list(parts))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            # Uncompleted parts are billed until aborted.
+            await asyncio.shield(asyncio.to_thread(_abort))
+            raise
+
     async def download_bytes(self, key: str) -> bytes:
         """Download binary content from S3 at the provided key.
         
@@ -61,11 +140,12 @@ class StorageService:
         """
         
         def _download() -> bytes:
-            response = self._client.get_object(
-                Bucket=self._bucket,
-                Key=key
-            )
-            return response['Body'].read()
+            with track_call("s3", "get_object"):
+                response = self._client.get_object(
+                    Bucket=self._bucket,
+                    Key=key
+                )
+                return response['Body'].read()
         
         return await asyncio.to_thread(_download)
 
@@ -85,7 +165,8 @@ class StorageService:
         """Delete an object from storage."""
 
         def _delete() -> None:
-            self._client.delete_object(Bucket=self._bucket, Key=key)
+            with track_call("s3", "delete_object"):
+                self._client.delete_object(Bucket=self._bucket, Key=key)
 
         await asyncio.to_thread(_delete)
 
@@ -2,10 +2,15 @@ from __future__ import annotations
 
 from typing import Iterable
 
+from pydantic import TypeAdapter
+
 from app.database.mongodb import get_stt_collection
 from app.models import QAPair, STTResult, TranscriptPayload, TranscriptSegment
 from app.repositories import STTRepository
-from typing import Any, Dict, Iterable, List
+from typing import Any, Dict, Iterable, List, Optional
+
+_QA_DOCUMENTS = TypeAdapter(List[QAPair])
+_SEGMENT_DOCUMENTS = TypeAdapter(List[TranscriptSegment])
 
 
 class STTService:
@@ -27,6 +32,28 @@ class STTService:
         )
         await self._repository.upsert_result(result)
 
+    async def save_documents(
+        self,
+        room_id: str,
+        qa_documents: List[Dict[str, Any]],
+        segment_documents: List[Dict[str, Any]],
+        session_id: Optional[str] = None,
+    ) -> None:
+        """Persist plain ``QAPair``/``TranscriptSegment`` dicts after validating them in one pass.
+
+        The dicts are stored as given (no model round trip), so they must already
+        carry exactly the model fields; a ``ValidationError`` is raised otherwise.
+        """
+        _QA_DOCUMENTS.validate_python(qa_documents)
+        _SEGMENT_DOCUMENTS.validate_python(segment_documents)
+        await self._repository.upsert_documents(
+            room_id, qa_documents, {"segments": segment_documents}, session_id=session_id
+        )
+
+    async def get_session_room_id(self, session_id: str) -> Optional[str]:
+        """Room a finished live session persisted its results into, if any."""
+        return await self._repository.find_room_id_by_session(session_id)
+
     async def get_transcript_triplets(self, room_id: str) -> List[Dict[str, Any]]:
         segments = await self._repository.get_transcript_segments(room_id)
         return [{"sid": idx,"t0": s.start, "t1": s.end, "text": s.text} for idx, s in enumerate(segments)]
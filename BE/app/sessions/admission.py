@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from typing import Optional
+
+from app.core.config import Settings
+from app.sessions.metrics import SESSIONS_REJECTED
+from app.sessions.registry import HOSTNAME, SessionRegistry
+
+logger = logging.getLogger(__name__)
+
+
+class SessionAdmissionError(Exception):
+    """Raised when a new session is refused; ``retry_after`` is a hint in seconds."""
+
+    def __init__(self, reason: str, message: str, retry_after: float) -> None:
+        super().__init__(message)
+        self.reason = reason
+        self.message = message
+        self.retry_after = retry_after
+
+
+class LoadMonitor:
+    """Samples CPU load once per ``interval`` so admission checks stay O(1).
+
+    Two signals are combined: this worker's own CPU time over the last window
+    (the event loop saturates one core long before the node does) and the
+    1-minute load average normalised by core count, which also covers sibling
+    uvicorn workers and pool processes.
+    """
+
+    def __init__(self, interval: float = 1.0) -> None:
+        self._interval = interval
+        self._cpu_count = os.cpu_count() or 1
+        self._last_wall = time.monotonic()
+        self._last_cpu = time.process_time()
+        self._process_load = 0.0
+        self._task: Optional[asyncio.Task[None]] = None
+
+    @property
+    def cpu_load(self) -> float:
+        return max(self._process_load, self._node_load())
+
+    def sample(self) -> None:
+        wall, cpu = time.monotonic(), time.process_time()
+        elapsed = wall - self._last_wall
+        if elapsed > 0:
+            self._process_load = min((cpu - self._last_cpu) / elapsed, 1.0)
+        self._last_wall, self._last_cpu = wall, cpu
+
+    def start(self) -> None:
+        if self._task is None:
+            self.sample()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def _node_load(self) -> float:
+        try:
+            return os.getloadavg()[0] / self._cpu_count
+        except (AttributeError, OSError):  # pragma: no cover - not available on Windows
+            return 0.0
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            self.sample()
+
+
+class AdmissionController:
+    """Decides whether this worker may start another STT session."""
+
+    def __init__(self, settings: Settings, registry: SessionRegistry, monitor: Optional[LoadMonitor] = None) -> None:
+        self._settings = settings
+        self._registry = registry
+        self._monitor = monitor or LoadMonitor()
+
+    @property
+    def monitor(self) -> LoadMonitor:
+        return self._monitor
+
+    async def check(self, user_id: Optional[str], backlog: float = 0.0) -> None:
+        """Raise :class:`SessionAdmissionError` if the session must be refused.
+
+        ``backlog`` is the mean fill ratio of this worker's session audio queues.
+        """
+
+        settings = self._settings
+        retry_after = settings.stt_admission_retry_after_sec
+
+        node_limit = settings.stt_max_sessions_per_node
+        if node_limit > 0 and await self._registry.count(host=HOSTNAME) >= node_limit:
+            self._reject("NODE_AT_CAPACITY", f"노드 동시 세션 한도({node_limit})에 도달했습니다.", retry_after)
+
+        user_limit = settings.stt_max_sessions_per_user
+        if user_id and user_limit > 0 and await self._registry.count(user_id=user_id) >= user_limit:
+            self._reject("USER_SESSION_LIMIT", f"사용자 동시 세션 한도({user_limit})에 도달했습니다.", retry_after)
+
+        cpu_threshold = settings.stt_admission_cpu_threshold
+        cpu_load = self._monitor.cpu_load
+        if cpu_threshold > 0 and cpu_load >= cpu_threshold:
+            # Load drains slower than a slot frees up, so ask clients to back off longer.
+            self._reject("NODE_OVERLOADED", f"서버 CPU 부하가 높습니다({cpu_load:.0%}).", retry_after * 2)
+
+        backlog_threshold = settings.stt_admission_backlog_threshold
+        if backlog_threshold > 0 and backlog >= backlog_threshold:
+            self._reject("NODE_OVERLOADED", f"오디오 처리 지연이 발생하고 있습니다({backlog:.0%}).", retry_after * 2)
+
+    def _reject(self, reason: str, message: str, retry_after: float) -> None:
+        logger.warning("Rejecting STT session: %s (%s)", reason, message)
+        SESSIONS_REJECTED.labels(reason).inc()
+        raise SessionAdmissionError(reason, message, retry_after)
@@ -3,13 +3,16 @@ from __future__ import annotations
 import asyncio
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Optional
 
 import av
 from av.audio.resampler import AudioResampler
 
 from app.core.config import Settings
+from app.core.logging import SampledLog
 from app.noise.ffmpeg_reducer import FFmpegNoiseReducer
+from app.sessions.metrics import AUDIO_BYTES, AUDIO_CHUNKS, AUDIO_DROPPED
+from app.sessions.opus_passthrough import OggOpusWriter
 from app.util.analysis_writer import AnalysisWriter
 logger = logging.getLogger(__name__)
 
@@ -26,6 +29,9 @@ class AudioPipeline:
         self._output_queue = output_queue
         self._bytes_sent = 0
         self._chunks_sent = 0
+        self._chunks_dropped = 0
+        self._chunk_log = SampledLog(logger, every=settings.log_hot_path_sample_every)
+        self._drop_log = SampledLog(logger, every=settings.log_hot_path_sample_every)
 
         self._resampler = AudioResampler(
             format="s16",
@@ -42,16 +48,37 @@ class AudioPipeline:
 
         self._logs_dir = settings.logs_dir
         self._recording_path = Path(settings.storage_dir) / f"{session_id}.wav"
-        self._recording_writer = AnalysisWriter(self._recording_path, sample_rate=settings.stt_sample_rate)
+        self._analysis_path = Path(settings.analysis_dir) / f"{session_id}.wav"
+        self._recording_writer: Optional[AnalysisWriter] = None
+        self._analysis_writer: Optional[AnalysisWriter] = None
+
+        self._passthrough = settings.stt_opus_passthrough
+        self._ogg_writer: Optional[OggOpusWriter] = None
+        self._ogg_path: Optional[Path] = None
+        self._ogg_file: Optional[BinaryIO] = None
+        if self._passthrough:
+            # Recording sinks are fed from the Ogg stream and decoded only when the session closes.
+            self._ogg_writer = OggOpusWriter()
+            self._ogg_path = Path(settings.storage_dir) / f"{session_id}.ogg"
+            try:
+                self._ogg_path.parent.mkdir(parents=True, exist_ok=True)
+                self._ogg_file = self._ogg_path.open("wb")
+            except Exception as exc:  # pragma: no cover - best-effort
+                logger.warning("Failed to open passthrough recording: %s", exc)
+                self._ogg_file = None
+        else:
+            self._open_writers()
+
+    def _open_writers(self) -> None:
+        self._recording_writer = AnalysisWriter(self._recording_path, sample_rate=self._settings.stt_sample_rate)
         try:
             self._recording_writer.open()
         except Exception as exc:  # pragma: no cover - best-effort
             logger.warning("Failed to open recording writer: %s", exc)
             self._recording_writer = None
 
-        analysis_path = Path(settings.analysis_dir) / f"{session_id}.wav"
-        if analysis_path != self._recording_path:
-            analysis_writer = AnalysisWriter(analysis_path, sample_rate=settings.stt_sample_rate)
+        if self._analysis_path != self._recording_path:
+            analysis_writer = AnalysisWriter(self._analysis_path, sample_rate=self._settings.stt_sample_rate)
             try:
                 analysis_writer.open()
             except Exception as exc:  # pragma: no cover - best-effort
@@ -61,6 +88,20 @@ class AudioPipeline:
         else:
             self._analysis_writer = self._recording_writer
 
+    @property
+    def passthrough(self) -> bool:
+        return self._passthrough
+
+    async def handle_opus_packet(self, packet: bytes) -> None:
+        if self._ogg_writer is None:
+            return
+        chunk = self._ogg_writer.append(packet)
+        if not chunk:
+            return
+        await self._push_chunk(chunk)
+        if self._ogg_file:
+            self._ogg_file.write(chunk)
+
     async def handle_frame(self, frame: av.AudioFrame) -> None:
         pcm_chunks = self._to_pcm_bytes(frame)
         for chunk in pcm_chunks:
@@ -95,7 +136,9 @@ class AudioPipeline:
             self._output_queue.put_nowait(chunk)
             self._bytes_sent += len(chunk)
             self._chunks_sent += 1
-            if self._chunks_sent <= 5 or self._chunks_sent % 20 == 0:
+            AUDIO_BYTES.inc(len(chunk))
+            AUDIO_CHUNKS.inc()
+            if self._chunk_log.due():
                 logger.debug(
                     "Session %s queued audio chunk size=%d total_bytes=%d chunks=%d",
                     self._session_id,
@@ -104,16 +147,50 @@ class AudioPipeline:
                     self._chunks_sent,
                 )
         except asyncio.QueueFull:
-            logger.debug("Audio queue full. Dropping chunk.")
+            self._chunks_dropped += 1
+            AUDIO_DROPPED.inc()
+            if self._drop_log.due():
+                logger.debug("Session %s audio queue full, dropped=%d", self._session_id, self._chunks_dropped)
 
     def close(self) -> None:
         if self._noise_reducer:
             self._noise_reducer.close()
+        if self._ogg_file:
+            try:
+                self._ogg_file.write(self._ogg_writer.flush(eos=True))
+            finally:
+                self._ogg_file.close()
+                self._ogg_file = None
+            self._decode_passthrough_recording()
         if self._recording_writer:
             self._recording_writer.close()
         if self._analysis_writer and self._analysis_writer is not self._recording_writer:
             self._analysis_writer.close()
 
+    def _decode_passthrough_recording(self) -> None:
+        if self._ogg_path is None or not self._ogg_path.exists():
+            return
+
+        self._open_writers()
+        try:
+            with av.open(str(self._ogg_path)) as container:
+                for frame in container.decode(audio=0):
+                    for chunk in self._to_pcm_bytes(frame):
+                        if self._recording_writer:
+                            self._recording_writer.append(chunk)
+                        if self._analysis_writer and self._analysis_writer is not self._recording_writer:
+                            self._analysis_writer.append(chunk)
+        except Exception as exc:  # pragma: no cover - best-effort
+            logger.warning("Session %s failed to decode passthrough recording: %s", self._session_id, exc)
+            return
+        self._ogg_path.unlink(missing_ok=True)
+
+    @property
+    def open_files(self) -> int:
+        writers = {id(writer): writer for writer in (self._recording_writer, self._analysis_writer) if writer}
+        count = sum(1 for writer in writers.values() if writer.is_open)
+        return count + (1 if self._ogg_file else 0)
+
     @property
     def recording_path(self) -> Path:
         return self._recording_path
@@ -122,4 +199,5 @@ class AudioPipeline:
         return {
             "bytes": self._bytes_sent,
             "chunks": self._chunks_sent,
+            "dropped": self._chunks_dropped,
         }
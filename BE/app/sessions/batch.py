@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator, List, Optional
+
+import av
+import numpy as np
+from av.audio.resampler import AudioResampler
+from google.api_core import exceptions as google_exceptions
+from google.cloud.speech_v1 import types as speech_types
+from google.cloud.speech_v1.types import SpeechRecognitionResult
+
+from app.core.config import Settings
+from app.core.metrics import track_call
+from app.sessions.diarization import DiarizationProcessor, Segment
+from app.sessions.qa_extractor import QAExtractor
+from app.sessions.session_store import QAPairStore, SegmentStore
+from app.sessions.speech_backends import create_speech_client, recognition_config
+
+logger = logging.getLogger(__name__)
+
+_BYTES_PER_SAMPLE = 2
+# Cut points are moved to the quietest 20 ms window near the boundary so words are rarely split.
+_CUT_WINDOW_SEC = 0.02
+_CUT_SEARCH_SEC = 1.5
+
+
+@dataclass
+class AudioChunk:
+    index: int
+    offset: float
+    pcm: bytes
+
+
+@dataclass
+class BatchTranscriptionResult:
+    segments: List[Segment] = field(default_factory=list)
+    qa_pairs: QAPairStore = field(default_factory=QAPairStore)
+    audio_seconds: float = 0.0
+    elapsed_seconds: float = 0.0
+    chunks: int = 0
+
+    @property
+    def realtime_factor(self) -> float:
+        return self.audio_seconds / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def transcript_segments(self) -> SegmentStore:
+        return SegmentStore(self.segments)
+
+
+def iter_pcm_chunks(path: Path, sample_rate: int, chunk_seconds: float) -> Iterator[AudioChunk]:
+    """Decode any audio file to mono s16 at ``sample_rate`` and yield ~``chunk_seconds`` pieces."""
+
+    resampler = AudioResampler(format="s16", layout="mono", rate=sample_rate)
+    target = int(chunk_seconds * sample_rate)
+    window = max(int(_CUT_WINDOW_SEC * sample_rate), 1)
+    search = int(min(_CUT_SEARCH_SEC, chunk_seconds / 4) * sample_rate)
+    pending = np.zeros(0, dtype=np.int16)
+    consumed = 0
+    index = 0
+
+    def _decoded() -> Iterator[np.ndarray]:
+        with av.open(str(path)) as container:
+            for frame in container.decode(audio=0):
+                for converted in resampler.resample(frame):
+                    yield converted.to_ndarray().reshape(-1)
+        for converted in resampler.resample(None):
+            yield converted.to_ndarray().reshape(-1)
+
+    for samples in _decoded():
+        pending = np.concatenate((pending, samples))
+        while len(pending) >= target + search:
+            cut = _quiet_cut(pending, target, search, window)
+            yield AudioChunk(index=index, offset=consumed / sample_rate, pcm=pending[:cut].tobytes())
+            consumed += cut
+            pending = pending[cut:]
+            index += 1
+
+    if len(pending):
+        yield AudioChunk(index=index, offset=consumed / sample_rate, pcm=pending.tobytes())
+
+
+def _quiet_cut(samples: np.ndarray, target: int, search: int, window: int) -> int:
+    region = samples[target - search : target + search].astype(np.float32)
+    usable = len(region) // window * window
+    if usable == 0:
+        return target
+    energy = np.square(region[:usable]).reshape(-1, window).mean(axis=1)
+    return target - search + int(np.argmin(energy)) * window + window // 2
+
+
+class BatchTranscriber:
+    """Re-transcribes a finished recording faster than real time.
+
+    The audio is cut into chunks that are streamed to the recognition
+    backend concurrently (bounded by ``stt_batch_concurrency``); each
+    chunk's word offsets are shifted by its position in the file and the
+    merged segments go through the same diarization and Q&A extraction as
+    a live session.
+
+    Streaming recognition rejects audio sent faster than real time, so each
+    stream is paced to ``stt_batch_stream_speed``; the overall speed-up
+    comes from running several chunks at once.
+    """
+
+    def __init__(self, settings: Settings, client: Any = None) -> None:
+        self._settings = settings
+        self._client = client
+
+    async def transcribe(self, path: Path) -> BatchTranscriptionResult:
+        settings = self._settings
+        client = self._client or await asyncio.to_thread(create_speech_client, settings)
+        semaphore = asyncio.Semaphore(max(settings.stt_batch_concurrency, 1))
+        chunks = iter_pcm_chunks(path, settings.stt_sample_rate, settings.stt_batch_chunk_sec)
+
+        started = time.perf_counter()
+        tasks: List[asyncio.Task[List[Segment]]] = []
+        audio_bytes = 0
+        try:
+            while True:
+                # Decode lazily so only ``concurrency + 1`` chunks are held in memory.
+                await semaphore.acquire()
+                chunk = await asyncio.to_thread(next, chunks, None)
+                if chunk is None:
+                    semaphore.release()
+                    break
+                audio_bytes += len(chunk.pcm)
+                tasks.append(asyncio.create_task(self._recognize_chunk(client, chunk, semaphore)))
+            per_chunk = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        result = BatchTranscriptionResult(
+            audio_seconds=audio_bytes / _BYTES_PER_SAMPLE / settings.stt_sample_rate,
+            chunks=len(tasks),
+        )
+        for segments in per_chunk:
+            result.segments.extend(segments)
+        result.qa_pairs = self._extract_qa(result.segments)
+        result.elapsed_seconds = time.perf_counter() - started
+        logger.info(
+            "Batch transcription of %s: %.1fs audio in %.1fs (%.1fx realtime, %d chunks, %d segments)",
+            path.name,
+            result.audio_seconds,
+            result.elapsed_seconds,
+            result.realtime_factor,
+            result.chunks,
+            len(result.segments),
+        )
+        return result
+
+    async def _recognize_chunk(self, client: Any, chunk: AudioChunk, semaphore: asyncio.Semaphore) -> List[Segment]:
+        try:
+            attempts = max(self._settings.stt_batch_retries, 0) + 1
+            for attempt in range(1, attempts + 1):
+                try:
+                    with track_call("google_stt", "batch_recognize"):
+                        return await asyncio.to_thread(self._recognize_sync, client, chunk)
+                except google_exceptions.GoogleAPICallError as exc:
+                    if attempt == attempts:
+                        raise
+                    logger.warning("Batch chunk %d failed (attempt %d): %s", chunk.index, attempt, exc)
+                    await asyncio.sleep(2 ** attempt)
+            return []
+        finally:
+            semaphore.release()
+
+    def _recognize_sync(self, client: Any, chunk: AudioChunk) -> List[Segment]:
+        streaming_config = speech_types.StreamingRecognitionConfig(
+            config=recognition_config(self._settings),
+            interim_results=False,
+            single_utterance=False,
+        )
+        requests = self._paced_requests(chunk.pcm)
+
+        diarizer = DiarizationProcessor(self._settings.logs_dir)
+        segments: List[Segment] = []
+        for response in client.streaming_recognize(requests=requests, config=streaming_config):
+            for result in response.results:
+                if not result.is_final or not result.alternatives:
+                    continue
+                built = diarizer.build_segments(result) or self._fallback_segment(result, segments)
+                segments.extend(
+                    dataclasses.replace(segment, start=segment.start + chunk.offset, end=segment.end + chunk.offset)
+                    for segment in built
+                )
+        return segments
+
+    def _paced_requests(self, pcm: bytes) -> Iterator[speech_types.StreamingRecognizeRequest]:
+        """Yield 100 ms requests no faster than ``stt_batch_stream_speed`` times real time."""
+
+        bytes_per_sec = self._settings.stt_sample_rate * _BYTES_PER_SAMPLE
+        step = int(bytes_per_sec * 0.1)
+        speed = self._settings.stt_batch_stream_speed
+        started = time.monotonic()
+        for start in range(0, len(pcm), step):
+            if speed > 0:
+                delay = started + start / bytes_per_sec / speed - time.monotonic()
+                if delay > 0:
+                    # Runs on the thread that feeds the gRPC stream, not on the event loop.
+                    time.sleep(delay)
+            yield speech_types.StreamingRecognizeRequest(audio_content=pcm[start : start + step])
+
+    @staticmethod
+    def _fallback_segment(result: SpeechRecognitionResult, previous: List[Segment]) -> List[Segment]:
+        text = result.alternatives[0].transcript.strip()
+        if not text:
+            return []
+        start = previous[-1].end if previous else 0.0
+        end_time = getattr(result, "result_end_time", None)
+        end = end_time.total_seconds() if end_time is not None and hasattr(end_time, "total_seconds") else start
+        return [Segment(speaker=None, text=text, start=start, end=max(end, start))]
+
+    def _extract_qa(self, segments: List[Segment]) -> QAPairStore:
+        pairs = QAPairStore()
+        pairs.register(QAExtractor(self._settings).append_segments(segments))
+        return pairs
+
+
+def recording_path(settings: Settings, session_id: str) -> Optional[Path]:
+    """Return the WAV a live session left in ``storage_dir``, if any."""
+
+    path = Path(settings.storage_dir) / f"{Path(session_id).name}.wav"
+    return path if path.exists() else None
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Mapping, Optional, Set
+
+from fastapi import WebSocket
+
+from app.sessions.events import encode
+
+logger = logging.getLogger(__name__)
+
+# Signalling (rtc.*) and errors about the primary's own requests stay private to the primary client.
+_OBSERVED_PREFIXES = ("stt.", "session.close")
+
+# 1013 = Try Again Later: the observer fell behind and should reconnect.
+_LAGGING_CLOSE_CODE = 1013
+
+
+class SessionObserver:
+    """A read-only subscriber with its own bounded send queue and writer task."""
+
+    def __init__(self, websocket: WebSocket, max_queue: int) -> None:
+        self.websocket = websocket
+        self._queue: asyncio.Queue[Optional[str]] = asyncio.Queue(maxsize=max_queue)
+        self._writer = asyncio.create_task(self._write_loop())
+        self._task = asyncio.create_task(self._supervise())
+        self.lagged = False
+
+    @property
+    def done(self) -> asyncio.Task[None]:
+        return self._task
+
+    def offer(self, text: str) -> bool:
+        try:
+            self._queue.put_nowait(text)
+        except asyncio.QueueFull:
+            # Dropping individual events would leave the observer with a corrupt transcript.
+            self.lagged = True
+            self._writer.cancel()
+            return False
+        return True
+
+    async def close(self) -> None:
+        """Flush queued events and stop; safe to call more than once."""
+        if not self._writer.done():
+            try:
+                self._queue.put_nowait(None)
+            except asyncio.QueueFull:
+                self._writer.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _supervise(self) -> None:
+        # The writer may be cancelled before it ever ran, so the lagging close lives out here.
+        await asyncio.gather(self._writer, return_exceptions=True)
+        if self.lagged:
+            logger.info("Dropping lagging transcript observer")
+            try:
+                await self.websocket.close(code=_LAGGING_CLOSE_CODE)
+            except Exception:  # pragma: no cover - already gone
+                pass
+
+    async def _write_loop(self) -> None:
+        try:
+            while True:
+                text = await self._queue.get()
+                if text is None:
+                    return
+                await self.websocket.send_text(text)
+        except Exception as exc:  # pragma: no cover - observer went away
+            logger.debug("Transcript observer send failed: %s", exc)
+
+
+class SessionBroadcast:
+    """Stands in for the session websocket and fans events out to observers.
+
+    Each event is encoded once. The primary client is written to directly,
+    exactly as before; observers only get a non-blocking enqueue of the same
+    text, so a slow observer can never hold up the primary or the
+    recognition thread.
+    """
+
+    def __init__(self, primary: WebSocket, max_observers: int = 4, max_queue: int = 256) -> None:
+        self._primary = primary
+        self._max_observers = max_observers
+        self._max_queue = max_queue
+        self._observers: Set[SessionObserver] = set()
+
+    @property
+    def observer_count(self) -> int:
+        return len(self._observers)
+
+    async def send_json(self, payload: Mapping[str, Any]) -> None:
+        text = encode(payload)
+        # Enqueue first: it never blocks, and observers still get the event if the primary has gone.
+        if self._observers and str(payload.get("event", "")).startswith(_OBSERVED_PREFIXES):
+            self._fan_out(text)
+        await self._primary.send_text(text)
+
+    async def send_text(self, text: str) -> None:
+        # Pre-encoded frames come from pool workers, which only emit stt.* events.
+        if self._observers:
+            self._fan_out(text)
+        await self._primary.send_text(text)
+
+    def subscribe(self, websocket: WebSocket) -> Optional[SessionObserver]:
+        """Attach an observer; returns None when the session already has ``max_observers``."""
+        if len(self._observers) >= self._max_observers:
+            return None
+        observer = SessionObserver(websocket, self._max_queue)
+        self._observers.add(observer)
+        observer.done.add_done_callback(lambda _: self._observers.discard(observer))
+        return observer
+
+    async def close(self) -> None:
+        observers = list(self._observers)
+        self._observers.clear()
+        await asyncio.gather(*(observer.close() for observer in observers), return_exceptions=True)
+
+    def _fan_out(self, text: str) -> None:
+        for observer in list(self._observers):
+            if not observer.offer(text):
+                self._observers.discard(observer)
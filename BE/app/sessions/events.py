@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+import json
 from typing import Any, Dict, Iterable, Mapping
 
 from fastapi import WebSocket
 
 
+def encode(message: Mapping[str, Any]) -> str:
+    """Encode a message exactly like starlette's ``WebSocket.send_json`` so pre-encoded frames are identical."""
+    return json.dumps(message, ensure_ascii=False, separators=(",", ":"))
+
+
 async def emit(websocket: WebSocket, event: str, payload: Mapping[str, Any] | None = None) -> None:
     await websocket.send_json(
         {
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import json
+import logging
+import time
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from app.sessions.metrics import observe_flight_event
+
+logger = logging.getLogger(__name__)
+
+# (wall-clock seconds, event, fields); wall clock so worker-process entries line up with the API process.
+Entry = Tuple[float, str, Dict[str, Any]]
+
+# Milestones kept outside the ring so they survive wrap-around on long sessions.
+MILESTONES = (
+    "offer.received",
+    "answer.sent",
+    "ice.connected",
+    "audio.first_frame",
+    "stream.opened",
+    "stream.first_response",
+    "stt.first_partial",
+    "stt.first_final",
+)
+
+
+class FlightRecorder:
+    """Fixed-size ring of timestamped, structured events for one session.
+
+    Recording is a ``time.time()`` call and a deque append, so it stays on in
+    production and can be called from the recognition thread. With a
+    ``sink`` (pool workers) entries are forwarded instead of stored, and the
+    API process keeps the ring.
+    """
+
+    __slots__ = ("session_id", "_ring", "_milestones", "_origin", "_recorded", "_failed", "_sink")
+
+    def __init__(
+        self,
+        session_id: str,
+        capacity: int = 256,
+        sink: Optional[Callable[[Entry], None]] = None,
+    ) -> None:
+        self.session_id = session_id
+        self._ring: Deque[Entry] = deque(maxlen=max(capacity, 1))
+        self._milestones: Dict[str, float] = {}
+        self._origin = time.time()
+        self._recorded = 0
+        self._failed = False
+        self._sink = sink
+
+    @property
+    def failed(self) -> bool:
+        return self._failed
+
+    def record(self, event: str, **fields: Any) -> None:
+        entry: Entry = (time.time(), event, fields)
+        if self._sink is not None:
+            self._sink(entry)
+            return
+        self.add(entry)
+
+    def add(self, entry: Entry) -> None:
+        timestamp, event, _ = entry
+        self._ring.append(entry)
+        self._recorded += 1
+        if event in MILESTONES:
+            self._milestones.setdefault(event, timestamp)
+        elif event == "error":
+            self._failed = True
+        observe_flight_event(timestamp, event, entry[2], self._milestones)
+
+    def snapshot(self) -> Dict[str, Any]:
+        entries = list(self._ring)
+        milestones = {event: self._offset_ms(timestamp) for event, timestamp in self._milestones.items()}
+        first_frame = milestones.get("audio.first_frame")
+        first_partial = milestones.get("stt.first_partial")
+        return {
+            "session_id": self.session_id,
+            "started_at": datetime.fromtimestamp(self._origin, tz=timezone.utc).isoformat(),
+            "failed": self._failed,
+            "milestones": milestones,
+            "time_to_first_word_ms": (
+                round(first_partial - first_frame, 1) if first_frame is not None and first_partial is not None else None
+            ),
+            "overwritten": self._recorded - len(entries),
+            "events": [
+                {"t_ms": self._offset_ms(timestamp), "event": event, **fields} for timestamp, event, fields in entries
+            ],
+        }
+
+    def dump(self, directory: Path) -> Optional[Path]:
+        path = Path(directory) / "flight" / f"{self.session_id}.json"
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(self.snapshot(), ensure_ascii=False, indent=1), encoding="utf-8")
+        except OSError as exc:  # pragma: no cover - best-effort
+            logger.warning("Failed to dump flight record of session %s: %s", self.session_id, exc)
+            return None
+        return path
+
+    def _offset_ms(self, timestamp: float) -> float:
+        return round((timestamp - self._origin) * 1000, 1)
@@ -1,44 +1,330 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Dict, Optional
+import logging
+import os
+import resource
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
 from uuid import uuid4
 
 from fastapi import WebSocket
 
-from app.core.config import Settings
+from app.core.config import Settings, get_settings
+from app.core.metrics import REGISTRY, Sample
+from app.sessions.admission import AdmissionController
+from app.sessions.broadcast import SessionBroadcast, SessionObserver
+from app.sessions.metrics import SESSIONS_STARTED, SESSIONS_STOPPED
+from app.sessions.registry import (
+    HOSTNAME,
+    WORKER_ID,
+    SessionRecord,
+    SessionRegistry,
+    create_session_registry,
+)
 from app.sessions.stt_session import STTSession
+from app.sessions.worker_pool import SessionWorkerPool
+
+logger = logging.getLogger(__name__)
 
 
 class SessionManager:
-    def __init__(self, settings: Settings) -> None:
+    def __init__(self, settings: Settings, registry: Optional[SessionRegistry] = None) -> None:
         self._settings = settings
         self._sessions: Dict[str, STTSession] = {}
+        self._broadcasts: Dict[str, SessionBroadcast] = {}
         self._lock = asyncio.Lock()
+        # Serialises check-then-register so concurrent handshakes cannot overshoot the limits.
+        self._admission_lock = asyncio.Lock()
+        self._registry = registry or create_session_registry(settings)
+        self._admission = AdmissionController(settings, self._registry)
+        self._sync_task: Optional[asyncio.Task[None]] = None
+        self._reap_task: Optional[asyncio.Task[None]] = None
+        self._reaped = 0
+        # Timelines of recently finished sessions, for post-mortems through the admin API.
+        self._finished_flights: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._worker_pool: Optional[SessionWorkerPool] = None
+        if settings.stt_execution_mode.lower() == "process":
+            self._worker_pool = SessionWorkerPool(settings)
 
-    async def create_session(self, websocket: WebSocket) -> STTSession:
-        session_id = uuid4().hex
-        session = STTSession(session_id=session_id, websocket=websocket, settings=self._settings)
+    @property
+    def registry(self) -> SessionRegistry:
+        return self._registry
 
-        async with self._lock:
-            self._sessions[session_id] = session
+    @property
+    def admission(self) -> AdmissionController:
+        return self._admission
+
+    @property
+    def worker_pool(self) -> Optional[SessionWorkerPool]:
+        return self._worker_pool
+
+    async def start(self) -> None:
+        if self._worker_pool is not None:
+            await self._worker_pool.start()
+        self._admission.monitor.start()
+        REGISTRY.register_collector(self.collect_metrics)
+        if self._sync_task is None:
+            self._sync_task = asyncio.create_task(self._sync_loop())
+        if self._reap_task is None:
+            self._reap_task = asyncio.create_task(self._reap_loop())
+
+    async def shutdown(self) -> None:
+        for task in (self._sync_task, self._reap_task):
+            if task:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        self._sync_task = None
+        self._reap_task = None
+        REGISTRY.unregister_collector(self.collect_metrics)
+        await self._admission.monitor.stop()
+        await self.stop_all()
+        if self._worker_pool is not None:
+            await self._worker_pool.shutdown()
+        await self._registry.close()
+
+    async def create_session(self, websocket: WebSocket, user_id: Optional[str] = None) -> STTSession:
+        """Create and register a session.
+
+        Raises:
+            SessionAdmissionError: the node or user is at its limit, or the node is overloaded.
+        """
+
+        async with self._admission_lock:
+            await self._admission.check(user_id, backlog=await self._backlog())
+
+            session_id = uuid4().hex
+            broadcast = SessionBroadcast(
+                websocket,
+                max_observers=self._settings.stt_max_observers_per_session,
+                max_queue=self._settings.stt_observer_queue_size,
+            )
+            session = STTSession(
+                session_id=session_id,
+                websocket=broadcast,  # type: ignore[arg-type]
+                settings=self._settings,
+                worker_pool=self._worker_pool,
+            )
+
+            async with self._lock:
+                self._sessions[session_id] = session
+                self._broadcasts[session_id] = broadcast
 
+            now = time.time()
+            await self._registry.register(
+                SessionRecord(
+                    session_id=session_id,
+                    worker_id=WORKER_ID,
+                    host=HOSTNAME,
+                    user_id=user_id,
+                    created_at=now,
+                    heartbeat_at=now,
+                ),
+            )
+        SESSIONS_STARTED.inc()
         return session
 
     async def get(self, session_id: str) -> Optional[STTSession]:
         async with self._lock:
             return self._sessions.get(session_id)
 
-    async def remove(self, session_id: str) -> None:
+    async def subscribe(self, session_id: str, websocket: WebSocket) -> Optional[SessionObserver]:
+        """Attach a read-only observer to a session owned by this worker."""
+        async with self._lock:
+            broadcast = self._broadcasts.get(session_id)
+        return broadcast.subscribe(websocket) if broadcast else None
+
+    async def lookup(self, session_id: str) -> Optional[SessionRecord]:
+        return await self._registry.get(session_id)
+
+    async def set_room(self, session_id: str, room_id: Optional[str]) -> None:
+        if room_id:
+            await self._registry.update(session_id, room_id=room_id)
+
+    async def request_stop(self, session_id: str) -> bool:
+        """Stop a session owned by any worker; remote owners pick it up on their next sync."""
+
+        if await self.get(session_id):
+            await self.remove(session_id)
+            return True
+        return await self._registry.request_stop(session_id)
+
+    async def remove(self, session_id: str, reason: str = "session stopped") -> None:
         async with self._lock:
             session = self._sessions.pop(session_id, None)
+            broadcast = self._broadcasts.pop(session_id, None)
 
         if session:
-            await session.stop()
+            SESSIONS_STOPPED.labels("idle" if reason.startswith("idle timeout") else "stopped").inc()
+            await self._registry.unregister(session_id)
+            await session.stop(reason)
+            await self._retain_flight(session)
+        if broadcast:
+            # After stop() so observers also receive the final stt.qa_pairs and session.close.
+            await broadcast.close()
 
     async def stop_all(self) -> None:
         async with self._lock:
             sessions = list(self._sessions.values())
+            broadcasts = list(self._broadcasts.values())
             self._sessions.clear()
+            self._broadcasts.clear()
+        SESSIONS_STOPPED.labels("shutdown").inc(len(sessions))
 
+        await asyncio.gather(
+            *(self._registry.unregister(session.session_id) for session in sessions),
+            return_exceptions=True,
+        )
         await asyncio.gather(*(session.stop() for session in sessions), return_exceptions=True)
+        await asyncio.gather(*(self._retain_flight(session) for session in sessions), return_exceptions=True)
+        await asyncio.gather(*(broadcast.close() for broadcast in broadcasts), return_exceptions=True)
+
+    async def flight_record(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Timeline of a live session, or of one that finished recently on this worker."""
+        session = await self.get(session_id)
+        if session is not None:
+            return {**session.flight.snapshot(), "live": True}
+        finished = self._finished_flights.get(session_id)
+        return {**finished, "live": False} if finished is not None else None
+
+    async def _retain_flight(self, session: STTSession) -> None:
+        snapshot = session.flight.snapshot()
+        self._finished_flights[session.session_id] = snapshot
+        while len(self._finished_flights) > max(self._settings.stt_flight_retained_sessions, 0):
+            self._finished_flights.popitem(last=False)
+        if session.flight.failed and self._settings.stt_flight_dump_on_error:
+            path = await asyncio.to_thread(session.flight.dump, self._settings.logs_dir)
+            if path:
+                logger.info("Session %s ended with an error; flight record written to %s", session.session_id, path)
+
+    async def reap_idle(self) -> List[str]:
+        """Stop sessions whose client went quiet and drop ones that already closed themselves."""
+
+        audio_timeout = self._settings.stt_idle_audio_timeout_sec
+        signal_timeout = self._settings.stt_idle_signal_timeout_sec
+        now = time.monotonic()
+        async with self._lock:
+            sessions = list(self._sessions.values())
+
+        reaped: List[str] = []
+        for session in sessions:
+            audio_idle, signal_idle = session.idle_seconds(now)
+            if session.closed:
+                # Peer connection failed/closed and the session stopped itself; only bookkeeping is left.
+                reason = "session closed"
+            elif audio_idle is not None and audio_timeout > 0 and audio_idle > audio_timeout:
+                reason = f"no audio for {audio_idle:.0f}s"
+            elif audio_idle is None and signal_timeout > 0 and signal_idle > signal_timeout:
+                reason = f"no audio or signalling for {signal_idle:.0f}s"
+            else:
+                continue
+            logger.info("Reaping STT session %s: %s", session.session_id, reason)
+            await self.remove(session.session_id, reason=f"idle timeout: {reason}")
+            reaped.append(session.session_id)
+
+        self._reaped += len(reaped)
+        return reaped
+
+    async def resource_usage(self) -> Dict[str, Any]:
+        async with self._lock:
+            sessions = list(self._sessions.values())
+            observers = {session_id: hub.observer_count for session_id, hub in self._broadcasts.items()}
+
+        try:
+            open_fds: Optional[int] = len(os.listdir("/proc/self/fd"))
+            with open("/proc/self/statm") as statm:
+                rss_bytes: Optional[int] = int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except OSError:  # pragma: no cover - non-Linux
+            open_fds = rss_bytes = None
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        return {
+            "worker_id": WORKER_ID,
+            "host": HOSTNAME,
+            "process": {
+                "threads": threading.active_count(),
+                "open_fds": open_fds,
+                "rss_bytes": rss_bytes,
+                # Pool worker processes are not included; see "pool".
+                "cpu_seconds": round(usage.ru_utime + usage.ru_stime, 3),
+                "cpu_load": round(self._admission.monitor.cpu_load, 3),
+            },
+            "reaped": self._reaped,
+            "pool": self._worker_pool.get_stats() if self._worker_pool is not None else None,
+            "sessions": [
+                {**session.resource_usage(), "observers": observers.get(session.session_id, 0)}
+                for session in sessions
+            ],
+        }
+
+    def collect_metrics(self) -> Iterable[tuple[str, str, str, List[Sample]]]:
+        """Scrape-time gauges; read from the event loop thread, so no lock is needed."""
+        sessions = list(self._sessions.values())
+        backlogs = [session.backlog for session in sessions]
+        queued = sum(session.get_audio_queue().qsize() for session in sessions)
+        observers = sum(hub.observer_count for hub in self._broadcasts.values())
+        yield "stt_sessions_active", "gauge", "STT sessions owned by this worker.", [({}, len(sessions))]
+        yield "stt_session_observers", "gauge", "Read-only observers attached to this worker's sessions.", [
+            ({}, observers),
+        ]
+        yield "stt_audio_queue_items", "gauge", "Audio chunks waiting in inline session queues.", [({}, queued)]
+        yield "stt_audio_backlog_ratio", "gauge", "Fill ratio of session audio hand-offs (queue or ring).", [
+            ({"stat": "max"}, max(backlogs, default=0.0)),
+            ({"stat": "mean"}, sum(backlogs) / len(backlogs) if backlogs else 0.0),
+        ]
+        yield "stt_cpu_load_ratio", "gauge", "CPU load seen by admission control (0-1).", [
+            ({}, self._admission.monitor.cpu_load),
+        ]
+        if self._worker_pool is not None:
+            processes = self._worker_pool.get_stats()["processes"]
+            yield "stt_pool_processes", "gauge", "Session worker processes by state.", [
+                ({"state": "alive"}, sum(1 for process in processes if process["alive"])),
+                ({"state": "dead"}, sum(1 for process in processes if not process["alive"])),
+            ]
+
+    async def _backlog(self) -> float:
+        async with self._lock:
+            sessions = list(self._sessions.values())
+        if not sessions:
+            return 0.0
+        return sum(session.backlog for session in sessions) / len(sessions)
+
+    async def _sync_loop(self) -> None:
+        interval = max(self._settings.stt_registry_heartbeat_sec, 0.5)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with self._lock:
+                    session_ids = list(self._sessions)
+                for session_id in await self._registry.heartbeat(WORKER_ID, session_ids):
+                    logger.info("Session %s stop requested through registry", session_id)
+                    await self.remove(session_id)
+                # Records whose owner stopped heart-beating belong to a dead worker.
+                await self._registry.purge_stale(interval * 3)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # pragma: no cover - diagnostics
+                logger.warning("Session registry sync failed: %s", exc)
+
+    async def _reap_loop(self) -> None:
+        interval = max(self._settings.stt_reaper_interval_sec, 1.0)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.reap_idle()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # pragma: no cover - diagnostics
+                logger.warning("Session reaper failed: %s", exc)
+
+
+_session_manager: Optional[SessionManager] = None
+
+
+def get_session_manager() -> SessionManager:
+    """Return the per-worker SessionManager singleton."""
+    global _session_manager
+    if _session_manager is None:
+        _session_manager = SessionManager(settings=get_settings())
+    return _session_manager
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from typing import Dict
+
+from app.core.metrics import REGISTRY
+
+# Counters are updated in the API process for both execution modes: inline
+# sessions count in AudioPipeline, pooled ones at the shared-memory hand-off.
+
+SESSIONS_STARTED = REGISTRY.counter("stt_sessions_started_total", "STT sessions admitted on this worker.")
+SESSIONS_STOPPED = REGISTRY.counter(
+    "stt_sessions_stopped_total",
+    "STT sessions stopped on this worker, by reason (stopped, idle, shutdown).",
+    ("reason",),
+)
+SESSIONS_REJECTED = REGISTRY.counter(
+    "stt_sessions_rejected_total",
+    "STT sessions refused by admission control, by reason.",
+    ("reason",),
+)
+SESSION_ERRORS = REGISTRY.counter(
+    "stt_session_errors_total",
+    "Errors recorded by session flight recorders, by code.",
+    ("code",),
+)
+
+AUDIO_FRAMES = REGISTRY.counter("stt_audio_frames_total", "Audio frames/packets received from WebRTC tracks.")
+AUDIO_BYTES = REGISTRY.counter("stt_audio_bytes_total", "Audio bytes handed to recognition.")
+AUDIO_CHUNKS = REGISTRY.counter("stt_audio_chunks_total", "Audio chunks handed to recognition.")
+AUDIO_DROPPED = REGISTRY.counter(
+    "stt_audio_chunks_dropped_total",
+    "Audio chunks dropped because the session queue or ring was full.",
+)
+
+TIME_TO_FIRST_WORD = REGISTRY.histogram(
+    "stt_time_to_first_word_seconds",
+    "Time from the first audio frame to the first partial transcript.",
+    buckets=(0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0),
+)
+FINAL_LAG = REGISTRY.histogram(
+    "stt_final_lag_seconds",
+    "Delay between the end of recognised speech and delivery of its final transcript.",
+    buckets=(0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0),
+)
+PERSIST_SECONDS = REGISTRY.histogram(
+    "stt_persist_duration_seconds",
+    "Time to persist a finished session's transcript and Q&A pairs.",
+)
+
+
+def observe_flight_event(timestamp: float, event: str, fields: Dict, milestones: Dict[str, float]) -> None:
+    """Feed latency histograms from flight-recorder entries.
+
+    The recorder in the API process receives the events of inline and pooled
+    sessions alike, so this is the one place they are observed.
+    """
+
+    if event == "stt.final":
+        lag_ms = fields.get("lag_ms")
+        if lag_ms is not None:
+            FINAL_LAG.observe(max(lag_ms, 0.0) / 1000)
+    elif event == "stt.first_partial":
+        first_frame = milestones.get("audio.first_frame")
+        if first_frame is not None:
+            TIME_TO_FIRST_WORD.observe(max(timestamp - first_frame, 0.0))
+    elif event == "persist.end":
+        PERSIST_SECONDS.observe(fields.get("ms", 0.0) / 1000)
+    elif event == "error":
+        SESSION_ERRORS.labels(fields.get("code", "UNKNOWN")).inc()
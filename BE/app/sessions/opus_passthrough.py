@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import queue
+import random
+import struct
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+_OPUS_SAMPLE_RATE = 48000
+_OPUS_PRE_SKIP = 312
+_OGG_CAPTURE = b"OggS"
+_HEADER_BOS = 0x02
+_HEADER_EOS = 0x04
+
+
+def _build_crc_table() -> list[int]:
+    table: list[int] = []
+    for index in range(256):
+        crc = index << 24
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x04C11DB7) if crc & 0x80000000 else (crc << 1)
+        table.append(crc & 0xFFFFFFFF)
+    return table
+
+
+_CRC_TABLE = _build_crc_table()
+
+
+def _ogg_crc(data: bytes) -> int:
+    crc = 0
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFFFFFF) ^ _CRC_TABLE[((crc >> 24) & 0xFF) ^ byte]
+    return crc
+
+
+def opus_packet_samples(packet: bytes) -> int:
+    """Return the number of 48 kHz samples carried by an Opus packet (RFC 6716 §3.1)."""
+
+    if not packet:
+        return 0
+
+    toc = packet[0]
+    config = toc >> 3
+    if config < 12:
+        frame_size = (480, 960, 1920, 2880)[config % 4]
+    elif config < 16:
+        frame_size = (480, 960)[config % 2]
+    else:
+        frame_size = (120, 240, 480, 960)[config % 4]
+
+    code = toc & 0x03
+    if code == 0:
+        frames = 1
+    elif code in (1, 2):
+        frames = 2
+    else:
+        frames = packet[1] & 0x3F if len(packet) > 1 else 0
+    return frames * frame_size
+
+
+class OggOpusWriter:
+    """Packages raw Opus packets into an Ogg Opus stream (RFC 7845).
+
+    The OpusHead (BOS) and OpusTags pages are built up front as pages 0 and 1
+    and are prepended to the first data page returned, so page sequence
+    numbers always follow stream order.
+    """
+
+    def __init__(
+        self,
+        channels: int = 1,
+        packets_per_page: int = 5,
+        serial: Optional[int] = None,
+    ) -> None:
+        self._channels = channels
+        self._packets_per_page = max(packets_per_page, 1)
+        self._serial = serial if serial is not None else random.getrandbits(32)
+        self._sequence = 0
+        self._granule = _OPUS_PRE_SKIP
+        self._pending: list[bytes] = []
+        self._header_pages = self._build_headers()
+
+    @property
+    def granule_position(self) -> int:
+        return self._granule
+
+    def headers(self) -> bytes:
+        """Return the OpusHead/OpusTags pages if they have not been emitted yet (``append``/``flush`` do this)."""
+
+        pages, self._header_pages = self._header_pages, b""
+        return pages
+
+    def _build_headers(self) -> bytes:
+        opus_head = b"OpusHead" + struct.pack(
+            "<BBHIhB",
+            1,
+            self._channels,
+            _OPUS_PRE_SKIP,
+            _OPUS_SAMPLE_RATE,
+            0,
+            0,
+        )
+        vendor = b"bmr-passthrough"
+        opus_tags = b"OpusTags" + struct.pack("<I", len(vendor)) + vendor + struct.pack("<I", 0)
+        return self._page([opus_head], granule=0, header_type=_HEADER_BOS) + self._page([opus_tags], granule=0)
+
+    def append(self, packet: bytes) -> bytes:
+        """Queue an Opus packet, returning encoded page bytes (headers first, once) when a page is full."""
+
+        if not packet:
+            return b""
+        self._pending.append(packet)
+        self._granule += opus_packet_samples(packet)
+        if len(self._pending) >= self._packets_per_page:
+            return self.flush()
+        return b""
+
+    def flush(self, eos: bool = False) -> bytes:
+        if not self._pending and not eos:
+            return b""
+        packets, self._pending = self._pending, []
+        return self.headers() + self._page(packets, granule=self._granule, header_type=_HEADER_EOS if eos else 0)
+
+    def _page(self, packets: list[bytes], granule: int, header_type: int = 0) -> bytes:
+        lacing = bytearray()
+        for packet in packets:
+            length = len(packet)
+            while length >= 255:
+                lacing.append(255)
+                length -= 255
+            lacing.append(length)
+
+        header = struct.pack(
+            "<4sBBqIIIB",
+            _OGG_CAPTURE,
+            0,
+            header_type,
+            granule,
+            self._serial,
+            self._sequence,
+            0,
+            len(lacing),
+        )
+        page = bytearray(header + bytes(lacing) + b"".join(packets))
+        struct.pack_into("<I", page, 22, _ogg_crc(bytes(page)))
+        self._sequence += 1
+        return bytes(page)
+
+
+class OpusPassthroughTap:
+    """Diverts encoded Opus frames away from aiortc's decoder thread.
+
+    ``RTCRtpReceiver`` pushes ``(codec, JitterFrame)`` tuples into a private
+    ``queue.Queue`` consumed by its decoder thread. The tap wraps that queue:
+    Opus frames are handed to the session as-is, everything else (other codecs
+    and the shutdown sentinel) still reaches the decoder thread.
+    """
+
+    _QUEUE_ATTR = "_RTCRtpReceiver__decoder_queue"
+
+    def __init__(self, decoder_queue: queue.Queue, maxsize: int = 256) -> None:
+        self._inner = decoder_queue
+        self._frames: asyncio.Queue[Optional[bytes]] = asyncio.Queue(maxsize=maxsize)
+        self._dropped = 0
+
+    @classmethod
+    def install(cls, receiver: Any) -> Optional["OpusPassthroughTap"]:
+        decoder_queue = getattr(receiver, cls._QUEUE_ATTR, None)
+        if decoder_queue is None:
+            logger.warning("RTP receiver does not expose a decoder queue; Opus passthrough disabled")
+            return None
+        if isinstance(decoder_queue, cls):
+            return decoder_queue
+        tap = cls(decoder_queue)
+        setattr(receiver, cls._QUEUE_ATTR, tap)
+        return tap
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    def put(self, item: Any, *args: Any, **kwargs: Any) -> None:
+        if item is None:
+            self._inner.put(None)
+            self._offer(None)
+            return
+
+        codec, encoded_frame = item
+        if getattr(codec, "name", "").lower() != "opus":
+            self._inner.put(item, *args, **kwargs)
+            return
+        self._offer(encoded_frame.data)
+
+    def get(self, *args: Any, **kwargs: Any) -> Any:
+        return self._inner.get(*args, **kwargs)
+
+    async def recv(self) -> Optional[bytes]:
+        return await self._frames.get()
+
+    def close(self) -> None:
+        self._offer(None)
+
+    def _offer(self, payload: Optional[bytes]) -> None:
+        try:
+            self._frames.put_nowait(payload)
+        except asyncio.QueueFull:
+            self._dropped += 1
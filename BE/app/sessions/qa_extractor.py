@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from typing import List, Optional
 
 from app.core.config import Settings
 from app.sessions.diarization import Segment
@@ -23,15 +23,31 @@ class Sentence:
 
 
 class QAExtractor:
+    """Pairs questions with answers over the most recent segments only.
+
+    A question looks at most ``qa_sentence_window`` sentences ahead and every
+    segment holds at least one sentence, so once that many segments follow a
+    question its pair can no longer change. Older segments are dropped,
+    keeping memory and per-final work constant over long sessions; blank
+    segments are never kept, so they cannot push real ones out of the
+    window. Emitted pairs are remembered only by their
+    ``(question, answer, answer start)`` key, so de-duplication still covers
+    the whole session.
+    """
+
     def __init__(self, settings: Settings) -> None:
         self._settings = settings
         self._segments: List[Segment] = []
-        self._emitted: set[Tuple[str, str, float]] = set()
+        self._emitted: set[tuple[str, str, float]] = set()
 
     def append_segments(self, segments: List[Segment]) -> List[dict]:
-        self._segments.extend(segments)
+        self._segments.extend(segment for segment in segments if segment.text.strip())
         sentences = self._segments_to_sentences(self._segments)
-        return self._extract(sentences)
+        pairs = self._extract(sentences)
+        excess = len(self._segments) - max(self._settings.qa_sentence_window, 1)
+        if excess > 0:
+            del self._segments[:excess]
+        return pairs
 
     def _segments_to_sentences(self, segments: List[Segment]) -> List[Sentence]:
         sentences: List[Sentence] = []
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import logging
+import struct
+import time
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+from google.cloud.speech_v1.types import StreamingRecognizeResponse
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"STTR1\n"
+# Per record: payload length (u32), seconds since the stream started (f64), then the protobuf bytes.
+_RECORD = struct.Struct("<Id")
+SUFFIX = ".sttr"
+
+
+class ResponseRecorder:
+    """Appends every ``StreamingRecognizeResponse`` of a session to a compact binary file.
+
+    Records are the raw protobuf wire bytes, so a file replays bit-identical
+    responses (word offsets, stability, speaker tags) through
+    :func:`read_responses`.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._started = time.monotonic()
+        self._file: Optional[BinaryIO] = None
+        self._count = 0
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = path.open("wb")
+            self._file.write(MAGIC)
+        except OSError as exc:  # pragma: no cover - best-effort
+            logger.warning("Failed to open recognition recording %s: %s", path, exc)
+            self._file = None
+
+    @classmethod
+    def for_session(cls, directory: Path, session_id: str) -> "ResponseRecorder":
+        return cls(Path(directory) / "recognition" / f"{session_id}{SUFFIX}")
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def write(self, response: StreamingRecognizeResponse) -> None:
+        if self._file is None:
+            return
+        payload = StreamingRecognizeResponse.serialize(response)
+        self._file.write(_RECORD.pack(len(payload), time.monotonic() - self._started))
+        self._file.write(payload)
+        self._count += 1
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def read_responses(path: Path) -> Iterator[Tuple[float, StreamingRecognizeResponse]]:
+    """Yield ``(offset_seconds, response)`` pairs from a :class:`ResponseRecorder` file."""
+
+    with Path(path).open("rb") as handle:
+        if handle.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a recognition recording")
+        while True:
+            header = handle.read(_RECORD.size)
+            if len(header) < _RECORD.size:
+                return
+            length, offset = _RECORD.unpack(header)
+            payload = handle.read(length)
+            if len(payload) < length:
+                # A session killed mid-write leaves a truncated tail; everything before it is valid.
+                logger.warning("Truncated record at the end of %s", path)
+                return
+            yield offset, StreamingRecognizeResponse.deserialize(payload)
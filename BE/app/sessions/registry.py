@@ -0,0 +1,320 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import socket
+import sqlite3
+import time
+from contextlib import closing
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.core.config import Settings
+
+HOSTNAME = socket.gethostname()
+WORKER_ID = f"{HOSTNAME}:{os.getpid()}"
+
+
+@dataclass
+class SessionRecord:
+    session_id: str
+    worker_id: str
+    host: str
+    user_id: Optional[str] = None
+    room_id: Optional[str] = None
+    created_at: float = 0.0
+    heartbeat_at: float = 0.0
+    stop_requested: bool = False
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class SessionRegistry:
+    """Shared view of live STT sessions across uvicorn workers.
+
+    Each worker keeps its WebSockets and ``STTSession`` objects in-process; the
+    registry only records who owns which session so that admission limits,
+    lookups and stop requests work no matter which worker a request lands on.
+    The base class is the in-process implementation used for single-worker runs.
+    """
+
+    def __init__(self) -> None:
+        self._records: Dict[str, SessionRecord] = {}
+        self._lock = asyncio.Lock()
+
+    async def register(self, record: SessionRecord) -> None:
+        async with self._lock:
+            self._records[record.session_id] = record
+
+    async def update(self, session_id: str, **fields: Any) -> None:
+        async with self._lock:
+            record = self._records.get(session_id)
+            if record:
+                for key, value in fields.items():
+                    setattr(record, key, value)
+
+    async def unregister(self, session_id: str) -> None:
+        async with self._lock:
+            self._records.pop(session_id, None)
+
+    async def get(self, session_id: str) -> Optional[SessionRecord]:
+        async with self._lock:
+            return self._records.get(session_id)
+
+    async def list(self, host: Optional[str] = None, user_id: Optional[str] = None) -> List[SessionRecord]:
+        async with self._lock:
+            return [
+                record
+                for record in self._records.values()
+                if (host is None or record.host == host) and (user_id is None or record.user_id == user_id)
+            ]
+
+    async def count(self, host: Optional[str] = None, user_id: Optional[str] = None) -> int:
+        return len(await self.list(host=host, user_id=user_id))
+
+    async def request_stop(self, session_id: str) -> bool:
+        async with self._lock:
+            record = self._records.get(session_id)
+            if not record:
+                return False
+            record.stop_requested = True
+            return True
+
+    async def heartbeat(self, worker_id: str, session_ids: Iterable[str]) -> List[str]:
+        """Refresh ownership of ``session_ids`` and return the ones asked to stop."""
+
+        now = time.time()
+        stop_requested: List[str] = []
+        async with self._lock:
+            for session_id in session_ids:
+                record = self._records.get(session_id)
+                if not record or record.worker_id != worker_id:
+                    continue
+                record.heartbeat_at = now
+                if record.stop_requested:
+                    stop_requested.append(session_id)
+        return stop_requested
+
+    async def purge_stale(self, max_age_sec: float) -> int:
+        cutoff = time.time() - max_age_sec
+        async with self._lock:
+            stale = [sid for sid, record in self._records.items() if record.heartbeat_at < cutoff]
+            for session_id in stale:
+                self._records.pop(session_id, None)
+        return len(stale)
+
+    async def close(self) -> None:
+        return None
+
+
+class SQLiteSessionRegistry(SessionRegistry):
+    """Registry shared by the workers of one container through a local SQLite file."""
+
+    _COLUMNS = (
+        "session_id",
+        "worker_id",
+        "host",
+        "user_id",
+        "room_id",
+        "created_at",
+        "heartbeat_at",
+        "stop_requested",
+    )
+
+    def __init__(self, path: Path) -> None:
+        super().__init__()
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS stt_sessions (
+                    session_id TEXT PRIMARY KEY,
+                    worker_id TEXT NOT NULL,
+                    host TEXT NOT NULL,
+                    user_id TEXT,
+                    room_id TEXT,
+                    created_at REAL NOT NULL,
+                    heartbeat_at REAL NOT NULL,
+                    stop_requested INTEGER NOT NULL DEFAULT 0
+                )
+                """,
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS stt_sessions_user ON stt_sessions (user_id)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self._path), timeout=5.0, isolation_level=None)
+
+    async def _fetch(self, sql: str, params: tuple = ()) -> List[tuple]:
+        def _run() -> List[tuple]:
+            with closing(self._connect()) as conn:
+                return conn.execute(sql, params).fetchall()
+
+        return await asyncio.to_thread(_run)
+
+    async def _write(self, sql: str, params: tuple = ()) -> int:
+        def _run() -> int:
+            with closing(self._connect()) as conn:
+                return conn.execute(sql, params).rowcount
+
+        return await asyncio.to_thread(_run)
+
+    def _to_record(self, row: tuple) -> SessionRecord:
+        data = dict(zip(self._COLUMNS, row))
+        data["stop_requested"] = bool(data["stop_requested"])
+        return SessionRecord(**data)
+
+    async def register(self, record: SessionRecord) -> None:
+        values = record.to_dict()
+        values["stop_requested"] = int(record.stop_requested)
+        placeholders = ", ".join("?" for _ in self._COLUMNS)
+        await self._write(
+            f"INSERT OR REPLACE INTO stt_sessions ({', '.join(self._COLUMNS)}) VALUES ({placeholders})",
+            tuple(values[column] for column in self._COLUMNS),
+        )
+
+    async def update(self, session_id: str, **fields: Any) -> None:
+        columns = [column for column in fields if column in self._COLUMNS and column != "session_id"]
+        if not columns:
+            return
+        assignments = ", ".join(f"{column} = ?" for column in columns)
+        await self._write(
+            f"UPDATE stt_sessions SET {assignments} WHERE session_id = ?",
+            tuple(fields[column] for column in columns) + (session_id,),
+        )
+
+    async def unregister(self, session_id: str) -> None:
+        await self._write("DELETE FROM stt_sessions WHERE session_id = ?", (session_id,))
+
+    async def get(self, session_id: str) -> Optional[SessionRecord]:
+        rows = await self._fetch(
+            f"SELECT {', '.join(self._COLUMNS)} FROM stt_sessions WHERE session_id = ?",
+            (session_id,),
+        )
+        return self._to_record(rows[0]) if rows else None
+
+    async def list(self, host: Optional[str] = None, user_id: Optional[str] = None) -> List[SessionRecord]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        if host is not None:
+            clauses.append("host = ?")
+            params.append(host)
+        if user_id is not None:
+            clauses.append("user_id = ?")
+            params.append(user_id)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = await self._fetch(f"SELECT {', '.join(self._COLUMNS)} FROM stt_sessions{where}", tuple(params))
+        return [self._to_record(row) for row in rows]
+
+    async def request_stop(self, session_id: str) -> bool:
+        updated = await self._write("UPDATE stt_sessions SET stop_requested = 1 WHERE session_id = ?", (session_id,))
+        return updated == 1
+
+    async def heartbeat(self, worker_id: str, session_ids: Iterable[str]) -> List[str]:
+        ids = list(session_ids)
+        if not ids:
+            return []
+        now = time.time()
+        placeholders = ", ".join("?" for _ in ids)
+
+        def _run() -> List[str]:
+            with closing(self._connect()) as conn:
+                conn.execute(
+                    f"UPDATE stt_sessions SET heartbeat_at = ? WHERE worker_id = ? AND session_id IN ({placeholders})",
+                    (now, worker_id, *ids),
+                )
+                rows = conn.execute(
+                    f"SELECT session_id FROM stt_sessions WHERE worker_id = ? AND stop_requested = 1 "
+                    f"AND session_id IN ({placeholders})",
+                    (worker_id, *ids),
+                ).fetchall()
+            return [row[0] for row in rows]
+
+        return await asyncio.to_thread(_run)
+
+    async def purge_stale(self, max_age_sec: float) -> int:
+        return await self._write("DELETE FROM stt_sessions WHERE heartbeat_at < ?", (time.time() - max_age_sec,))
+
+
+class MongoSessionRegistry(SessionRegistry):
+    """Registry shared by every worker of every node through MongoDB."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        from app.database.mongodb import get_collection
+
+        self._collection = get_collection("stt_sessions")
+
+    @staticmethod
+    def _to_record(document: Optional[dict]) -> Optional[SessionRecord]:
+        if not document:
+            return None
+        data = dict(document)
+        data["session_id"] = data.pop("_id")
+        return SessionRecord(**{key: data.get(key) for key in SessionRecord.__dataclass_fields__})
+
+    async def register(self, record: SessionRecord) -> None:
+        document = record.to_dict()
+        document["_id"] = document.pop("session_id")
+        await self._collection.replace_one({"_id": record.session_id}, document, upsert=True)
+
+    async def update(self, session_id: str, **fields: Any) -> None:
+        fields.pop("session_id", None)
+        if fields:
+            await self._collection.update_one({"_id": session_id}, {"$set": fields})
+
+    async def unregister(self, session_id: str) -> None:
+        await self._collection.delete_one({"_id": session_id})
+
+    async def get(self, session_id: str) -> Optional[SessionRecord]:
+        return self._to_record(await self._collection.find_one({"_id": session_id}))
+
+    async def list(self, host: Optional[str] = None, user_id: Optional[str] = None) -> List[SessionRecord]:
+        query: Dict[str, Any] = {}
+        if host is not None:
+            query["host"] = host
+        if user_id is not None:
+            query["user_id"] = user_id
+        records: List[SessionRecord] = []
+        async for document in self._collection.find(query):
+            record = self._to_record(document)
+            if record:
+                records.append(record)
+        return records
+
+    async def count(self, host: Optional[str] = None, user_id: Optional[str] = None) -> int:
+        query: Dict[str, Any] = {}
+        if host is not None:
+            query["host"] = host
+        if user_id is not None:
+            query["user_id"] = user_id
+        return await self._collection.count_documents(query)
+
+    async def request_stop(self, session_id: str) -> bool:
+        result = await self._collection.update_one({"_id": session_id}, {"$set": {"stop_requested": True}})
+        return result.matched_count == 1
+
+    async def heartbeat(self, worker_id: str, session_ids: Iterable[str]) -> List[str]:
+        ids = list(session_ids)
+        if not ids:
+            return []
+        query = {"_id": {"$in": ids}, "worker_id": worker_id}
+        await self._collection.update_many(query, {"$set": {"heartbeat_at": time.time()}})
+        cursor = self._collection.find(query | {"stop_requested": True}, {"_id": 1})
+        return [document["_id"] async for document in cursor]
+
+    async def purge_stale(self, max_age_sec: float) -> int:
+        result = await self._collection.delete_many({"heartbeat_at": {"$lt": time.time() - max_age_sec}})
+        return result.deleted_count
+
+
+def create_session_registry(settings: Settings) -> SessionRegistry:
+    backend = settings.stt_session_registry.lower()
+    if backend == "sqlite":
+        return SQLiteSessionRegistry(settings.stt_registry_path)
+    if backend == "mongo":
+        return MongoSessionRegistry()
+    return SessionRegistry()
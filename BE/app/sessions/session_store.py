@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from app.core.config import Settings
+from app.sessions.diarization import Segment
+
+_SPILL_MAGIC = b"STTS1\n"
+_LENGTH = struct.Struct("<I")
+# Spilled segment: start (f64), end (f64), speaker (i32, -1 for none), then the UTF-8 text.
+_SEGMENT = struct.Struct("<ddi")
+
+
+class SpillLog:
+    """Length-prefixed records appended to a per-session file and read back through ``mmap``.
+
+    Only record offsets stay in memory (8 bytes each); the file is created on
+    the first spill and truncated if a previous run left one behind.
+    """
+
+    __slots__ = ("_path", "_file", "_offsets")
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._file: Optional[BinaryIO] = None
+        self._offsets = array("Q")
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def append(self, payloads: Iterable[bytes]) -> None:
+        if self._file is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self._path.open("wb")
+            self._file.write(_SPILL_MAGIC)
+        for payload in payloads:
+            self._offsets.append(self._file.tell())
+            self._file.write(_LENGTH.pack(len(payload)))
+            self._file.write(payload)
+        self._file.flush()
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __iter__(self) -> Iterator[bytes]:
+        if not self._offsets:
+            return
+        with self._path.open("rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            for offset in self._offsets:
+                yield self._record(view, offset)
+
+    def read(self, index: int) -> bytes:
+        with self._path.open("rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            return self._record(view, self._offsets[index])
+
+    @staticmethod
+    def _record(view: mmap.mmap, offset: int) -> bytes:
+        (length,) = _LENGTH.unpack_from(view, offset)
+        start = offset + _LENGTH.size
+        return view[start : start + length]
+
+    def close(self, delete: bool = True) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        del self._offsets[:]
+        if delete:
+            self._path.unlink(missing_ok=True)
+
+
+def _spill_count(in_memory: int, limit: int) -> int:
+    # Spill in batches (a quarter of the tail at a time) so appends stay amortised O(1).
+    if limit <= 0 or in_memory <= limit + max(limit // 4, 1):
+        return 0
+    return in_memory - limit
+
+
+class SegmentStore:
+    """Append-only transcript of a session, kept column-wise.
+
+    Start/end times live in ``array('d')`` buffers and speakers/texts in
+    plain lists, so a final segment costs four appends instead of a Pydantic
+    model. Documents are validated once, by ``STTService.save_documents``,
+    when the session is persisted.
+
+    With a ``spill`` log, only the newest ``memory_limit`` segments stay in
+    memory; older ones are appended to the log and merged back in order by
+    :meth:`to_documents`.
+    """
+
+    __slots__ = ("_speakers", "_starts", "_ends", "_texts", "_text_bytes", "_spill", "_memory_limit")
+
+    def __init__(
+        self,
+        segments: Iterable[Segment] = (),
+        spill: Optional[SpillLog] = None,
+        memory_limit: int = 0,
+    ) -> None:
+        self._speakers: List[Optional[int]] = []
+        self._starts = array("d")
+        self._ends = array("d")
+        self._texts: List[str] = []
+        self._text_bytes = 0
+        self._spill = spill
+        self._memory_limit = memory_limit if spill is not None else 0
+        for segment in segments:
+            self.append(segment)
+
+    @classmethod
+    def for_session(cls, settings: Settings, session_id: str) -> "SegmentStore":
+        path = Path(settings.storage_dir) / "transcripts" / f"{session_id}.segments"
+        return cls(spill=SpillLog(path), memory_limit=settings.stt_transcript_memory_segments)
+
+    def append(self, segment: Segment) -> None:
+        self._speakers.append(segment.speaker)
+        self._starts.append(segment.start)
+        self._ends.append(segment.end)
+        self._texts.append(segment.text)
+        self._text_bytes += sys.getsizeof(segment.text)
+
+        count = _spill_count(len(self._texts), self._memory_limit)
+        if count:
+            self._spill_oldest(count)
+
+    def _spill_oldest(self, count: int) -> None:
+        assert self._spill is not None
+        self._spill.append(
+            _SEGMENT.pack(self._starts[index], self._ends[index], -1 if speaker is None else speaker)
+            + self._texts[index].encode("utf-8")
+            for index, speaker in enumerate(self._speakers[:count])
+        )
+        self._text_bytes -= sum(sys.getsizeof(text) for text in self._texts[:count])
+        del self._speakers[:count]
+        del self._starts[:count]
+        del self._ends[:count]
+        del self._texts[:count]
+
+    def clear(self) -> None:
+        self._speakers.clear()
+        del self._starts[:]
+        del self._ends[:]
+        self._texts.clear()
+        self._text_bytes = 0
+        if self._spill is not None:
+            self._spill.close()
+
+    def close(self, delete: bool = True) -> None:
+        """Release the spill file; keep it (``delete=False``) when the transcript could not be persisted."""
+        if self._spill is not None:
+            self._spill.close(delete=delete)
+
+    @property
+    def spilled(self) -> int:
+        return len(self._spill) if self._spill is not None else 0
+
+    @property
+    def memory_bytes(self) -> int:
+        """Approximate heap held by the in-memory tail (spilled segments cost 8 bytes of offset each)."""
+        return (
+            sys.getsizeof(self._speakers)
+            + sys.getsizeof(self._texts)
+            + self._starts.buffer_info()[1] * self._starts.itemsize * 2
+            + self._text_bytes
+            + self.spilled * 8
+        )
+
+    def __len__(self) -> int:
+        return self.spilled + len(self._texts)
+
+    def __getitem__(self, index: int) -> Segment:
+        if index < 0:
+            index += len(self)
+        spilled = self.spilled
+        if index < spilled:
+            assert self._spill is not None
+            return self._decode(self._spill.read(index))
+        index -= spilled
+        return Segment(
+            speaker=self._speakers[index],
+            text=self._texts[index],
+            start=self._starts[index],
+            end=self._ends[index],
+        )
+
+    def __iter__(self) -> Iterator[Segment]:
+        if self._spill is not None:
+            for record in self._spill:
+                yield self._decode(record)
+        for index in range(len(self._texts)):
+            yield Segment(
+                speaker=self._speakers[index],
+                text=self._texts[index],
+                start=self._starts[index],
+                end=self._ends[index],
+            )
+
+    @staticmethod
+    def _decode(record: bytes) -> Segment:
+        start, end, speaker = _SEGMENT.unpack_from(record)
+        return Segment(
+            speaker=None if speaker < 0 else speaker,
+            text=record[_SEGMENT.size :].decode("utf-8"),
+            start=start,
+            end=end,
+        )
+
+    @property
+    def last_end(self) -> float:
+        return self._ends[-1] if self._ends else 0.0
+
+    def to_documents(self) -> List[Dict[str, Any]]:
+        """``TranscriptSegment``-shaped dicts, ready for BSON/JSON."""
+        return [
+            {"speaker": segment.speaker, "start": segment.start, "end": segment.end, "text": segment.text}
+            for segment in self
+        ]
+
+
+class QAPairStore:
+    """De-duplicated Q&A pairs of a session, kept as the extractor's plain dicts.
+
+    With a ``spill`` log the oldest pairs beyond ``memory_limit`` are written
+    out as JSON and their keys dropped; ``QAExtractor`` never re-emits a
+    pair, so the keys here only guard the in-memory tail.
+    """
+
+    __slots__ = ("_pairs", "_keys", "_pair_bytes", "_spill", "_memory_limit")
+
+    def __init__(self, spill: Optional[SpillLog] = None, memory_limit: int = 0) -> None:
+        self._pairs: List[Dict[str, Any]] = []
+        self._keys: Dict[Tuple[Any, Any, Any], None] = {}
+        self._pair_bytes = 0
+        self._spill = spill
+        self._memory_limit = memory_limit if spill is not None else 0
+
+    @classmethod
+    def for_session(cls, settings: Settings, session_id: str) -> "QAPairStore":
+        path = Path(settings.storage_dir) / "transcripts" / f"{session_id}.qa"
+        return cls(spill=SpillLog(path), memory_limit=settings.stt_transcript_memory_segments)
+
+    def register(self, payloads: Iterable[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+        """Keep payloads not seen before and return them (the delta to emit)."""
+        new_pairs: List[Dict[str, Any]] = []
+        for payload in payloads or []:
+            key = (payload.get("q_text"), payload.get("a_text"), payload.get("a_time"))
+            if key in self._keys:
+                continue
+            self._keys[key] = None
+            pair = dict(payload)
+            self._pairs.append(pair)
+            self._pair_bytes += self._sizeof(pair)
+            new_pairs.append(pair)
+
+        count = _spill_count(len(self._pairs), self._memory_limit)
+        if count:
+            self._spill_oldest(count)
+        return new_pairs
+
+    def _spill_oldest(self, count: int) -> None:
+        assert self._spill is not None
+        spilled = self._pairs[:count]
+        self._spill.append(json.dumps(pair, ensure_ascii=False).encode("utf-8") for pair in spilled)
+        for pair in spilled:
+            self._keys.pop((pair.get("q_text"), pair.get("a_text"), pair.get("a_time")), None)
+            self._pair_bytes -= self._sizeof(pair)
+        del self._pairs[:count]
+
+    @staticmethod
+    def _sizeof(pair: Dict[str, Any]) -> int:
+        return sys.getsizeof(pair) + sum(sys.getsizeof(value) for value in pair.values())
+
+    def clear(self) -> None:
+        self._pairs.clear()
+        self._keys.clear()
+        self._pair_bytes = 0
+        if self._spill is not None:
+            self._spill.close()
+
+    def close(self, delete: bool = True) -> None:
+        if self._spill is not None:
+            self._spill.close(delete=delete)
+
+    @property
+    def spilled(self) -> int:
+        return len(self._spill) if self._spill is not None else 0
+
+    @property
+    def memory_bytes(self) -> int:
+        return sys.getsizeof(self._pairs) + sys.getsizeof(self._keys) + self._pair_bytes + self.spilled * 8
+
+    def __len__(self) -> int:
+        return self.spilled + len(self._pairs)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        if self._spill is not None:
+            for record in self._spill:
+                yield json.loads(record)
+        yield from self._pairs
+
+    def to_documents(self) -> List[Dict[str, Any]]:
+        return list(self)
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import struct
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+_HEADER_SIZE = 16  # write cursor (u64) + read cursor (u64)
+_RECORD = struct.Struct("<IIH")  # payload length, sample rate, channels
+
+
+class SharedAudioRing:
+    """Single-producer/single-consumer byte ring over ``multiprocessing.shared_memory``.
+
+    The API process writes decoded audio frames, the session worker process
+    reads them. Cursors are monotonically increasing byte offsets; each side
+    only ever writes its own cursor, so no lock is needed. ``channels == 0``
+    marks a raw Opus packet rather than interleaved s16 PCM.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool) -> None:
+        self._shm = shm
+        self._owner = owner
+        self._capacity = shm.size - _HEADER_SIZE
+        self._cursors = shm.buf[:_HEADER_SIZE].cast("Q")
+        self._data = shm.buf[_HEADER_SIZE:]
+
+    @classmethod
+    def create(cls, capacity: int = 1 << 20) -> "SharedAudioRing":
+        shm = shared_memory.SharedMemory(create=True, size=capacity + _HEADER_SIZE)
+        shm.buf[:_HEADER_SIZE] = bytes(_HEADER_SIZE)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedAudioRing":
+        # Pool workers share the parent's resource tracker, so attaching does not
+        # add a second owner; only the creating side unlinks the segment.
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def pending_bytes(self) -> int:
+        return self._cursors[0] - self._cursors[1]
+
+    def write(self, payload: bytes, sample_rate: int, channels: int) -> bool:
+        """Append one record. Returns ``False`` (record dropped) when the ring is full."""
+
+        header = _RECORD.pack(len(payload), sample_rate, channels)
+        size = len(header) + len(payload)
+        write_pos, read_pos = self._cursors[0], self._cursors[1]
+        if size > self._capacity - (write_pos - read_pos):
+            return False
+
+        self._copy_in(write_pos, header)
+        self._copy_in(write_pos + len(header), payload)
+        self._cursors[0] = write_pos + size
+        return True
+
+    def read(self) -> Optional[Tuple[bytes, int, int]]:
+        write_pos, read_pos = self._cursors[0], self._cursors[1]
+        if write_pos - read_pos < _RECORD.size:
+            return None
+
+        length, sample_rate, channels = _RECORD.unpack(self._copy_out(read_pos, _RECORD.size))
+        payload = self._copy_out(read_pos + _RECORD.size, length)
+        self._cursors[1] = read_pos + _RECORD.size + length
+        return payload, sample_rate, channels
+
+    def close(self) -> None:
+        self._cursors.release()
+        self._data.release()
+        self._shm.close()
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _copy_in(self, position: int, chunk: bytes) -> None:
+        offset = position % self._capacity
+        first = min(len(chunk), self._capacity - offset)
+        self._data[offset : offset + first] = chunk[:first]
+        if first < len(chunk):
+            self._data[: len(chunk) - first] = chunk[first:]
+
+    def _copy_out(self, position: int, length: int) -> bytes:
+        offset = position % self._capacity
+        first = min(length, self._capacity - offset)
+        if first == length:
+            return bytes(self._data[offset : offset + length])
+        return bytes(self._data[offset:]) + bytes(self._data[: length - first])
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+from google.auth.exceptions import DefaultCredentialsError
+from google.cloud import speech_v1 as speech
+from google.cloud.speech_v1 import types as speech_types
+from google.cloud.speech_v1.types import StreamingRecognizeRequest, StreamingRecognizeResponse
+from google.oauth2 import service_account
+
+from app.core.config import Settings
+from app.sessions.recognition_log import read_responses
+
+logger = logging.getLogger(__name__)
+
+
+class NullSpeechClient:
+    """Consumes the request stream without recognising anything.
+
+    Used for capacity benchmarks where only the media and transcript-side
+    CPU matters and Google must not be called.
+    """
+
+    def streaming_recognize(
+        self,
+        requests: Iterable[StreamingRecognizeRequest],
+        config: Any = None,
+    ) -> Iterator[StreamingRecognizeResponse]:
+        for _ in requests:
+            pass
+        return iter(())
+
+
+class FakeSpeechClient:
+    """Deterministic stand-in for Google, for load tests against a real server.
+
+    Emits a partial every ``partial_sec`` and a final every ``final_sec`` of
+    received LINEAR16 audio. Each transcript starts with ``[<audio seconds>]``
+    so a client that knows when it sent that audio can compute the
+    end-to-end event latency. Finals alternate question/answer sentences so
+    the Q&A extractor does real work.
+    """
+
+    def __init__(self, sample_rate: int, partial_sec: float = 1.0, final_sec: float = 3.0) -> None:
+        self._bytes_per_sec = sample_rate * 2
+        self._partial_sec = partial_sec
+        self._final_sec = final_sec
+
+    def streaming_recognize(
+        self,
+        requests: Iterable[StreamingRecognizeRequest],
+        config: Any = None,
+    ) -> Iterator[StreamingRecognizeResponse]:
+        received = 0
+        finals = 0
+        next_partial, next_final = self._partial_sec, self._final_sec
+        for request in requests:
+            received += len(request.audio_content)
+            seconds = received / self._bytes_per_sec
+            if seconds >= next_final:
+                finals += 1
+                sentence = "관리비는 얼마인가요?" if finals % 2 else "관리비는 십만원입니다."
+                yield self._response(f"[{seconds:.2f}] {sentence}", seconds, final=True)
+                next_final += self._final_sec
+                next_partial = seconds + self._partial_sec
+            elif seconds >= next_partial:
+                yield self._response(f"[{seconds:.2f}] 관리비는", seconds, final=False)
+                next_partial += self._partial_sec
+
+    def _response(self, text: str, seconds: float, final: bool) -> StreamingRecognizeResponse:
+        words = []
+        if final:
+            start = max(seconds - self._final_sec, 0.0)
+            step = (seconds - start) / max(len(text.split()), 1)
+            words = [
+                speech_types.WordInfo(
+                    word=word,
+                    start_time=timedelta(seconds=start + index * step),
+                    end_time=timedelta(seconds=start + (index + 1) * step),
+                )
+                for index, word in enumerate(text.split())
+            ]
+        return StreamingRecognizeResponse(
+            results=[
+                speech_types.StreamingRecognitionResult(
+                    alternatives=[speech_types.SpeechRecognitionAlternative(transcript=text, words=words)],
+                    is_final=final,
+                ),
+            ],
+        )
+
+
+class ReplaySpeechClient:
+    """Answers every stream with a recorded session's responses.
+
+    Requests are drained on a background thread, as gRPC would, so the audio
+    side of the pipeline sees the same back-pressure as with Google. With
+    ``realtime`` the responses keep their recorded spacing; otherwise they
+    are yielded as fast as the consumer takes them.
+    """
+
+    def __init__(self, path: Path, realtime: bool = True) -> None:
+        self._path = Path(path)
+        self._realtime = realtime
+
+    def streaming_recognize(
+        self,
+        requests: Iterable[StreamingRecognizeRequest],
+        config: Any = None,
+    ) -> Iterator[StreamingRecognizeResponse]:
+        drain = threading.Thread(target=self._drain, args=(requests,), daemon=True)
+        drain.start()
+        return self._responses()
+
+    def _responses(self) -> Iterator[StreamingRecognizeResponse]:
+        started = time.monotonic()
+        for offset, response in read_responses(self._path):
+            if self._realtime:
+                delay = started + offset - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            yield response
+
+    @staticmethod
+    def _drain(requests: Iterable[StreamingRecognizeRequest]) -> None:
+        for _ in requests:
+            pass
+
+
+def create_speech_client(settings: Settings) -> Any:
+    """Return a client exposing ``streaming_recognize(requests=..., config=...)``."""
+
+    backend = settings.stt_backend.lower()
+    if backend == "null":
+        return NullSpeechClient()
+    if backend == "fake":
+        return FakeSpeechClient(settings.stt_sample_rate)
+    if backend == "replay":
+        if not settings.stt_replay_path:
+            raise ValueError("STT_REPLAY_PATH is required for STT_BACKEND=replay")
+        return ReplaySpeechClient(settings.stt_replay_path, realtime=settings.stt_replay_realtime)
+
+    if settings.google_application_credentials:
+        try:
+            credentials = service_account.Credentials.from_service_account_file(
+                str(settings.google_application_credentials),
+            )
+        except FileNotFoundError as exc:
+            raise DefaultCredentialsError(str(exc)) from exc
+        return speech.SpeechClient(credentials=credentials)
+    return speech.SpeechClient()
+
+
+def recognition_config(settings: Settings, *, opus: bool = False) -> speech_types.RecognitionConfig:
+    """RecognitionConfig shared by live sessions and batch re-processing."""
+
+    if opus:
+        encoding = speech.RecognitionConfig.AudioEncoding.OGG_OPUS
+        sample_rate = settings.rtc_sample_rate
+    else:
+        encoding = speech.RecognitionConfig.AudioEncoding.LINEAR16
+        sample_rate = settings.stt_sample_rate
+    return speech_types.RecognitionConfig(
+        encoding=encoding,
+        sample_rate_hertz=sample_rate,
+        audio_channel_count=1,
+        language_code=settings.rtc_language,
+        enable_automatic_punctuation=True,
+        enable_word_time_offsets=True,
+        use_enhanced=settings.stt_use_enhanced,
+        model=settings.stt_model,
+    )
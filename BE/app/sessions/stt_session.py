@@ -2,7 +2,8 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Any, Dict, Optional, Set
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional, Set
 
 from aiortc import (
     RTCConfiguration,
@@ -17,9 +18,17 @@ from aiortc.rtcicetransport import Candidate
 from fastapi import WebSocket
 
 from app.core.config import Settings
+from app.core.logging import SampledLog, session_context
 from app.sessions.audio_pipeline import AudioPipeline
 from app.sessions import events
+from app.sessions.flight_recorder import FlightRecorder
+from app.sessions.metrics import AUDIO_FRAMES
+from app.sessions.opus_passthrough import OpusPassthroughTap
 from app.sessions.transcriber import Transcriber
+
+if TYPE_CHECKING:
+    from app.sessions.worker_pool import RemoteSession, SessionWorkerPool
+
 logger = logging.getLogger(__name__)
 
 
@@ -31,6 +40,7 @@ class STTSession:
         session_id: str,
         websocket: WebSocket,
         settings: Settings,
+        worker_pool: Optional["SessionWorkerPool"] = None,
     ) -> None:
         self.session_id = session_id
         self.websocket = websocket
@@ -40,20 +50,33 @@ class STTSession:
         self._tasks: Set[asyncio.Task[None]] = set()
         self._audio_queue: asyncio.Queue[Optional[bytes]] = asyncio.Queue(maxsize=64)
         self._logs_dir = settings.logs_dir
-        self._audio_pipeline = AudioPipeline(
-            session_id=session_id,
-            settings=settings,
-            output_queue=self._audio_queue,
-        )
-        self._transcriber = Transcriber(
-            session_id=session_id,
-            settings=settings,
-            websocket=websocket,
-            audio_queue=self._audio_queue,
-            audio_pipeline=self._audio_pipeline,
-        )
+        self._remote: Optional["RemoteSession"] = None
+        self._audio_pipeline: Optional[AudioPipeline] = None
+        self._transcriber: Optional[Transcriber] = None
+        self.flight = FlightRecorder(session_id, settings.stt_flight_recorder_size)
+        if worker_pool is not None:
+            # Media and recognition run in a pool process; this side only relays.
+            self._remote = worker_pool.open_session(session_id, websocket, self.flight)
+        else:
+            self._audio_pipeline = AudioPipeline(
+                session_id=session_id,
+                settings=settings,
+                output_queue=self._audio_queue,
+            )
+            self._transcriber = Transcriber(
+                session_id=session_id,
+                settings=settings,
+                websocket=websocket,
+                audio_queue=self._audio_queue,
+                audio_pipeline=self._audio_pipeline,
+                flight=self.flight,
+            )
         self._transcriber_started = False
         self._room_id: Optional[str] = None
+        self._created_at = time.monotonic()
+        self._last_signal_at = self._created_at
+        self._last_audio_at: Optional[float] = None
+        self._frames_received = 0
 
         ice_servers: list[RTCIceServer] = []
         for entry in settings.ice_servers:
@@ -79,8 +102,10 @@ class STTSession:
 
     async def handle_offer(self, offer: Dict[str, Any]) -> Dict[str, Any]:
         logger.debug("Session %s handling offer", self.session_id)
+        self.touch()
         if "sdp" not in offer or "type" not in offer:
             raise ValueError("Invalid offer payload")
+        self.flight.record("offer.received")
 
         remote_description = RTCSessionDescription(sdp=offer["sdp"], type=offer["type"])
         await self._pc.setRemoteDescription(remote_description)
@@ -89,12 +114,14 @@ class STTSession:
         await self._pc.setLocalDescription(answer)
 
         local = self._pc.localDescription
+        self.flight.record("answer.sent")
         return {
             "sdp": local.sdp,
             "type": local.type,
         }
 
     async def add_ice_candidate(self, payload: Dict[str, Any]) -> None:
+        self.touch()
         if not payload:
             return
         
@@ -132,13 +159,14 @@ class STTSession:
             logger.warning("Session %s failed to add ICE candidate: %s", self.session_id, exc)
             raise
 
-    async def stop(self) -> None:
+    async def stop(self, reason: str = "session stopped") -> None:
         if self._closed.is_set():
             logger.debug("Session %s stop() called but already closed", self.session_id)
             return
 
         self._closed.set()
         logger.info("Stopping STT session %s", self.session_id)
+        self.flight.record("session.stop", reason=reason, frames=self._frames_received)
 
         for task in list(self._tasks):
             task.cancel()
@@ -146,15 +174,22 @@ class STTSession:
         if self._tasks:
             await asyncio.gather(*self._tasks, return_exceptions=True)
 
-        try:
-            await self._transcriber.stop()
-        except Exception as exc:  # pragma: no cover - diagnostics
-            logger.exception("Session %s transcriber stop failed: %s", self.session_id, exc)
+        if self._remote is not None:
+            try:
+                await self._remote.stop()
+            except Exception as exc:  # pragma: no cover - diagnostics
+                logger.exception("Session %s remote pipeline stop failed: %s", self.session_id, exc)
+        else:
+            try:
+                await self._transcriber.stop()
+            except Exception as exc:  # pragma: no cover - diagnostics
+                logger.exception("Session %s transcriber stop failed: %s", self.session_id, exc)
 
-        try:
-            self._audio_pipeline.close()
-        except Exception as exc:  # pragma: no cover - diagnostics
-            logger.exception("Session %s audio pipeline close failed: %s", self.session_id, exc)
+            try:
+                # Passthrough sessions decode their Ogg recording on close, keep it off the event loop.
+                await asyncio.to_thread(self._audio_pipeline.close)
+            except Exception as exc:  # pragma: no cover - diagnostics
+                logger.exception("Session %s audio pipeline close failed: %s", self.session_id, exc)
 
         try:
             await self._pc.close()
@@ -168,19 +203,83 @@ class STTSession:
             except asyncio.QueueEmpty:
                 break
 
-        await events.emit_session_close(self.websocket, "session stopped")
+        self.flight.record("session.closed")
+        await events.emit_session_close(self.websocket, reason)
+
+    @property
+    def room_id(self) -> Optional[str]:
+        return self._room_id
+
+    @property
+    def closed(self) -> bool:
+        return self._closed.is_set()
+
+    def touch(self) -> None:
+        """Record signalling activity (any websocket message from the client)."""
+        self._last_signal_at = time.monotonic()
+
+    def idle_seconds(self, now: Optional[float] = None) -> tuple[Optional[float], float]:
+        """Return ``(since_last_audio, since_last_signal)``; the first is None before any audio."""
+        now = time.monotonic() if now is None else now
+        audio_idle = None if self._last_audio_at is None else now - self._last_audio_at
+        return audio_idle, now - self._last_signal_at
+
+    def resource_usage(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        audio_idle, signal_idle = self.idle_seconds(now)
+        queued = list(self._audio_queue._queue)  # type: ignore[attr-defined]
+        usage: Dict[str, Any] = {
+            "session_id": self.session_id,
+            "room_id": self._room_id,
+            "mode": "process" if self._remote is not None else "inline",
+            "connection_state": self._pc.connectionState,
+            "age_sec": round(now - self._created_at, 1),
+            "audio_idle_sec": None if audio_idle is None else round(audio_idle, 1),
+            "signal_idle_sec": round(signal_idle, 1),
+            "frames_received": self._frames_received,
+            "tasks": len(self._tasks),
+            "queue_items": len(queued),
+            "queue_bytes": sum(len(item) for item in queued if item),
+            "backlog": round(self.backlog, 3),
+        }
+        if self._remote is not None:
+            # The shared-memory ring is the only handle held in this process.
+            # Transcript memory of pooled sessions is reported by the worker in stt.stats.
+            usage.update(open_files=1, threads=0, dropped=self._remote.dropped, transcript_bytes=None)
+        else:
+            usage.update(
+                open_files=self._audio_pipeline.open_files,
+                threads=1 if self._transcriber.running else 0,
+                dropped=self._audio_pipeline.get_stats()["dropped"],
+                transcript_bytes=self._transcriber.memory_bytes,
+            )
+        return usage
+
+    @property
+    def backlog(self) -> float:
+        """How full this session's audio hand-off is (0.0 - 1.0); a lagging consumer shows up here first."""
+        if self._remote is not None:
+            return self._remote.backlog
+        return self._audio_queue.qsize() / self._audio_queue.maxsize
 
     def get_audio_queue(self) -> asyncio.Queue[Optional[bytes]]:
         return self._audio_queue
 
     def configure(self, payload: Dict[str, Any]) -> None:
+        self.touch()
         room_id = payload.get("roomId") or payload.get("room_id")
         if room_id:
             self._room_id = str(room_id)
-            self._transcriber.set_room_id(self._room_id)
+            if self._remote is not None:
+                self._remote.set_room_id(self._room_id)
+            else:
+                self._transcriber.set_room_id(self._room_id)
 
     def _on_connection_state_change(self) -> None:
         logger.debug("Session %s connection state: %s", self.session_id, self._pc.connectionState)
+        self.flight.record(f"ice.{self._pc.connectionState}")
+        if self._pc.connectionState == "failed":
+            self.flight.record("error", code="RTC_FAILED")
         if self._pc.connectionState in {"failed", "closed"}:
             asyncio.create_task(self.stop())
         if self._pc.connectionState == "failed":
@@ -192,18 +291,28 @@ class STTSession:
             return
 
         logger.info("Audio track received for session %s", self.session_id)
-        relayed = self._relay.subscribe(track)
-        task = asyncio.create_task(self._consume_audio(relayed))
+        self.flight.record("track.received", passthrough=self.settings.stt_opus_passthrough)
+        tap = self._install_passthrough_tap(track) if self.settings.stt_opus_passthrough else None
+        context = session_context(self.session_id)
+        if tap is not None:
+            task = asyncio.create_task(self._consume_opus(tap), context=context)
+        else:
+            relayed = self._relay.subscribe(track)
+            task = asyncio.create_task(self._consume_audio(relayed), context=context)
         self._tasks.add(task)
         task.add_done_callback(self._tasks.discard)
 
     async def _consume_audio(self, track: MediaStreamTrack) -> None:
+        frame_log = SampledLog(logger, every=self.settings.log_hot_path_sample_every)
         try:
-            frame_index = 0
             while not self._closed.is_set():
                 frame = await track.recv()
-                frame_index += 1
-                logger.debug("Session %s received frame #%d from track", self.session_id, frame_index)
+                self._mark_audio()
+                if frame_log.due():
+                    logger.debug("Session %s received frame #%d from track", self.session_id, self._frames_received)
+                if self._remote is not None:
+                    self._remote.write_frame(frame)
+                    continue
                 await self._ensure_transcriber_started()
                 await self._audio_pipeline.handle_frame(frame)
         except asyncio.CancelledError:
@@ -216,6 +325,44 @@ class STTSession:
             except asyncio.QueueFull:
                 pass
 
+    def _install_passthrough_tap(self, track: MediaStreamTrack) -> Optional[OpusPassthroughTap]:
+        for transceiver in self._pc.getTransceivers():
+            if transceiver.receiver and transceiver.receiver.track is track:
+                return OpusPassthroughTap.install(transceiver.receiver)
+        logger.warning("Session %s could not find receiver for track; falling back to PCM", self.session_id)
+        return None
+
+    async def _consume_opus(self, tap: OpusPassthroughTap) -> None:
+        try:
+            while not self._closed.is_set():
+                packet = await tap.recv()
+                if packet is None:
+                    break
+                self._mark_audio()
+                if self._remote is not None:
+                    self._remote.write_opus_packet(packet)
+                    continue
+                await self._ensure_transcriber_started()
+                await self._audio_pipeline.handle_opus_packet(packet)
+        except asyncio.CancelledError:
+            pass
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.warning("Opus passthrough failed for session %s: %s", self.session_id, exc)
+        finally:
+            if tap.dropped:
+                logger.info("Session %s dropped %d Opus frames", self.session_id, tap.dropped)
+            try:
+                self._audio_queue.put_nowait(None)
+            except asyncio.QueueFull:
+                pass
+
+    def _mark_audio(self) -> None:
+        self._last_audio_at = time.monotonic()
+        self._frames_received += 1
+        AUDIO_FRAMES.inc()
+        if self._frames_received == 1:
+            self.flight.record("audio.first_frame")
+
     async def _ensure_transcriber_started(self) -> None:
         if not self._transcriber_started:
             await self._transcriber.start()
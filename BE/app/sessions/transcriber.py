@@ -3,20 +3,22 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
-from typing import Iterable, Optional, TYPE_CHECKING
+from typing import Optional, TYPE_CHECKING
 
 from google.api_core import exceptions as google_exceptions
-from google.cloud import speech_v1 as speech
 from google.cloud.speech_v1 import types as speech_types
 from google.cloud.speech_v1.types import StreamingRecognizeResponse, SpeechRecognitionResult
 from google.auth.exceptions import DefaultCredentialsError
-from google.oauth2 import service_account
 
 from app.core.config import Settings
-from app.models import QAPair, TranscriptSegment
+from app.core.logging import SampledLog, session_context
 from app.sessions import events
 from app.sessions.diarization import DiarizationProcessor, Segment
+from app.sessions.flight_recorder import FlightRecorder
 from app.sessions.qa_extractor import QAExtractor
+from app.sessions.recognition_log import ResponseRecorder
+from app.sessions.session_store import QAPairStore, SegmentStore
+from app.sessions.speech_backends import create_speech_client, recognition_config
 from app.use_cases import get_stt_use_case
 
 if TYPE_CHECKING:
@@ -34,12 +36,14 @@ class Transcriber:
         websocket,
         audio_queue: asyncio.Queue[Optional[bytes]],
         audio_pipeline: 'AudioPipeline' | None = None,
+        flight: Optional[FlightRecorder] = None,
     ) -> None:
         self._session_id = session_id
         self._settings = settings
         self._websocket = websocket
         self._audio_queue = audio_queue
         self._audio_pipeline = audio_pipeline
+        self._flight = flight or FlightRecorder(session_id, settings.stt_flight_recorder_size)
 
         self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._task: Optional[asyncio.Task[None]] = None
@@ -48,11 +52,11 @@ class Transcriber:
         self._final_count = 0
         self._partial_count = 0
         self._started_at: float = 0.0
+        self._stream_started_at: float = 0.0
 
         self._qa_extractor = QAExtractor(settings)
-        self._qa_pairs: list[QAPair] = []
-        self._qa_pair_keys: set[str] = set()
-        self._transcript_segments: list[TranscriptSegment] = []
+        self._qa_pairs = QAPairStore.for_session(settings, session_id)
+        self._transcript_segments = SegmentStore.for_session(settings, session_id)
         self._last_final_transcript: str = ""
         self._room_id: Optional[str] = None
         self._diarizer = DiarizationProcessor(settings.logs_dir)
@@ -65,12 +69,12 @@ class Transcriber:
         self._stop_event.clear()
         self._started_at = time.monotonic()
         self._qa_extractor = QAExtractor(self._settings)
-        self._qa_pairs = []
-        self._qa_pair_keys = set()
-        self._transcript_segments = []
+        self._qa_pairs.clear()
+        self._transcript_segments.clear()
         self._last_final_transcript = ""
         self._diarizer.reset()
-        self._task = asyncio.create_task(self._run())
+        # The recognition thread inherits this context, so its log records carry the session id.
+        self._task = asyncio.create_task(self._run(), context=session_context(self._session_id))
         logger.debug("Transcriber started for session %s", self._session_id)
 
     async def stop(self) -> None:
@@ -91,12 +95,10 @@ class Transcriber:
             logger.exception("Transcriber task raised during stop for session %s: %s", self._session_id, exc)
         finally:
             if self._loop:
-                await events.emit_qa_pairs(
-                    self._websocket,
-                    [pair.model_dump() for pair in self._qa_pairs],
-                    final=True,
-                )
-            await self._persist_results()
+                await events.emit_qa_pairs(self._websocket, self._qa_pairs.to_documents(), final=True)
+            persisted = await self._persist_results()
+            self._qa_pairs.close(delete=persisted)
+            self._transcript_segments.close(delete=persisted)
             logger.debug("Transcriber task finished for session %s", self._session_id)
             self._task = None
 
@@ -104,16 +106,28 @@ class Transcriber:
         if room_id:
             self._room_id = room_id
 
+    @property
+    def memory_bytes(self) -> int:
+        """Approximate heap held by the in-memory transcript and Q&A tails."""
+        return self._transcript_segments.memory_bytes + self._qa_pairs.memory_bytes
+
+    @property
+    def running(self) -> bool:
+        """True while the recognition thread is alive."""
+        return self._task is not None and not self._task.done()
+
     async def _run(self) -> None:
         try:
             logger.debug("Transcriber run loop starting for session %s", self._session_id)
             await asyncio.to_thread(self._streaming_recognize)
         except DefaultCredentialsError as exc:
             logger.error("Google credentials not configured for session %s: %s", self._session_id, exc)
+            self._flight.record("error", code="GOOGLE_AUTH_MISSING", message=str(exc)[:200])
             if self._loop:
                 await events.emit_error(self._websocket, "GOOGLE_AUTH_MISSING", str(exc))
         except Exception as exc:  # pragma: no cover - fallback reporting
             logger.exception("Transcriber run failed for session %s: %s", self._session_id, exc)
+            self._flight.record("error", code="UPSTREAM_FAIL", message=str(exc)[:200])
             if self._loop:
                 await events.emit_error(self._websocket, "UPSTREAM_FAIL", str(exc))
         finally:
@@ -121,26 +135,8 @@ class Transcriber:
 
     def _streaming_recognize(self) -> None:
         logger.debug("Session %s streaming_recognize begin", self._session_id)
-        if self._settings.google_application_credentials:
-            try:
-                credentials = service_account.Credentials.from_service_account_file(
-                    str(self._settings.google_application_credentials),
-                )
-                client = speech.SpeechClient(credentials=credentials)
-            except FileNotFoundError as exc:
-                raise DefaultCredentialsError(str(exc)) from exc
-        else:
-            client = speech.SpeechClient()
-        config = speech_types.RecognitionConfig(
-            encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
-            sample_rate_hertz=self._settings.stt_sample_rate,
-            audio_channel_count=1,
-            language_code=self._settings.rtc_language,
-            enable_automatic_punctuation=True,
-            enable_word_time_offsets=True,
-            use_enhanced=self._settings.stt_use_enhanced,
-            model=self._settings.stt_model,
-        )
+        client = create_speech_client(self._settings)
+        config = recognition_config(self._settings, opus=self._settings.stt_opus_passthrough)
 
         streaming_config = speech_types.StreamingRecognitionConfig(
             config=config,
@@ -151,19 +147,41 @@ class Transcriber:
         logger.debug("Session %s streaming_recognize start", self._session_id)
 
         request_iterator = self._request_generator(streaming_config)
+        recorder = (
+            ResponseRecorder.for_session(self._settings.logs_dir, self._session_id)
+            if self._settings.stt_record_responses
+            else None
+        )
+        first_response = True
+        self._stream_started_at = time.monotonic()
         try:
             responses = client.streaming_recognize(requests=request_iterator, config=streaming_config)
+            self._flight.record("stream.opened", backend=self._settings.stt_backend)
             for response in responses:
-                self._handle_response(response)
+                if first_response:
+                    first_response = False
+                    self._flight.record("stream.first_response")
+                if recorder:
+                    recorder.write(response)
+                self.handle_response(response)
         except google_exceptions.GoogleAPICallError as exc:
             logger.warning("Session %s Google STT error: %s", self._session_id, exc)
+            self._flight.record("error", code="UPSTREAM_FAIL", message=str(exc)[:200])
             if self._loop:
                 asyncio.run_coroutine_threadsafe(
                     events.emit_error(self._websocket, "UPSTREAM_FAIL", str(exc)),
                     self._loop,
                 )
         finally:
+            if recorder:
+                recorder.close()
             duration = max(time.monotonic() - self._started_at, 0.0)
+            self._flight.record(
+                "stream.closed",
+                seconds=round(duration, 2),
+                partials=self._partial_count,
+                finals=self._final_count,
+            )
             logger.debug(
                 "Transcriber streaming finished for session %s after %.2fs (finals=%d)",
                 self._session_id,
@@ -172,6 +190,7 @@ class Transcriber:
             )
 
     def _request_generator(self, streaming_config: speech_types.StreamingRecognitionConfig):
+        chunk_log = SampledLog(logger, every=self._settings.log_hot_path_sample_every)
         while not self._stop_event.is_set():
             if self._loop is None:
                 break
@@ -186,14 +205,17 @@ class Transcriber:
                 break
             if not chunk:
                 continue
-            logger.debug(
-                "Session %s request_generator sending chunk size=%d",
-                self._session_id,
-                len(chunk),
-            )
+            if chunk_log.due():
+                logger.debug(
+                    "Session %s request_generator sending chunk #%d size=%d",
+                    self._session_id,
+                    chunk_log.count,
+                    len(chunk),
+                )
             yield speech_types.StreamingRecognizeRequest(audio_content=chunk)
 
-    def _handle_response(self, response: StreamingRecognizeResponse) -> None:
+    def handle_response(self, response: StreamingRecognizeResponse) -> None:
+        """Turn one recognition response into partial/final/QA events (also fed directly by replay)."""
         if not self._loop:
             return
 
@@ -209,6 +231,8 @@ class Transcriber:
                 if transcript != self._partial_text:
                     self._partial_text = transcript
                     self._partial_count += 1
+                    if self._partial_count == 1:
+                        self._flight.record("stt.first_partial", chars=len(transcript))
                     asyncio.run_coroutine_threadsafe(
                         events.emit_partial(self._websocket, transcript),
                         self._loop,
@@ -248,22 +272,33 @@ class Transcriber:
             )
 
             for segment in segments:
-                self._append_transcript_segment(segment)
+                self._transcript_segments.append(segment)
 
             qa_payloads = self._qa_extractor.append_segments(segments)
-            new_pairs = self._register_qa_pairs(qa_payloads)
+            new_pairs = self._qa_pairs.register(qa_payloads)
             if new_pairs:
                 asyncio.run_coroutine_threadsafe(
-                    events.emit_qa_pairs(
-                        self._websocket,
-                        [pair.model_dump() for pair in new_pairs],
-                        final=False,
-                    ),
+                    events.emit_qa_pairs(self._websocket, new_pairs, final=False),
                     self._loop,
                 )
 
             self._final_count += 1
             self._last_final_transcript = transcript
+            if self._final_count == 1:
+                self._flight.record("stt.first_final")
+            # Audio is streamed in real time, so the stream clock minus the result's audio offset is the lag.
+            speech_end = self._duration_to_seconds(getattr(result, "result_end_time", None))
+            lag_ms = None
+            if speech_end and self._stream_started_at:
+                lag_ms = (time.monotonic() - self._stream_started_at - speech_end) * 1000
+            self._flight.record(
+                "stt.final",
+                index=self._final_count,
+                segments=len(segments),
+                chars=sum(len(segment.text) for segment in segments),
+                qa=len(new_pairs),
+                lag_ms=None if lag_ms is None else round(lag_ms, 1),
+            )
 
             if self._loop:
                 stats = {
@@ -271,11 +306,16 @@ class Transcriber:
                     "finals": self._final_count,
                     "bytes": 0,
                     "chunks": 0,
+                    "dropped": 0,
+                    "segments": len(self._transcript_segments),
+                    "spilled_segments": self._transcript_segments.spilled,
+                    "transcript_bytes": self.memory_bytes,
                 }
                 if self._audio_pipeline:
                     pipeline_stats = self._audio_pipeline.get_stats()
                     stats["bytes"] = pipeline_stats.get("bytes", 0)
                     stats["chunks"] = pipeline_stats.get("chunks", 0)
+                    stats["dropped"] = pipeline_stats.get("dropped", 0)
 
                 asyncio.run_coroutine_threadsafe(
                     events.emit_stats(self._websocket, stats),
@@ -300,34 +340,13 @@ class Transcriber:
             start = self._duration_to_seconds(getattr(words[0], "start_time", None))
             end = self._duration_to_seconds(getattr(words[-1], "end_time", None))
         else:
-            start = self._transcript_segments[-1].end if self._transcript_segments else 0.0
+            start = self._transcript_segments.last_end
             end = self._duration_to_seconds(getattr(result, "result_end_time", None))
             if end < start:
                 end = start
 
         return Segment(speaker=None, text=text, start=start, end=end)
 
-    def _append_transcript_segment(self, segment: Segment) -> None:
-        transcript_segment = TranscriptSegment.from_values(
-            segment.speaker,
-            segment.start,
-            segment.end,
-            segment.text,
-        )
-        self._transcript_segments.append(transcript_segment)
-
-    def _register_qa_pairs(self, pairs: Iterable[dict]) -> list[QAPair]:
-        new_pairs: list[QAPair] = []
-        for payload in pairs or []:
-            key = f"{payload.get('q_text')}|{payload.get('a_text')}|{payload.get('a_time')}"
-            if key in self._qa_pair_keys:
-                continue
-            self._qa_pair_keys.add(key)
-            pair = QAPair.model_validate(payload)
-            self._qa_pairs.append(pair)
-            new_pairs.append(pair)
-        return new_pairs
-
     @staticmethod
     def _is_punctuation_char(ch: str) -> bool:
         if not ch:
@@ -409,22 +428,33 @@ class Transcriber:
 
         return updated_segments
 
-    async def _persist_results(self) -> None:
+    async def _persist_results(self) -> bool:
+        """Persist the session; False keeps the spill files so a failed write can be recovered."""
         if not self._room_id:
-            return
+            return True
         if not self._qa_pairs and not self._transcript_segments:
-            return
+            return True
 
+        started = time.perf_counter()
+        self._flight.record("persist.start", segments=len(self._transcript_segments), qa=len(self._qa_pairs))
         try:
             use_case = get_stt_use_case()
-            await use_case.persist_session_result(self._room_id, self._qa_pairs, self._transcript_segments)
+            await use_case.persist_session_store(
+                self._room_id, self._qa_pairs, self._transcript_segments, session_id=self._session_id
+            )
         except Exception as exc:  # pragma: no cover - diagnostics
+            self._flight.record("error", code="PERSIST_FAIL", message=str(exc)[:200])
             logger.exception(
                 "Failed to persist STT results for session %s (room=%s): %s",
                 self._session_id,
                 self._room_id,
                 exc,
             )
+            if self._transcript_segments.spilled or self._qa_pairs.spilled:
+                logger.warning("Spilled transcript kept under %s", self._settings.storage_dir)
+            return False
+        self._flight.record("persist.end", ms=round((time.perf_counter() - started) * 1000, 1))
+        return True
 
     @staticmethod
     def _duration_to_seconds(duration) -> float:
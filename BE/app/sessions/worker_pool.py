@@ -0,0 +1,428 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from multiprocessing.connection import Connection
+from typing import Any, Dict, Mapping, Optional
+
+import av
+import numpy as np
+from av.audio.resampler import AudioResampler
+
+from app.core.config import Settings
+from app.core.logging import configure_logging
+from app.sessions.audio_pipeline import AudioPipeline
+from app.sessions.events import encode
+from app.sessions.flight_recorder import Entry, FlightRecorder
+from app.sessions.metrics import AUDIO_BYTES, AUDIO_CHUNKS, AUDIO_DROPPED
+from app.sessions.shm_ring import SharedAudioRing
+from app.sessions.transcriber import Transcriber
+
+logger = logging.getLogger(__name__)
+
+_POLL_INTERVAL_SEC = 0.01
+_STOP_TIMEOUT_SEC = 30.0
+_OPUS_CHANNELS = 0
+
+
+class RemoteSession:
+    """API-process handle of a session whose media/recognition pipeline runs in a pool worker.
+
+    Audio is handed over through a :class:`SharedAudioRing`; the worker sends
+    events back already JSON-encoded, so this side only relays text frames.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        worker: "_WorkerProcess",
+        websocket: Any,
+        flight: Optional[FlightRecorder] = None,
+    ) -> None:
+        self.session_id = session_id
+        self._worker = worker
+        self._websocket = websocket
+        self._flight = flight
+        self._ring = SharedAudioRing.create()
+        self._resampler: Optional[AudioResampler] = None
+        self._events: asyncio.Queue[Optional[str]] = asyncio.Queue()
+        self._relay_task = asyncio.create_task(self._relay())
+        self._stopped: asyncio.Future[Dict[str, Any]] = asyncio.get_running_loop().create_future()
+        self._dropped = 0
+
+    @property
+    def ring_name(self) -> str:
+        return self._ring.name
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    @property
+    def backlog(self) -> float:
+        """Fraction of the audio ring the worker has not consumed yet."""
+        return self._ring.pending_bytes / self._ring.capacity
+
+    def write_frame(self, frame: av.AudioFrame) -> bool:
+        if frame.format.name != "s16":
+            if self._resampler is None:
+                self._resampler = AudioResampler(format="s16", layout=frame.layout.name, rate=frame.sample_rate)
+            frames = self._resampler.resample(frame)
+        else:
+            frames = [frame]
+
+        written = True
+        for item in frames:
+            payload = item.to_ndarray().tobytes()
+            written = self._write(payload, item.sample_rate, len(item.layout.channels)) and written
+        return written
+
+    def write_opus_packet(self, packet: bytes) -> bool:
+        return self._write(packet, 48000, _OPUS_CHANNELS)
+
+    def set_room_id(self, room_id: Optional[str]) -> None:
+        if room_id:
+            self._worker.send(("room", self.session_id, room_id))
+
+    async def stop(self) -> Dict[str, Any]:
+        if not self._stopped.done():
+            self._worker.send(("stop", self.session_id))
+        try:
+            stats = await asyncio.wait_for(asyncio.shield(self._stopped), timeout=_STOP_TIMEOUT_SEC)
+        except asyncio.TimeoutError:
+            logger.warning("Session %s worker did not acknowledge stop", self.session_id)
+            stats = {}
+        finally:
+            self._worker.detach(self.session_id)
+            self._events.put_nowait(None)
+            await asyncio.gather(self._relay_task, return_exceptions=True)
+            self._ring.close()
+        stats["dropped"] = self._dropped
+        return stats
+
+    def _write(self, payload: bytes, sample_rate: int, channels: int) -> bool:
+        if self._ring.write(payload, sample_rate, channels):
+            AUDIO_BYTES.inc(len(payload))
+            AUDIO_CHUNKS.inc()
+            return True
+        self._dropped += 1
+        AUDIO_DROPPED.inc()
+        return False
+
+    def _deliver(self, text: str) -> None:
+        self._events.put_nowait(text)
+
+    def _record_flight(self, entry: Entry) -> None:
+        if self._flight is not None:
+            self._flight.add(entry)
+
+    def _mark_stopped(self, stats: Dict[str, Any]) -> None:
+        if not self._stopped.done():
+            self._stopped.set_result(stats)
+
+    async def _relay(self) -> None:
+        while True:
+            text = await self._events.get()
+            if text is None:
+                return
+            try:
+                await self._websocket.send_text(text)
+            except Exception as exc:  # pragma: no cover - client went away
+                logger.debug("Session %s event relay failed: %s", self.session_id, exc)
+
+
+class _WorkerProcess:
+    """Parent-side bookkeeping for one pool process."""
+
+    def __init__(self, index: int, settings_payload: Dict[str, Any]) -> None:
+        ctx = multiprocessing.get_context("spawn")
+        self._conn, child_conn = ctx.Pipe(duplex=True)
+        self._process = ctx.Process(
+            target=run_worker,
+            args=(child_conn, settings_payload),
+            name=f"stt-session-worker-{index}",
+            daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+        self.sessions: Dict[str, RemoteSession] = {}
+        self.alive = True
+        self._closing = False
+        loop = asyncio.get_running_loop()
+        self.ready: asyncio.Future[None] = loop.create_future()
+        loop.add_reader(self._conn.fileno(), self._on_readable)
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self._process.pid
+
+    def send(self, message: tuple) -> None:
+        if not self.alive:
+            return
+        try:
+            self._conn.send(message)
+        except (BrokenPipeError, OSError) as exc:
+            logger.warning("STT worker %s unreachable: %s", self.pid, exc)
+            self._on_lost()
+
+    def attach(self, session: RemoteSession) -> None:
+        self.sessions[session.session_id] = session
+        self.send(("start", session.session_id, session.ring_name))
+
+    def detach(self, session_id: str) -> None:
+        self.sessions.pop(session_id, None)
+
+    def _on_readable(self) -> None:
+        try:
+            while self._conn.poll():
+                kind, session_id, body = self._conn.recv()
+                if kind == "ready":
+                    if not self.ready.done():
+                        self.ready.set_result(None)
+                    continue
+                session = self.sessions.get(session_id)
+                if session is None:
+                    continue
+                if kind == "event":
+                    session._deliver(body)
+                elif kind == "flight":
+                    session._record_flight(body)
+                elif kind == "stopped":
+                    session._mark_stopped(body)
+        except (EOFError, OSError):
+            self._on_lost()
+
+    def _on_lost(self) -> None:
+        if not self.alive:
+            return
+        self.alive = False
+        if not self.ready.done():
+            self.ready.set_exception(RuntimeError(f"STT worker {self.pid} failed to start"))
+        if not self._closing:
+            logger.error("STT worker process %s exited unexpectedly", self.pid)
+        try:
+            asyncio.get_running_loop().remove_reader(self._conn.fileno())
+        except (RuntimeError, ValueError, OSError):
+            pass
+        for session in list(self.sessions.values()):
+            session._deliver(
+                encode({"event": "stt.error", "data": {"code": "WORKER_LOST", "message": "session worker exited"}}),
+            )
+            session._mark_stopped({})
+
+    async def shutdown(self) -> None:
+        self._closing = True
+        if self.alive:
+            self.send(("shutdown", None))
+            await asyncio.to_thread(self._process.join, 5.0)
+            try:
+                asyncio.get_running_loop().remove_reader(self._conn.fileno())
+            except (ValueError, OSError):
+                pass
+            self.alive = False
+        if self._process.is_alive():
+            self._process.terminate()
+        self._conn.close()
+
+
+class SessionWorkerPool:
+    """Pool of processes, each hosting the media and recognition pipeline of many sessions."""
+
+    def __init__(self, settings: Settings, processes: Optional[int] = None) -> None:
+        self._settings = settings
+        self._size = processes or settings.stt_worker_processes or os.cpu_count() or 1
+        self._settings_payload = settings.model_dump(by_alias=True, mode="json")
+        self._workers: list[_WorkerProcess] = []
+        self._spawned = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    async def start(self) -> None:
+        while len(self._workers) < self._size:
+            self._workers.append(self._spawn())
+        # Spawned interpreters re-import the app; wait so the first sessions are not starved.
+        await asyncio.gather(*(worker.ready for worker in self._workers))
+
+    def open_session(self, session_id: str, websocket: Any, flight: Optional[FlightRecorder] = None) -> RemoteSession:
+        self._workers = [worker for worker in self._workers if worker.alive]
+        while len(self._workers) < self._size:
+            self._workers.append(self._spawn())
+
+        worker = min(self._workers, key=lambda item: len(item.sessions))
+        session = RemoteSession(session_id, worker, websocket, flight)
+        worker.attach(session)
+        return session
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "processes": [
+                {"pid": worker.pid, "alive": worker.alive, "sessions": len(worker.sessions)}
+                for worker in self._workers
+            ],
+        }
+
+    async def shutdown(self) -> None:
+        workers, self._workers = self._workers, []
+        await asyncio.gather(*(worker.shutdown() for worker in workers), return_exceptions=True)
+
+    def _spawn(self) -> _WorkerProcess:
+        self._spawned += 1
+        return _WorkerProcess(self._spawned, self._settings_payload)
+
+
+# ----- worker process side -----
+
+
+class _PipeEventSink:
+    """WebSocket stand-in handed to ``Transcriber``/``events`` inside a worker."""
+
+    def __init__(self, conn: Connection, session_id: str) -> None:
+        self._conn = conn
+        self._session_id = session_id
+        self._loop = asyncio.get_running_loop()
+
+    async def send_json(self, payload: Mapping[str, Any]) -> None:
+        await self.send_text(encode(payload))
+
+    async def send_text(self, text: str) -> None:
+        self._send(("event", self._session_id, text))
+
+    def record_flight(self, entry: Entry) -> None:
+        # Called from the recognition thread too; the pipe is only ever written from the loop.
+        self._loop.call_soon_threadsafe(self._send, ("flight", self._session_id, entry))
+
+    def _send(self, message: tuple) -> None:
+        try:
+            self._conn.send(message)
+        except (BrokenPipeError, OSError):  # pragma: no cover - parent gone
+            pass
+
+
+class _HostedSession:
+    def __init__(self, session_id: str, settings: Settings, ring_name: str, conn: Connection) -> None:
+        self.session_id = session_id
+        self.ring = SharedAudioRing.attach(ring_name)
+        self._queue: asyncio.Queue[Optional[bytes]] = asyncio.Queue(maxsize=64)
+        self._pipeline = AudioPipeline(session_id=session_id, settings=settings, output_queue=self._queue)
+        sink = _PipeEventSink(conn, session_id)
+        self._transcriber = Transcriber(
+            session_id=session_id,
+            settings=settings,
+            websocket=sink,
+            audio_queue=self._queue,
+            audio_pipeline=self._pipeline,
+            flight=FlightRecorder(session_id, sink=sink.record_flight),
+        )
+        self._started = False
+        self._lock = asyncio.Lock()
+
+    def set_room_id(self, room_id: Optional[str]) -> None:
+        self._transcriber.set_room_id(room_id)
+
+    async def drain(self) -> None:
+        async with self._lock:
+            while True:
+                record = self.ring.read()
+                if record is None:
+                    return
+                payload, sample_rate, channels = record
+                if not self._started:
+                    self._started = True
+                    await self._transcriber.start()
+                if channels == _OPUS_CHANNELS:
+                    await self._pipeline.handle_opus_packet(payload)
+                    continue
+                samples = np.frombuffer(payload, dtype=np.int16).reshape(1, -1)
+                layout = "mono" if channels == 1 else "stereo"
+                frame = av.AudioFrame.from_ndarray(samples, format="s16", layout=layout)
+                frame.sample_rate = sample_rate
+                await self._pipeline.handle_frame(frame)
+
+    async def stop(self) -> Dict[str, Any]:
+        try:
+            await self.drain()
+            try:
+                self._queue.put_nowait(None)
+            except asyncio.QueueFull:
+                pass
+            await self._transcriber.stop()
+            await asyncio.to_thread(self._pipeline.close)
+        finally:
+            self.ring.close()
+        return dict(self._pipeline.get_stats())
+
+
+class _WorkerHost:
+    def __init__(self, conn: Connection, settings: Settings) -> None:
+        self._conn = conn
+        self._settings = settings
+        self._sessions: Dict[str, _HostedSession] = {}
+        self._done = asyncio.Event()
+
+    async def serve(self) -> None:
+        loop = asyncio.get_running_loop()
+        loop.add_reader(self._conn.fileno(), self._on_command)
+        self._conn.send(("ready", None, None))
+        pump = asyncio.create_task(self._pump())
+        await self._done.wait()
+        pump.cancel()
+        await asyncio.gather(pump, return_exceptions=True)
+        await asyncio.gather(*(self._stop(session_id) for session_id in list(self._sessions)), return_exceptions=True)
+
+    async def _pump(self) -> None:
+        # One poller per process instead of one per session keeps idle wake-ups constant.
+        while True:
+            for session in list(self._sessions.values()):
+                try:
+                    await session.drain()
+                except Exception as exc:  # pragma: no cover - defensive
+                    logger.warning("Session %s audio handling failed: %s", session.session_id, exc)
+            await asyncio.sleep(_POLL_INTERVAL_SEC)
+
+    def _on_command(self) -> None:
+        try:
+            while self._conn.poll():
+                message = self._conn.recv()
+                self._dispatch(message)
+        except (EOFError, OSError):
+            self._done.set()
+
+    def _dispatch(self, message: tuple) -> None:
+        kind, session_id = message[0], message[1]
+        if kind == "start":
+            self._sessions[session_id] = _HostedSession(session_id, self._settings, message[2], self._conn)
+        elif kind == "room":
+            session = self._sessions.get(session_id)
+            if session:
+                session.set_room_id(message[2])
+        elif kind == "stop":
+            asyncio.create_task(self._stop(session_id))
+        elif kind == "shutdown":
+            self._done.set()
+
+    async def _stop(self, session_id: str) -> None:
+        session = self._sessions.pop(session_id, None)
+        stats: Dict[str, Any] = {}
+        if session:
+            try:
+                stats = await session.stop()
+            except Exception as exc:  # pragma: no cover - diagnostics
+                logger.exception("Session %s stop failed in worker: %s", session_id, exc)
+        # Let flight entries queued with call_soon_threadsafe go out before the parent detaches the session.
+        await asyncio.sleep(0)
+        try:
+            self._conn.send(("stopped", session_id, stats))
+        except (BrokenPipeError, OSError):  # pragma: no cover - parent gone
+            pass
+
+
+def run_worker(conn: Connection, settings_payload: Dict[str, Any]) -> None:
+    """Entry point of a pool process."""
+
+    settings = Settings(**settings_payload)
+    configure_logging(settings)
+    asyncio.run(_WorkerHost(conn, settings).serve())
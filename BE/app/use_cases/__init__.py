@@ -1,5 +1,5 @@
 # flake8: noqa
 
-from .stt import STTSessionResultUseCase, get_stt_use_case
+from .stt import STTBatchTranscriptionUseCase, STTSessionResultUseCase, get_stt_batch_use_case, get_stt_use_case
 
-__all__ = ["STTSessionResultUseCase", "get_stt_use_case"]
+__all__ = ["STTBatchTranscriptionUseCase", "STTSessionResultUseCase", "get_stt_batch_use_case", "get_stt_use_case"]
@@ -1,9 +1,68 @@
 """OCR Service - S3에서 PDF를 불러와 Upstage OCR 처리 후 OpenAI 파싱"""
 
+import asyncio
+import logging
+from contextlib import aclosing
+from dataclasses import dataclass
+from typing import Any, Awaitable, BinaryIO, Callable, Dict, List, Optional, Tuple, Union
+
+from app.core.config import settings
+from app.core.metrics import REGISTRY
+from app.database.mongodb import get_ocr_cache_collection
+from app.repositories import OcrCacheRepository
 from app.services.storage_service import get_storage_service
-from .services.upstage_client import get_upstage_client
+from .services.upstage_client import get_upstage_client, merge_ocr_responses
 from .services.openai_parser import get_openai_parser
-from .services.schema_loader import get_schema_loader
+from .services.schema_loader import CompiledPrompt, get_schema_loader
+from .services.chunking import ChunkPacker, merge_partials, pack_chunks, split_pages
+from .services.pdf_pages import split_pdf
+from .services.token_counter import count_tokens
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONTRACT_TYPE = "주택임대차표준계약서"
+
+# "[입력 문서]"/"[출력]" 구분자 등 프롬프트 앞부분 외에 붙는 토큰 여유분, 청크 예산 하한
+_PROMPT_OVERHEAD_TOKENS = 32
+_MIN_CHUNK_TOKENS = 512
+
+OCR_CACHE_LOOKUPS = REGISTRY.counter(
+    "ocr_cache_lookups_total",
+    "OCR result cache lookups for uploads, by result (hit, miss).",
+    ("result",),
+)
+OCR_CACHE_RAW_REUSED = REGISTRY.counter(
+    "ocr_cache_raw_reused_total",
+    "Cache misses that reused a cached Upstage response (schema or model changed) and only re-parsed.",
+)
+OCR_PARSE_CHUNKS = REGISTRY.histogram(
+    "ocr_parse_chunks",
+    "OCR text chunks per parsed document (1 = fits under OCR_PROMPT_MAX_TOKENS).",
+    buckets=(1, 2, 3, 4, 6, 8, 12, 16, 32),
+)
+OCR_SECTION_RETRIES = REGISTRY.counter(
+    "ocr_section_parse_retries_total",
+    "Section-parallel parsing: retries of a single failed section, by section.",
+    ("section",),
+)
+
+
+class SectionParseError(RuntimeError):
+    """섹션별 파싱에서 재시도 후에도 실패한 섹션이 남은 경우"""
+
+    def __init__(self, sections: List[str], cause: BaseException) -> None:
+        super().__init__(f"Failed to parse sections {', '.join(sections)}: {cause}")
+        self.sections = sections
+
+
+@dataclass
+class OcrResult:
+    """Upstage 원본 응답과 그것을 파싱한 결과 (파싱 시점의 스키마 버전/모델 포함)"""
+
+    raw: Dict[str, Any]
+    parsed: Dict[str, Any]
+    schema_version: str
+    model: str
 
 
 class OCRUsecase:
@@ -14,33 +73,312 @@ class OCRUsecase:
         self.upstage_client = get_upstage_client()
         self.openai_parser = get_openai_parser()
         self.schema_loader = get_schema_loader()
+        self.cache = OcrCacheRepository(get_ocr_cache_collection())
+
+    async def lookup(self, content_hash: str, contract_type: str = DEFAULT_CONTRACT_TYPE) -> Optional[OcrResult]:
+        """
+        같은 내용(SHA-256)의 문서가 같은 스키마 버전/모델로 이미 파싱됐으면 그 결과 반환
+
+        Args:
+            content_hash: 업로드 PDF의 SHA-256 (hex)
+            contract_type: 계약서 타입
 
-    async def process(self, s3_key: str, contract_type: str = "주택임대차표준계약서") -> dict:
+        Returns:
+            OcrResult | None: 캐시된 원본 응답 + 파싱 결과, 없으면 None
+        """
+        if not settings.ocr_cache_enabled:
+            return None
+        schema_version = self._version(self.schema_loader.compile(contract_type))
+        model = self.openai_parser.model
+        entry = await self.cache.get(self.cache.cache_key(content_hash, contract_type, schema_version, model))
+        OCR_CACHE_LOOKUPS.labels("hit" if entry is not None else "miss").inc()
+        if entry is None:
+            return None
+        return OcrResult(raw=entry.get("raw") or {}, parsed=entry["parsed"], schema_version=schema_version, model=model)
+
+    async def process(
+        self,
+        s3_key: str,
+        contract_type: str = DEFAULT_CONTRACT_TYPE,
+        document: Optional[Union[bytes, BinaryIO]] = None,
+        content_hash: Optional[str] = None,
+    ) -> dict:
         """
         S3 PDF → Upstage OCR → OpenAI 파싱 → 구조화된 데이터
 
+        Returns:
+            dict: 파싱된 계약서 데이터 (스키마에 맞는 구조). 원본 OCR 응답까지 필요하면 run() 사용
+        """
+        result = await self.run(s3_key, contract_type, document, content_hash)
+        return result.parsed
+
+    async def run(
+        self,
+        s3_key: str,
+        contract_type: str = DEFAULT_CONTRACT_TYPE,
+        document: Optional[Union[bytes, BinaryIO]] = None,
+        content_hash: Optional[str] = None,
+    ) -> OcrResult:
+        """
+        S3 PDF → Upstage OCR → OpenAI 파싱, 원본 OCR 응답과 파싱 결과를 함께 반환
+
         Args:
             s3_key: S3 객체 키 (파일 경로)
             contract_type: 계약서 타입 (기본: 주택임대차표준계약서)
+            document: 이미 손에 있는 PDF (업로드 요청의 스풀 파일/바이트). 있으면 S3 다운로드 생략
+            content_hash: PDF의 SHA-256. 있으면 결과를 ocr_cache에 저장하고, 캐시된 Upstage 응답이 있으면 OCR 생략
 
         Returns:
-            dict: 파싱된 계약서 데이터 (스키마에 맞는 구조)
+            OcrResult: 원본 Upstage 응답(텍스트/레이아웃) + 파싱 결과
         """
-        # STEP 1: S3에서 PDF 다운로드 (메모리)
-        pdf_bytes = await self.storage_service.download_bytes(s3_key)
+        # 문서당 한 번만 컴파일된 프롬프트를 확인하고 이후 단계는 이 값을 공유 (파일 stat/glob 반복 없음)
+        prompt = self.schema_loader.compile(contract_type)
+
+        # STEP 1~2: 같은 문서의 Upstage 응답이 캐시에 있으면 재사용 (스키마/모델만 바뀐 경우)
+        ocr_result = None
+        if content_hash is not None and settings.ocr_cache_enabled:
+            cached = await self.cache.find_raw(content_hash)
+            if cached is not None and cached.get("raw"):
+                ocr_result = cached["raw"]
+                OCR_CACHE_RAW_REUSED.inc()
 
-        # STEP 2: Upstage OCR API 호출 (원본 텍스트 추출)
-        ocr_result = await self.upstage_client.ocr_document(pdf_bytes)
+        if ocr_result is None:
+            # STEP 1: 손에 있는 바이트가 없을 때만 S3에서 PDF 다운로드 (메모리)
+            pdf_bytes = document
+            if pdf_bytes is None:
+                pdf_bytes = await self.storage_service.download_bytes(s3_key)
+
+            # STEP 2: 여러 페이지 PDF는 페이지 범위별로 나눠 동시에 OCR하고, 도착하는 대로 파싱 시작
+            parts = await asyncio.to_thread(split_pdf, pdf_bytes, settings.ocr_pages_per_request)
+            if len(parts) > 1:
+                return await self._run_paged(parts, prompt, contract_type, content_hash)
+
+            # STEP 2: Upstage OCR API 호출 (원본 텍스트 추출)
+            if not isinstance(pdf_bytes, (bytes, bytearray)):
+                pdf_bytes.seek(0)
+            ocr_result = await self.upstage_client.ocr_document(pdf_bytes)
+
+        # STEP 3~5: 파싱 + 캐시
+        return await self._reparse(prompt, ocr_result, contract_type, content_hash)
+
+    async def reparse(
+        self,
+        ocr_result: dict,
+        contract_type: str = DEFAULT_CONTRACT_TYPE,
+        content_hash: Optional[str] = None,
+    ) -> OcrResult:
+        """
+        저장된 Upstage 응답으로 OpenAI 파싱 단계만 다시 실행 (스키마/프롬프트 변경 시 재OCR 없이 재파싱)
+
+        Args:
+            ocr_result: Upstage OCR API 원본 응답
+            contract_type: 계약서 타입
+            content_hash: PDF의 SHA-256. 있으면 결과를 ocr_cache에 저장
+
+        Returns:
+            OcrResult: 원본 응답 + 현재 스키마 버전/모델로 파싱한 결과
+        """
+        return await self._reparse(self.schema_loader.compile(contract_type), ocr_result, contract_type, content_hash)
+
+    async def _reparse(
+        self,
+        prompt: CompiledPrompt,
+        ocr_result: dict,
+        contract_type: str,
+        content_hash: Optional[str],
+    ) -> OcrResult:
+        # 토큰 상한을 넘는 긴 문서는 페이지 단위 청크로 나눠 동시에 파싱 후 병합
+        chunks = self._chunk(prompt, ocr_result)
+
+        # STEP 3~4: 청크별 프롬프트 생성 (스키마 + OCR 텍스트 삽입) 후 OpenAI API로 구조화된 데이터 파싱
+        parsed_data = await self._map_reduce(chunks, lambda text: self._parse_chunk(prompt, text))
+
+        # STEP 5: 원본 응답 + 파싱 결과를 내용 해시 기준으로 캐시
+        return await self._finish(prompt, ocr_result, parsed_data, contract_type, content_hash)
+
+    async def _run_paged(
+        self,
+        parts: List[bytes],
+        prompt: CompiledPrompt,
+        contract_type: str,
+        content_hash: Optional[str],
+    ) -> OcrResult:
+        """
+        페이지 범위별 PDF를 동시에 OCR(최대 OCR_PAGE_CONCURRENCY)하고, 앞에서부터 연속으로 도착한 페이지 텍스트를
+        청크로 묶어 바로 파싱 시작. 응답은 페이지 순서대로 이어 붙여 단일 요청 응답과 같은 구조로 저장
+
+        Args:
+            parts: 페이지 순서의 분할 PDF 바이트
+            prompt: 이 문서에 사용할 컴파일된 프롬프트
+            contract_type: 계약서 타입
+            content_hash: PDF의 SHA-256. 있으면 결과를 ocr_cache에 저장
+
+        Returns:
+            OcrResult: 이어 붙인 원본 응답 + 파싱 결과
+        """
+        budget = self._chunk_budget(prompt)
+        packer = ChunkPacker(budget, self.openai_parser.model) if budget is not None else None
+        semaphore = asyncio.Semaphore(max(settings.ocr_chunk_concurrency, 1))
+        responses: List[Optional[dict]] = [None] * len(parts)
+        tasks: List[asyncio.Task] = []
+        next_part = 0
+
+        async def _parse(chunk: str) -> Any:
+            async with semaphore:
+                return await self._parse_chunk(prompt, chunk)
+
+        def _start(chunks: List[str]) -> None:
+            tasks.extend(asyncio.create_task(_parse(chunk)) for chunk in chunks)
+
+        try:
+            async with aclosing(self.upstage_client.ocr_parts(parts, settings.ocr_page_concurrency)) as results:
+                async for index, response in results:
+                    responses[index] = response
+                    # 순서가 이어지는 페이지만 청크에 넣음 (청크 경계가 완료 순서와 무관하게 결정적)
+                    while next_part < len(parts) and responses[next_part] is not None:
+                        if packer is not None:
+                            for text in split_pages(responses[next_part]):
+                                _start(packer.add(text))
+                        next_part += 1
+
+            ocr_result = merge_ocr_responses(responses)
+            if tasks:
+                # 토큰 상한을 넘은 문서: 남은 페이지를 마지막 청크로 파싱 후 병합
+                last = packer.flush()
+                if last is not None:
+                    _start([last])
+                parsed_data = merge_partials(list(await asyncio.gather(*tasks)))
+            else:
+                # 상한 안에 들어오는 문서는 이어 붙인 전체 텍스트로 한 번만 파싱
+                parsed_data = await self._parse_chunk(prompt, ocr_result.get("text", ""))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        OCR_PARSE_CHUNKS.observe(max(len(tasks), 1))
+        logger.info("OCR of %d page parts parsed in %d chunk(s)", len(parts), max(len(tasks), 1))
+        return await self._finish(prompt, ocr_result, parsed_data, contract_type, content_hash)
+
+    async def _finish(
+        self,
+        prompt: CompiledPrompt,
+        ocr_result: dict,
+        parsed_data: Dict[str, Any],
+        contract_type: str,
+        content_hash: Optional[str],
+    ) -> OcrResult:
+        result = OcrResult(
+            raw=ocr_result,
+            parsed=parsed_data,
+            schema_version=self._version(prompt),
+            model=self.openai_parser.model,
+        )
+        if content_hash is not None and settings.ocr_cache_enabled:
+            await self.cache.put(
+                self.cache.cache_key(content_hash, contract_type, result.schema_version, result.model),
+                content_hash=content_hash,
+                contract_type=contract_type,
+                schema_version=result.schema_version,
+                model=result.model,
+                raw=ocr_result,
+                parsed=parsed_data,
+            )
+        return result
+
+    @staticmethod
+    def _sectioned(prompt: CompiledPrompt) -> bool:
+        return settings.ocr_parse_sections and bool(prompt.sections)
+
+    def _version(self, prompt: CompiledPrompt) -> str:
+        # 섹션 병렬 파싱 결과는 단일 프롬프트 결과와 별도로 캐시/재파싱 대상 판정
+        if self._sectioned(prompt):
+            return f"{prompt.section_version}-sections"
+        return prompt.version
+
+    @staticmethod
+    def _chunk_budget(prompt: CompiledPrompt) -> Optional[int]:
+        """청크 하나에 넣을 OCR 텍스트 토큰 수 (OCR_PROMPT_MAX_TOKENS가 0이면 None — 나누지 않음)"""
+        ceiling = settings.ocr_prompt_max_tokens
+        if ceiling <= 0:
+            return None
+        return max(ceiling - prompt.prefix_tokens - _PROMPT_OVERHEAD_TOKENS, _MIN_CHUNK_TOKENS)
+
+    def _chunk(self, prompt: CompiledPrompt, ocr_result: dict) -> List[str]:
         raw_text = ocr_result.get("text", "")
+        budget = self._chunk_budget(prompt)
+        if budget is None:
+            return [raw_text]
+        model = self.openai_parser.model
+        text_tokens = count_tokens(raw_text, model)
+        if text_tokens <= budget:
+            OCR_PARSE_CHUNKS.observe(1)
+            return [raw_text]
+
+        chunks = pack_chunks(split_pages(ocr_result), budget, model)
+        OCR_PARSE_CHUNKS.observe(len(chunks))
+        logger.info(
+            "OCR text of %d tokens exceeds the %d-token prompt ceiling; parsing %d chunks",
+            text_tokens, settings.ocr_prompt_max_tokens, len(chunks),
+        )
+        return chunks
+
+    @staticmethod
+    async def _map_reduce(chunks: List[str], parse: Callable[[str], Awaitable[Any]]) -> Any:
+        if len(chunks) == 1:
+            return await parse(chunks[0])
+
+        semaphore = asyncio.Semaphore(max(settings.ocr_chunk_concurrency, 1))
+
+        async def _parse_chunk(chunk: str) -> Any:
+            async with semaphore:
+                return await parse(chunk)
+
+        # gather는 입력 순서대로 결과를 돌려주므로 병합 결과는 완료 순서와 무관
+        partials = await asyncio.gather(*(_parse_chunk(chunk) for chunk in chunks))
+        return merge_partials(list(partials))
+
+    async def _parse_chunk(self, prompt: CompiledPrompt, text: str) -> Any:
+        if self._sectioned(prompt):
+            # 섹션별 프롬프트를 동시에 보내고 전체 스키마 구조로 병합
+            return await self._parse_sections(prompt, text)
+        return await self.openai_parser.parse_with_schema(prompt.render(text))
+
+    async def _parse_sections(self, prompt: CompiledPrompt, text: str) -> Dict[str, Any]:
+        sections = list(prompt.sections)
+        results = await asyncio.gather(
+            *(self._parse_section_prompt(section, prompt.render_section(section, text)) for section in sections),
+            return_exceptions=True,
+        )
+        failed = [section for section, result in zip(sections, results) if isinstance(result, BaseException)]
+        if failed:
+            cause = next(result for result in results if isinstance(result, BaseException))
+            raise SectionParseError(failed, cause) from cause
+        return dict(zip(sections, results))
 
-        # STEP 3: 완성된 프롬프트 생성 (스키마 + OCR 텍스트 삽입)
-        full_prompt = self.schema_loader.load_prompt(contract_type, raw_text)
+    async def _parse_section_prompt(self, section: str, prompt: str) -> Any:
+        """한 섹션(청크) 파싱, 실패 시 그 요청만 재시도 (OCR_SECTION_MAX_ATTEMPTS)"""
+        attempts = max(settings.ocr_section_max_attempts, 1)
+        for attempt in range(1, attempts):
+            try:
+                return self._unwrap_section(section, await self.openai_parser.parse_with_schema(prompt))
+            except Exception as exc:
+                OCR_SECTION_RETRIES.labels(section).inc()
+                logger.warning("Parsing section %s failed (attempt %d/%d): %s", section, attempt, attempts, exc)
+                await asyncio.sleep(0.5 * 2 ** (attempt - 1))
+        return self._unwrap_section(section, await self.openai_parser.parse_with_schema(prompt))
 
-        # STEP 4: OpenAI API로 구조화된 데이터 파싱
-        parsed_data = await self.openai_parser.parse_with_schema(full_prompt)
+    @staticmethod
+    def _unwrap_section(section: str, parsed: Any) -> Any:
+        # 모델이 {"섹션명": {...}} 으로 한 번 감싸서 답하는 경우 풀어서 병합
+        if isinstance(parsed, dict) and list(parsed) == [section] and isinstance(parsed[section], dict):
+            return parsed[section]
+        return parsed
 
-        # STEP 5: 파싱된 데이터 반환
-        return parsed_data
+    def current_version(self, contract_type: str = DEFAULT_CONTRACT_TYPE) -> Tuple[str, str]:
+        """현재 (스키마 버전, 모델) — 저장된 결과가 이와 다르면 재파싱 대상"""
+        return self._version(self.schema_loader.compile(contract_type)), self.openai_parser.model
 
 
 def get_ocr_usecase() -> OCRUsecase:
@@ -0,0 +1,153 @@
+"""긴 OCR 텍스트를 토큰 상한에 맞춰 페이지 단위로 나누고, 청크별 파싱 결과를 병합"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+from .token_counter import count_tokens
+
+
+def split_pages(ocr_result: Dict[str, Any]) -> List[str]:
+    """
+    Upstage 응답의 페이지별 텍스트 (페이지 정보가 없으면 전체 텍스트 1개)
+
+    Args:
+        ocr_result: Upstage OCR API 원본 응답
+
+    Returns:
+        list[str]: 페이지 순서의 텍스트 목록
+    """
+    pages = [page.get("text") or "" for page in ocr_result.get("pages") or [] if isinstance(page, dict)]
+    pages = [text for text in pages if text.strip()]
+    if len(pages) > 1:
+        return pages
+    return [ocr_result.get("text", "")]
+
+
+class ChunkPacker:
+    """
+    페이지 텍스트를 순서대로 받아 토큰 예산을 채우는 대로 청크를 내보냄 (페이지가 도착하는 대로 파싱을 시작할 때 사용)
+
+    같은 입력이면 pack_chunks()와 같은 청크 경계가 나온다.
+    """
+
+    def __init__(self, budget_tokens: int, model: str) -> None:
+        self.budget_tokens = max(budget_tokens, 1)
+        self.model = model
+        self._current: List[str] = []
+        self._used = 0
+
+    def add(self, text: str) -> List[str]:
+        """
+        페이지(또는 섹션) 텍스트 하나 추가
+
+        Returns:
+            list[str]: 이번 추가로 예산이 차서 완성된 청크 (없으면 빈 목록)
+        """
+        completed: List[str] = []
+        for piece, tokens in _fit(text, self.budget_tokens, self.model):
+            if self._current and self._used + tokens > self.budget_tokens:
+                completed.append("\n\n".join(self._current))
+                self._current, self._used = [], 0
+            self._current.append(piece)
+            self._used += tokens
+        return completed
+
+    def flush(self) -> Optional[str]:
+        """남은 텍스트를 마지막 청크로 반환 (없으면 None)"""
+        if not self._current:
+            return None
+        chunk = "\n\n".join(self._current)
+        self._current, self._used = [], 0
+        return chunk
+
+
+def pack_chunks(units: List[str], budget_tokens: int, model: str) -> List[str]:
+    """
+    페이지(또는 섹션) 경계를 지키며 토큰 예산 안에서 순서대로 묶음. 한 페이지가 예산을 넘으면 줄 단위로 나눔
+
+    Args:
+        units: 페이지 순서의 텍스트 목록
+        budget_tokens: 청크 하나에 허용할 OCR 텍스트 토큰 수
+        model: 토큰 계산 기준 모델명
+
+    Returns:
+        list[str]: 청크 텍스트 목록 (원문 순서 유지)
+    """
+    packer = ChunkPacker(budget_tokens, model)
+    chunks: List[str] = []
+    for unit in units:
+        chunks.extend(packer.add(unit))
+    last = packer.flush()
+    if last is not None:
+        chunks.append(last)
+    return chunks or [""]
+
+
+def _fit(text: str, budget_tokens: int, model: str) -> List[tuple]:
+    tokens = count_tokens(text, model)
+    if tokens <= budget_tokens:
+        return [(text, tokens)]
+
+    pieces: List[tuple] = []
+    lines: List[str] = []
+    used = 0
+    for line in text.splitlines():
+        line_tokens = count_tokens(line, model) + 1
+        if line_tokens > budget_tokens:
+            # 줄 하나가 예산을 넘는 경우(줄바꿈 없는 OCR 결과)는 글자 수 비례로 자름
+            step = max(len(line) * budget_tokens // line_tokens, 1)
+            parts = [line[start:start + step] for start in range(0, len(line), step)]
+        else:
+            parts = [line]
+        for part in parts:
+            part_tokens = count_tokens(part, model) + 1 if part is not line else line_tokens
+            if lines and used + part_tokens > budget_tokens:
+                pieces.append(("\n".join(lines), used))
+                lines, used = [], 0
+            lines.append(part)
+            used += part_tokens
+    if lines:
+        pieces.append(("\n".join(lines), used))
+    return pieces
+
+
+def merge_partials(partials: List[Any]) -> Any:
+    """
+    청크별 파싱 결과를 하나로 병합 (청크 순서 기준으로 결정적)
+
+    - 객체: 키별로 재귀 병합
+    - 배열: 이어 붙이고 중복 항목 제거 (처음 나온 순서 유지)
+    - 불리언(체크박스): 한 청크라도 true면 true
+    - 그 외 값: 처음 나온 null/빈 문자열이 아닌 값
+    """
+    values = [value for value in partials if not _is_empty(value)]
+    if not values:
+        return partials[0] if partials else None
+
+    if all(isinstance(value, dict) for value in values):
+        merged: Dict[str, Any] = {}
+        for value in values:
+            for key in value:
+                if key not in merged:
+                    merged[key] = merge_partials([other[key] for other in values if key in other])
+        return merged
+
+    if all(isinstance(value, list) for value in values):
+        seen = set()
+        items: List[Any] = []
+        for value in values:
+            for item in value:
+                marker = json.dumps(item, ensure_ascii=False, sort_keys=True)
+                if marker not in seen:
+                    seen.add(marker)
+                    items.append(item)
+        return items
+
+    if all(isinstance(value, bool) for value in values):
+        return any(values)
+
+    return values[0]
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == {}
@@ -1,9 +1,35 @@
 """OpenAI API를 사용한 계약서 파싱 클라이언트"""
 
 import json
-from typing import Dict, Any
+import logging
+from dataclasses import dataclass
+from typing import Dict, Any, Tuple
 from openai import AsyncOpenAI
 from app.core.config import settings
+from app.core.metrics import REGISTRY, track_call
+from .token_counter import count_tokens
+
+logger = logging.getLogger(__name__)
+
+LLM_TOKENS = REGISTRY.counter(
+    "llm_tokens_total",
+    "OpenAI tokens used by OCR parsing, by model and direction (input, output).",
+    ("model", "direction"),
+)
+LLM_PROMPT_TOKENS = REGISTRY.histogram(
+    "llm_prompt_tokens",
+    "Input tokens per OCR parse call.",
+    buckets=(1000, 2000, 4000, 8000, 16000, 32000, 64000, 128000),
+)
+
+
+@dataclass
+class TokenUsage:
+    """호출 1건의 토큰 사용량 (API usage 값, 없으면 로컬 계산값)"""
+
+    input_tokens: int
+    output_tokens: int
+    estimated_input_tokens: int
 
 
 class OpenAIParser:
@@ -29,26 +55,57 @@ class OpenAIParser:
         Raises:
             Exception: OpenAI API 호출 실패 시
         """
+        result, _ = await self.parse_with_usage(full_prompt)
+        return result
+
+    async def parse_with_usage(self, full_prompt: str) -> Tuple[Dict[str, Any], TokenUsage]:
+        """
+        parse_with_schema와 같고, 호출의 입력/출력 토큰 수를 함께 반환 (메트릭 llm_tokens_total에도 기록)
+
+        Args:
+            full_prompt: 완성된 프롬프트 (스키마 + OCR 텍스트 포함)
+
+        Returns:
+            tuple: (파싱 결과, TokenUsage)
+        """
+        estimated_input = count_tokens(full_prompt, self.model)
         # OpenAI API 호출
-        response = await self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a document structure analysis and information extraction expert. Extract information according to the JSON schema provided."
-                },
-                {
-                    "role": "user",
-                    "content": full_prompt
-                }
-            ],
-            temperature=0,
-            response_format={"type": "json_object"}
-        )
+        with track_call("openai", "chat.completions"):
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are a document structure analysis and information extraction expert. Extract information according to the JSON schema provided."
+                    },
+                    {
+                        "role": "user",
+                        "content": full_prompt
+                    }
+                ],
+                temperature=0,
+                response_format={"type": "json_object"}
+            )
 
         # 응답 파싱
-        result = json.loads(response.choices[0].message.content)
-        return result
+        content = response.choices[0].message.content
+        result = json.loads(content)
+
+        # 토큰 기록: API usage 우선, 없으면 로컬 계산
+        usage = getattr(response, "usage", None)
+        token_usage = TokenUsage(
+            input_tokens=getattr(usage, "prompt_tokens", None) or estimated_input,
+            output_tokens=getattr(usage, "completion_tokens", None) or count_tokens(content, self.model),
+            estimated_input_tokens=estimated_input,
+        )
+        LLM_TOKENS.labels(self.model, "input").inc(token_usage.input_tokens)
+        LLM_TOKENS.labels(self.model, "output").inc(token_usage.output_tokens)
+        LLM_PROMPT_TOKENS.observe(token_usage.input_tokens)
+        logger.debug(
+            "OpenAI parse used %d input (%d estimated) / %d output tokens",
+            token_usage.input_tokens, token_usage.estimated_input_tokens, token_usage.output_tokens,
+        )
+        return result, token_usage
 
 
 def get_openai_parser() -> OpenAIParser:
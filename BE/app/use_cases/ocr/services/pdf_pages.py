@@ -0,0 +1,52 @@
+"""PDF를 페이지 범위별 PDF로 분할 (페이지 병렬 OCR용)"""
+
+import io
+import logging
+import threading
+from typing import BinaryIO, List, Union
+
+import pypdfium2 as pdfium
+
+logger = logging.getLogger(__name__)
+
+# PDFium은 스레드 안전하지 않으므로 프로세스 내에서 한 번에 하나의 분할만 수행
+_PDFIUM_LOCK = threading.Lock()
+
+
+def split_pdf(document: Union[bytes, BinaryIO], pages_per_part: int) -> List[bytes]:
+    """
+    PDF를 pages_per_part 페이지씩 나눈 PDF 목록 (블로킹, asyncio.to_thread로 호출)
+
+    Args:
+        document: PDF 바이트 또는 seek 가능한 파일 객체 (필요한 부분만 읽음)
+        pages_per_part: 요청 하나에 담을 페이지 수
+
+    Returns:
+        list[bytes]: 페이지 순서의 분할 PDF. 나눌 필요가 없거나(페이지 수 ≤ pages_per_part) PDF를 열 수 없으면 빈 목록
+    """
+    if pages_per_part <= 0:
+        return []
+
+    with _PDFIUM_LOCK:
+        try:
+            source = pdfium.PdfDocument(document)
+        except pdfium.PdfiumError as exc:
+            logger.warning("Could not open PDF for page splitting, sending it whole: %s", exc)
+            return []
+        try:
+            page_count = len(source)
+            if page_count <= pages_per_part:
+                return []
+            parts: List[bytes] = []
+            for start in range(0, page_count, pages_per_part):
+                part = pdfium.PdfDocument.new()
+                try:
+                    part.import_pages(source, list(range(start, min(start + pages_per_part, page_count))))
+                    buffer = io.BytesIO()
+                    part.save(buffer)
+                finally:
+                    part.close()
+                parts.append(buffer.getvalue())
+            return parts
+        finally:
+            source.close()
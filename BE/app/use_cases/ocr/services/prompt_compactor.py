@@ -0,0 +1,114 @@
+"""프롬프트에 삽입할 JSON 스키마 압축 (토큰 절감)"""
+
+import json
+from typing import Any, Dict, Optional
+
+# 모델이 추출에 쓰지 않는 주석성 키 (최상위 title은 문서 종류를 알려주므로 유지)
+_DROP_KEYS = {"description", "$comment", "examples", "title"}
+
+
+def dump_compact(schema: Any) -> str:
+    """공백 없는 JSON (indent=2 대비 스키마 문자 수 약 1/3)"""
+    return json.dumps(schema, ensure_ascii=False, separators=(",", ":"))
+
+
+def compact_schema(schema: Dict[str, Any], min_ref_chars: int = 80) -> Dict[str, Any]:
+    """
+    프롬프트용 스키마 압축: 주석성 키 제거 + 반복되는 하위 스키마를 $defs/$ref로 한 번만 기술
+
+    Args:
+        schema: 원본 JSON 스키마 (변경하지 않음)
+        min_ref_chars: 이보다 짧은 하위 스키마는 $ref로 바꿔도 이득이 없으므로 그대로 둠
+
+    Returns:
+        dict: 같은 구조를 기술하는 압축된 스키마
+    """
+    stripped = _strip(schema)
+    if "title" in schema:
+        stripped = {"title": schema["title"], **stripped}
+    defs: Dict[str, Any] = stripped.pop("$defs", {})
+
+    while True:
+        candidate = _best_duplicate(stripped, defs, min_ref_chars)
+        if candidate is None:
+            break
+        serialized, name = candidate
+        name = _unique_name(name, defs)
+        ref = {"$ref": f"#/$defs/{name}"}
+        stripped = _replace(stripped, serialized, ref)
+        defs = {key: _replace(value, serialized, ref) for key, value in defs.items()}
+        defs[name] = json.loads(serialized)
+
+    if defs:
+        stripped["$defs"] = defs
+    return stripped
+
+
+def _strip(node: Any) -> Any:
+    if isinstance(node, dict):
+        return {
+            key: (_strip_properties(value) if key == "properties" else _strip(value))
+            for key, value in node.items()
+            if key not in _DROP_KEYS
+        }
+    if isinstance(node, list):
+        return [_strip(item) for item in node]
+    return node
+
+
+def _strip_properties(properties: Any) -> Any:
+    # properties의 키는 필드명이므로 "title"/"description" 같은 이름의 필드도 유지
+    if not isinstance(properties, dict):
+        return _strip(properties)
+    return {name: _strip(value) for name, value in properties.items()}
+
+
+def _is_schema(node: Any) -> bool:
+    return isinstance(node, dict) and isinstance(node.get("type"), (str, list))
+
+
+def _best_duplicate(body: Dict[str, Any], defs: Dict[str, Any], min_chars: int) -> Optional[tuple]:
+    seen: Dict[str, list] = {}
+
+    def visit(node: Any, name: str) -> None:
+        if isinstance(node, dict):
+            if _is_schema(node):
+                serialized = dump_compact(node)
+                if len(serialized) >= min_chars:
+                    entry = seen.setdefault(serialized, [0, name])
+                    entry[0] += 1
+            for key, value in node.items():
+                visit(value, key if key not in ("properties", "items") else name)
+        elif isinstance(node, list):
+            for item in node:
+                visit(item, name)
+
+    visit(body, "root")
+    for name, value in defs.items():
+        visit(value, name)
+
+    best = None
+    best_saving = 0
+    for serialized, (count, name) in seen.items():
+        ref_chars = len(dump_compact({"$ref": f"#/$defs/{name}"}))
+        saving = (count - 1) * len(serialized) - count * ref_chars - len(name) - 4
+        if count > 1 and saving > best_saving:
+            best, best_saving = (serialized, name), saving
+    return best
+
+
+def _replace(node: Any, serialized: str, ref: Dict[str, str]) -> Any:
+    if isinstance(node, dict):
+        if _is_schema(node) and dump_compact(node) == serialized:
+            return dict(ref)
+        return {key: _replace(value, serialized, ref) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_replace(item, serialized, ref) for item in node]
+    return node
+
+
+def _unique_name(name: str, defs: Dict[str, Any]) -> str:
+    candidate, suffix = name, 2
+    while candidate in defs:
+        candidate, suffix = f"{name}{suffix}", suffix + 1
+    return candidate
@@ -1,18 +1,165 @@
 """스키마 및 프롬프트 로더"""
 
+import copy
+import hashlib
 import json
+import logging
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from .prompt_compactor import compact_schema, dump_compact
+from .token_counter import count_tokens
+
+logger = logging.getLogger(__name__)
+
+# (mtime_ns, size) — 파일이 수정되면 값이 바뀌어 다시 컴파일
+_FileStamp = Tuple[int, int]
+
+
+@dataclass(frozen=True)
+class CompiledPrompt:
+    """스키마가 삽입된 프롬프트 앞부분 + 스키마/버전 (계약서 타입별 1개, 프로세스 전역 캐시)"""
+
+    prefix: str
+    schema: Dict[str, Any]
+    version: str
+    stamps: Tuple[_FileStamp, ...]
+    prefix_tokens: int
+    # 섹션명 → 섹션 스키마만 삽입된 프롬프트 앞부분 (schema/<계약서 타입>/ 디렉토리가 있을 때, 최상위 속성 순서)
+    sections: Dict[str, str] = field(default_factory=dict)
+    # 섹션 스키마 파일까지 포함한 버전 (섹션 병렬 파싱 결과에만 사용, 단일 프롬프트 버전은 섹션 파일과 무관)
+    section_version: str = ""
+
+    def render(self, ocr_text: str) -> str:
+        """앞부분 + OCR 텍스트 = 완성된 프롬프트 (문자열 연결만 수행)"""
+        return f"{self.prefix}\n\n[입력 문서]\n{ocr_text}\n\n[출력]\n"
+
+    def render_section(self, section: str, ocr_text: str) -> str:
+        """한 섹션만 추출하는 완성된 프롬프트"""
+        return f"{self.sections[section]}\n\n[입력 문서]\n{ocr_text}\n\n[출력]\n"
 
 
 class SchemaLoader:
-    """계약서 스키마 및 프롬프트 로더"""
+    """계약서 스키마 및 프롬프트 로더
+
+    프롬프트 템플릿에 스키마 JSON을 삽입한 결과를 계약서 타입별로 한 번만 만들어 두고,
+    문서마다 파일 mtime/크기만 확인해 변경 시에만 다시 컴파일한다.
+    """
 
-    def __init__(self):
+    def __init__(self, compact: Optional[bool] = None):
         # BE/app/use_cases/ocr/ 경로
         self.ocr_base_dir = Path(__file__).parent.parent
         self.schema_dir = self.ocr_base_dir / "schema"
         self.prompt_dir = self.ocr_base_dir / "prompt"
+        self.compact = settings.ocr_prompt_compact if compact is None else compact
+        self._compiled: Dict[str, CompiledPrompt] = {}
+        self._lock = threading.Lock()
+
+    def _paths(self, contract_type: str) -> Tuple[Path, Path]:
+        return self.prompt_dir / f"{contract_type}.txt", self.schema_dir / f"{contract_type}.json"
+
+    def _section_paths(self, contract_type: str) -> List[Path]:
+        section_dir = self.schema_dir / contract_type
+        return sorted(section_dir.glob("*.json")) if section_dir.is_dir() else []
+
+    @staticmethod
+    def _stamp(path: Path, kind: str) -> _FileStamp:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"{kind} not found: {path}") from None
+        return stat.st_mtime_ns, stat.st_size
+
+    def compile(self, contract_type: str) -> CompiledPrompt:
+        """
+        계약서 타입의 컴파일된 프롬프트 반환 (캐시, 템플릿/스키마 파일이 바뀌었으면 다시 컴파일)
+
+        Args:
+            contract_type: 계약서 타입 (예: "주택임대차표준계약서")
+
+        Returns:
+            CompiledPrompt: 스키마가 삽입된 프롬프트 앞부분, 파싱된 스키마, 버전 해시
+
+        Raises:
+            FileNotFoundError: 프롬프트 또는 스키마 파일이 없는 경우
+        """
+        prompt_path, schema_path = self._paths(contract_type)
+        section_paths = self._section_paths(contract_type)
+        stamps = (self._stamp(prompt_path, "Prompt"), self._stamp(schema_path, "Schema")) + tuple(
+            self._stamp(path, "Section schema") for path in section_paths
+        )
+        compiled = self._compiled.get(contract_type)
+        if compiled is not None and compiled.stamps == stamps:
+            return compiled
+
+        with self._lock:
+            compiled = self._compiled.get(contract_type)
+            if compiled is not None and compiled.stamps == stamps:
+                return compiled
+
+            prompt_bytes = prompt_path.read_bytes()
+            schema_bytes = schema_path.read_bytes()
+            schema = json.loads(schema_bytes)
+
+            # 프롬프트 구성: 스키마 삽입 (압축 모드면 최소화된 스키마)
+            template = prompt_bytes.decode("utf-8")
+            prefix = template.replace("{JSON Schema}", self._dump_schema(schema))
+
+            # 섹션별 프롬프트: 섹션 스키마 파일(비어 있으면 전체 스키마의 해당 부분) + 추출 범위 지시
+            section_bytes = b""
+            section_schemas = {path.stem: path for path in section_paths}
+            sections: Dict[str, str] = {}
+            if section_paths:
+                for name, sub_schema in schema.get("properties", {}).items():
+                    path = section_schemas.get(name)
+                    raw = path.read_bytes() if path is not None else b""
+                    section_bytes += raw
+                    section_schema = json.loads(raw) if raw.strip() else {"title": f"{contract_type}_{name}", **sub_schema}
+                    sections[name] = (
+                        template.replace("{JSON Schema}", self._dump_schema(section_schema))
+                        + f'\n\n[추출 범위]\n문서 전체 중 "{name}" 섹션에 해당하는 내용만 위 스키마에 맞춰 추출하세요.'
+                    )
+
+            # 압축 여부도 버전에 포함 (전환 시 OCR 캐시/재파싱 대상이 자동으로 갈림)
+            version_source = prompt_bytes + schema_bytes + (b"compact" if self.compact else b"")
+            compiled = CompiledPrompt(
+                prefix=prefix,
+                schema=schema,
+                version=hashlib.sha256(version_source).hexdigest()[:12],
+                stamps=stamps,
+                prefix_tokens=count_tokens(prefix, settings.openai_model),
+                sections=sections,
+                section_version=hashlib.sha256(version_source + section_bytes).hexdigest()[:12] if sections else "",
+            )
+            self._compiled[contract_type] = compiled
+            logger.info(
+                "Compiled OCR prompt for %s (schema %s, %d tokens before document text)",
+                contract_type, compiled.version, compiled.prefix_tokens,
+            )
+            return compiled
+
+    def _dump_schema(self, schema: Dict[str, Any]) -> str:
+        if self.compact:
+            return dump_compact(compact_schema(schema))
+        return json.dumps(schema, ensure_ascii=False, indent=2)
+
+    def warm(self, contract_types: Optional[List[str]] = None) -> List[str]:
+        """
+        기동 시 프롬프트 미리 컴파일 (기본: 프롬프트와 스키마가 모두 있는 계약서 타입 전부)
+
+        Returns:
+            list[str]: 컴파일된 계약서 타입
+        """
+        if contract_types is None:
+            contract_types = sorted(
+                path.stem for path in self.prompt_dir.glob("*.txt") if (self.schema_dir / f"{path.stem}.json").exists()
+            )
+        for contract_type in contract_types:
+            self.compile(contract_type)
+        return contract_types
 
     def load_schema(self, contract_type: str) -> Dict[str, Any]:
         """
@@ -22,18 +169,24 @@ class SchemaLoader:
             contract_type: 계약서 타입 (예: "주택임대차표준계약서")
 
         Returns:
-            dict: JSON Schema
+            dict: JSON Schema (캐시 사본)
 
         Raises:
             FileNotFoundError: 스키마 파일이 없는 경우
         """
-        schema_path = self.schema_dir / f"{contract_type}.json"
+        return copy.deepcopy(self.compile(contract_type).schema)
 
-        if not schema_path.exists():
-            raise FileNotFoundError(f"Schema not found: {schema_path}")
+    def schema_version(self, contract_type: str) -> str:
+        """
+        프롬프트 템플릿 + 스키마 파일 내용의 해시 (OCR 캐시 키에 사용, 파일 수정 시 자동 변경)
 
-        with open(schema_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        Args:
+            contract_type: 계약서 타입
+
+        Returns:
+            str: SHA-256 앞 12자리
+        """
+        return self.compile(contract_type).version
 
     def load_prompt(self, contract_type: str, ocr_text: str) -> str:
         """
@@ -49,36 +202,39 @@ class SchemaLoader:
         Raises:
             FileNotFoundError: 프롬프트 파일이 없는 경우
         """
-        # 프롬프트 템플릿 로드
-        prompt_path = self.prompt_dir / f"{contract_type}.txt"
+        # 컴파일된 앞부분 + OCR 텍스트
+        return self.compile(contract_type).render(ocr_text)
 
-        if not prompt_path.exists():
-            raise FileNotFoundError(f"Prompt not found: {prompt_path}")
+    def section_names(self, contract_type: str) -> List[str]:
+        """섹션별 스키마가 있는 계약서 타입이면 섹션명 목록(최상위 속성 순서), 없으면 빈 목록"""
+        return list(self.compile(contract_type).sections)
 
-        with open(prompt_path, "r", encoding="utf-8") as f:
-            prompt_template = f.read()
+    def load_section_prompt(self, contract_type: str, section: str, ocr_text: str) -> str:
+        """
+        한 섹션만 추출하는 프롬프트 (섹션 스키마 + 추출 범위 지시 + OCR 텍스트)
 
-        # 스키마 로드
-        schema = self.load_schema(contract_type)
+        Args:
+            contract_type: 계약서 타입
+            section: 섹션명 (section_names() 중 하나)
+            ocr_text: OCR로 추출된 원본 텍스트
 
-        # 프롬프트 구성: 스키마 삽입
-        schema_json = json.dumps(schema, ensure_ascii=False, indent=2)
-        full_prompt = prompt_template.replace(
-            "{JSON Schema}",
-            schema_json
-        )
+        Returns:
+            str: 완성된 섹션 프롬프트
+        """
+        return self.compile(contract_type).render_section(section, ocr_text)
 
-        # OCR 텍스트 추가
-        full_prompt += f"\n\n[입력 문서]\n{ocr_text}\n\n[출력]\n"
 
-        return full_prompt
+_schema_loader: Optional[SchemaLoader] = None
 
 
 def get_schema_loader() -> SchemaLoader:
     """
-    SchemaLoader 인스턴스를 생성하는 Factory 함수
+    SchemaLoader 싱글톤 반환 (컴파일된 프롬프트 캐시를 프로세스 전체가 공유)
 
     Returns:
         SchemaLoader: 스키마 로더 인스턴스
     """
-    return SchemaLoader()
+    global _schema_loader
+    if _schema_loader is None:
+        _schema_loader = SchemaLoader()
+    return _schema_loader
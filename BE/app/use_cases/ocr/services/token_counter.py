@@ -0,0 +1,40 @@
+"""로컬 토큰 수 계산 (OpenAI 호출 전 프롬프트 크기 측정/기록용)"""
+
+import logging
+import math
+from functools import lru_cache
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=8)
+def _encoding(model: str) -> Optional[Any]:
+    try:
+        import tiktoken
+    except ImportError:
+        logger.warning("tiktoken is not installed; token counts are estimated from character counts")
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # 아직 tiktoken에 매핑이 없는 모델은 최신 GPT-4o 계열 인코딩으로 계산
+        return tiktoken.get_encoding("o200k_base")
+
+
+def count_tokens(text: str, model: str) -> int:
+    """
+    모델 토크나이저 기준 토큰 수
+
+    Args:
+        text: 프롬프트 또는 응답 텍스트
+        model: OpenAI 모델명 (인코딩 선택용)
+
+    Returns:
+        int: 토큰 수 (tiktoken이 없으면 ASCII 4자당 1토큰, 그 외 문자(한글 등) 1자당 1토큰으로 추정)
+    """
+    encoding = _encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    ascii_chars = sum(1 for char in text if ord(char) < 128)
+    return math.ceil(ascii_chars / 4) + (len(text) - ascii_chars)
@@ -1,8 +1,12 @@
 """Upstage AI API 클라이언트"""
 
+import asyncio
 from io import BytesIO
+from typing import Any, AsyncIterator, BinaryIO, Dict, List, Optional, Tuple, Union
+
 import httpx
 from app.core.config import settings
+from app.core.metrics import track_call
 
 
 class UpstageClient:
@@ -12,12 +16,12 @@ class UpstageClient:
         self.api_url = settings.UPSTAGE_API_URL
         self.api_key = settings.UPSTAGE_API_KEY
 
-    async def ocr_document(self, pdf_bytes: bytes) -> dict:
+    async def ocr_document(self, pdf_bytes: Union[bytes, BinaryIO]) -> dict:
         """
         PDF 문서를 OCR 처리
 
         Args:
-            pdf_bytes: PDF 파일의 바이너리 데이터 (메모리)
+            pdf_bytes: PDF 파일의 바이너리 데이터 (메모리) 또는 파일 객체(청크 단위로 전송)
 
         Returns:
             dict: Upstage OCR API 원본 응답
@@ -33,12 +37,48 @@ class UpstageClient:
             httpx.RequestError: 네트워크 에러 발생 시
         """
         async with httpx.AsyncClient(timeout=60.0) as client:
-            files = {
-                "document": ("document.pdf", BytesIO(pdf_bytes), "application/pdf")
-            }
-            data = {"model": "ocr"}
-            headers = {"Authorization": f"Bearer {self.api_key}"}
+            return await self._post(client, pdf_bytes)
+
+    async def ocr_parts(self, parts: List[bytes], concurrency: int) -> AsyncIterator[Tuple[int, dict]]:
+        """
+        분할된 PDF(페이지 범위)들을 동시에 OCR 처리 (최대 concurrency개, 연결 풀 공유)
+
+        Args:
+            parts: 페이지 순서의 분할 PDF 바이트
+            concurrency: 동시 요청 수 상한
+
+        Yields:
+            tuple: (parts 인덱스, Upstage 원본 응답) — 완료 순서대로
+
+        Raises:
+            httpx.HTTPStatusError: API 호출 실패 시 (남은 요청은 취소)
+        """
+        semaphore = asyncio.Semaphore(max(concurrency, 1))
+        limits = httpx.Limits(max_connections=max(concurrency, 1))
+        async with httpx.AsyncClient(timeout=60.0, limits=limits) as client:
+
+            async def _ocr_part(index: int, data: bytes) -> Tuple[int, dict]:
+                async with semaphore:
+                    return index, await self._post(client, data)
 
+            tasks = [asyncio.create_task(_ocr_part(index, data)) for index, data in enumerate(parts)]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    yield await next_done
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _post(self, client: httpx.AsyncClient, pdf_bytes: Union[bytes, BinaryIO]) -> dict:
+        document = BytesIO(pdf_bytes) if isinstance(pdf_bytes, (bytes, bytearray)) else pdf_bytes
+        files = {
+            "document": ("document.pdf", document, "application/pdf")
+        }
+        data = {"model": "ocr"}
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+
+        with track_call("upstage", "ocr"):
             response = await client.post(
                 self.api_url,
                 headers=headers,
@@ -47,7 +87,52 @@ class UpstageClient:
             )
             response.raise_for_status()
 
-            return response.json()
+        return response.json()
+
+
+def merge_ocr_responses(responses: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    페이지 범위별 Upstage 응답을 문서 전체 응답 형태로 이어 붙임 (페이지 번호는 문서 기준으로 보정)
+
+    Args:
+        responses: 페이지 순서의 부분 응답
+
+    Returns:
+        dict: 단일 요청 응답과 같은 구조 (text, pages, metadata.pages, numBilledPages, confidence)
+    """
+    merged: Dict[str, Any] = {key: value for key, value in responses[0].items() if key not in ("pages", "metadata")}
+    pages: List[Dict[str, Any]] = []
+    metadata_pages: List[Dict[str, Any]] = []
+    confidences: List[Tuple[float, int]] = []
+    offset = 0
+
+    for response in responses:
+        part_pages = response.get("pages") or []
+        for page in part_pages:
+            page = dict(page)
+            if isinstance(page.get("id"), int):
+                page["id"] += offset
+            pages.append(page)
+        for page in (response.get("metadata") or {}).get("pages") or []:
+            page = dict(page)
+            if isinstance(page.get("page"), int):
+                page["page"] += offset
+            metadata_pages.append(page)
+        page_count = len(part_pages) or 1
+        confidence: Optional[float] = response.get("confidence")
+        if confidence is not None:
+            confidences.append((confidence, page_count))
+        offset += page_count
+
+    merged["text"] = "\n".join(response.get("text", "") for response in responses)
+    merged["pages"] = pages
+    merged["metadata"] = {**(responses[0].get("metadata") or {}), "pages": metadata_pages}
+    merged["numBilledPages"] = sum(response.get("numBilledPages", 0) for response in responses)
+    if confidences:
+        merged["confidence"] = sum(value * weight for value, weight in confidences) / sum(
+            weight for _, weight in confidences
+        )
+    return merged
 
 
 def get_upstage_client() -> UpstageClient:
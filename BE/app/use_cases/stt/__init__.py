@@ -1,3 +1,10 @@
+from .batch_usecase import BatchTranscriptionJob, STTBatchTranscriptionUseCase, get_stt_batch_use_case
 from .stt_usecase import STTSessionResultUseCase, get_stt_use_case
 
-__all__ = ["STTSessionResultUseCase", "get_stt_use_case"]
+__all__ = [
+    "BatchTranscriptionJob",
+    "STTBatchTranscriptionUseCase",
+    "STTSessionResultUseCase",
+    "get_stt_batch_use_case",
+    "get_stt_use_case",
+]
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+from uuid import uuid4
+
+from app.core.config import Settings, get_settings
+from app.database.mongodb import get_stt_batch_jobs_collection
+from app.jobs.queue import JobQueue, get_job_queue
+from app.repositories import STTBatchJobRepository
+from app.sessions.batch import BatchTranscriber
+from app.use_cases.stt.stt_usecase import STTSessionResultUseCase, get_stt_use_case
+
+logger = logging.getLogger(__name__)
+
+STT_BATCH_JOB = "stt.batch"
+
+
+@dataclass
+class BatchTranscriptionJob:
+    job_id: str
+    room_id: str
+    source: str
+    status: str = "queued"  # queued | running | completed | failed
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    audio_seconds: float = 0.0
+    elapsed_seconds: float = 0.0
+    segments: int = 0
+    qa_pairs: int = 0
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_document(cls, document: Dict[str, Any]) -> "BatchTranscriptionJob":
+        names = {item.name for item in fields(cls)}
+        return cls(**{key: value for key, value in document.items() if key in names})
+
+
+class STTBatchTranscriptionUseCase:
+    """Runs offline re-transcription of a recording and persists it like a live session.
+
+    Job records are stored in Mongo, so status is visible from every API
+    worker and survives restarts. With ``JOBS_ENABLED`` the work runs on the
+    job queue (``stt.batch``; the worker must share ``STORAGE_DIR``, where
+    recordings and uploads are kept). Otherwise it runs as a task in this
+    process, and :meth:`shutdown` waits for those tasks before exit.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        result_use_case: STTSessionResultUseCase,
+        repository: STTBatchJobRepository,
+        jobs: Optional[JobQueue] = None,
+        transcriber: Optional[BatchTranscriber] = None,
+    ) -> None:
+        self._settings = settings
+        self._result_use_case = result_use_case
+        self._repository = repository
+        self._jobs = jobs
+        self._transcriber = transcriber or BatchTranscriber(settings)
+        self._tasks: Set[asyncio.Task[None]] = set()
+
+    async def submit(self, room_id: str, path: Path, delete_after: bool = False) -> BatchTranscriptionJob:
+        if not room_id:
+            raise ValueError("room_id is required to persist STT results")
+
+        job = BatchTranscriptionJob(job_id=uuid4().hex, room_id=room_id, source=path.name)
+        try:
+            await self._repository.create(job.to_dict())
+            if self._jobs is not None:
+                payload = {"job_id": job.job_id, "path": str(path), "delete_after": delete_after}
+                await self._jobs.enqueue(STT_BATCH_JOB, payload)
+                return job
+        except Exception:
+            if delete_after:
+                path.unlink(missing_ok=True)
+            raise
+
+        task = asyncio.create_task(self._run_local(job.job_id, path, delete_after))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def get_job(self, job_id: str) -> Optional[BatchTranscriptionJob]:
+        document = await self._repository.get(job_id)
+        return BatchTranscriptionJob.from_document(document) if document is not None else None
+
+    async def run(self, job_id: str, path: Path, delete_after: bool = False) -> None:
+        """Transcribe and persist one job. Raises on failure; the caller retries or calls :meth:`mark_failed`."""
+        job = await self.get_job(job_id)
+        if job is None:
+            raise LookupError(f"Batch transcription job {job_id} not found")
+
+        await self._repository.update(job_id, {"status": "running", "error": None})
+        result = await self._transcriber.transcribe(path)
+        await self._result_use_case.persist_session_store(
+            job.room_id,
+            result.qa_pairs,
+            result.transcript_segments(),
+        )
+        await self._repository.finish(
+            job_id,
+            {
+                "status": "completed",
+                "audio_seconds": round(result.audio_seconds, 2),
+                "elapsed_seconds": round(result.elapsed_seconds, 2),
+                "segments": len(result.segments),
+                "qa_pairs": len(result.qa_pairs),
+            },
+        )
+        if delete_after:
+            path.unlink(missing_ok=True)
+
+    async def mark_failed(self, job_id: str, error: str, path: Path, delete_after: bool = False) -> None:
+        await self._repository.finish(job_id, {"status": "failed", "error": error})
+        if delete_after:
+            path.unlink(missing_ok=True)
+
+    async def _run_local(self, job_id: str, path: Path, delete_after: bool) -> None:
+        try:
+            await self.run(job_id, path, delete_after)
+        except asyncio.CancelledError:
+            await self.mark_failed(job_id, "interrupted by shutdown", path, delete_after)
+            raise
+        except Exception as exc:
+            logger.exception("Batch transcription job %s failed: %s", job_id, exc)
+            await self.mark_failed(job_id, str(exc)[:500], path, delete_after)
+
+    async def shutdown(self) -> None:
+        """Wait up to ``STT_BATCH_SHUTDOWN_GRACE_SEC`` for in-process jobs, then cancel and mark the rest failed."""
+        if not self._tasks:
+            return
+        tasks = list(self._tasks)
+        logger.info("Waiting for %d batch transcription job(s) to finish", len(tasks))
+        _, pending = await asyncio.wait(tasks, timeout=self._settings.stt_batch_shutdown_grace_sec)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+_batch_use_case: Optional[STTBatchTranscriptionUseCase] = None
+
+
+def get_stt_batch_use_case() -> STTBatchTranscriptionUseCase:
+    global _batch_use_case
+    if _batch_use_case is None:
+        settings = get_settings()
+        _batch_use_case = STTBatchTranscriptionUseCase(
+            settings,
+            get_stt_use_case(),
+            STTBatchJobRepository(get_stt_batch_jobs_collection(), settings.stt_batch_job_retention_sec),
+            get_job_queue() if settings.jobs_enabled else None,
+        )
+    return _batch_use_case
+
+
+async def shutdown_stt_batch_use_case() -> None:
+    if _batch_use_case is not None:
+        await _batch_use_case.shutdown()
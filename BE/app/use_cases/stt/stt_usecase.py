@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from typing import Iterable
+from typing import Iterable, Optional
 
 from app.models import QAPair, TranscriptSegment
 from app.services.stt_service import STTService, get_stt_service
+from app.sessions.session_store import QAPairStore, SegmentStore
 
 
 class STTSessionResultUseCase:
@@ -23,6 +24,20 @@ class STTSessionResultUseCase:
 
         await self._service.save_result(room_id, qa_pairs, transcript_segments)
 
+    async def persist_session_store(
+        self,
+        room_id: str,
+        qa_pairs: QAPairStore,
+        segments: SegmentStore,
+        session_id: Optional[str] = None,
+    ) -> None:
+        if not room_id:
+            raise ValueError("room_id is required to persist STT results")
+
+        await self._service.save_documents(
+            room_id, qa_pairs.to_documents(), segments.to_documents(), session_id=session_id
+        )
+
 
 def get_stt_use_case() -> STTSessionResultUseCase:
     return STTSessionResultUseCase(get_stt_service())
@@ -20,6 +20,10 @@ class AnalysisWriter:
         wave_file.setframerate(self._sample_rate)
         self._wave_file = wave_file
 
+    @property
+    def is_open(self) -> bool:
+        return self._wave_file is not None
+
     def append(self, chunk: bytes) -> None:
         if self._wave_file is None:
             return
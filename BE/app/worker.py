@@ -0,0 +1,53 @@
+"""Background job worker: ``python -m app.worker [--kinds ocr.process,llm.report]``.
+
+Runs separately from the API (``JOBS_ENABLED=true`` on both), so OCR and
+report throughput scale with the number of worker containers.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import signal
+
+from app.core.config import get_settings
+from app.core.logging import configure_logging, shutdown_logging
+from app.jobs import JobWorker, get_job_queue
+from app.jobs.handlers import HANDLERS
+from app.use_cases.ocr.services.schema_loader import get_schema_loader
+
+logger = logging.getLogger(__name__)
+
+
+async def _serve(kinds: list[str]) -> None:
+    settings = get_settings()
+    queue = get_job_queue()
+    await queue.ensure_indexes()
+    get_schema_loader().warm()
+    worker = JobWorker(queue, {kind: HANDLERS[kind] for kind in kinds}, settings)
+
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, worker.stop)
+    await worker.run()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--kinds", default=",".join(HANDLERS), help="Comma-separated job kinds to process")
+    args = parser.parse_args()
+    kinds = [kind.strip() for kind in args.kinds.split(",") if kind.strip()]
+    unknown = sorted(set(kinds) - set(HANDLERS))
+    if unknown:
+        parser.error(f"unknown job kinds: {', '.join(unknown)}")
+
+    configure_logging(get_settings())
+    try:
+        asyncio.run(_serve(kinds))
+    finally:
+        shutdown_logging()
+
+
+if __name__ == "__main__":
+    main()
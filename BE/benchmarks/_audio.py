@@ -0,0 +1,39 @@
+"""Shared input helpers for the benchmarks."""
+
+from __future__ import annotations
+
+import math
+import wave
+from pathlib import Path
+
+import av
+import numpy as np
+from av.audio.resampler import AudioResampler
+
+RTC_RATE = 48000
+
+
+def load_samples(wav_path: Path | None, seconds: float) -> np.ndarray:
+    """Mono s16 samples at 48 kHz from ``wav_path``, or a synthetic speech-like signal."""
+
+    if wav_path is None:
+        t = np.arange(int(seconds * RTC_RATE)) / RTC_RATE
+        envelope = 0.5 + 0.5 * np.sin(2 * math.pi * 3 * t)
+        tone = np.sin(2 * math.pi * 220 * t) + 0.3 * np.sin(2 * math.pi * 660 * t)
+        noise = np.random.default_rng(0).normal(0, 0.05, t.shape)
+        return ((tone * envelope + noise) * 8000).astype(np.int16)
+
+    with wave.open(str(wav_path), "rb") as source:
+        if source.getsampwidth() != 2:
+            raise SystemExit("Only 16-bit PCM WAV input is supported")
+        raw = np.frombuffer(source.readframes(source.getnframes()), dtype=np.int16)
+        channels = source.getnchannels()
+        rate = source.getframerate()
+    if channels > 1:
+        raw = raw.reshape(-1, channels)[:, 0].copy()
+    if rate != RTC_RATE:
+        frame = av.AudioFrame.from_ndarray(raw.reshape(1, -1), format="s16", layout="mono")
+        frame.sample_rate = rate
+        resampler = AudioResampler(format="s16", layout="mono", rate=RTC_RATE)
+        raw = np.concatenate([out.to_ndarray().reshape(-1) for out in resampler.resample(frame)])
+    return raw[: int(seconds * RTC_RATE)]
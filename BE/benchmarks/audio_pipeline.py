@@ -0,0 +1,204 @@
+"""How many concurrent sessions ``AudioPipeline`` sustains on one event loop.
+
+Usage (from ``BE/``)::
+
+    python -m benchmarks.audio_pipeline [--wav a.wav --wav b.wav] [--sessions 1,4,16,64]
+                                        [--seconds 20] [--paced] [--trace-allocs]
+
+Input WAVs (or a synthetic signal) are turned into 20 ms 48 kHz stereo s16
+``av.AudioFrame``s, which is what aiortc's Opus decoder hands to
+``STTSession``. For every session count N, N pipelines (resample, noise
+reduction hook, queueing, WAV writing) run concurrently on one loop, each
+drained by a no-op consumer in place of the Google request generator.
+
+By default frames are pushed as fast as the loop allows, which measures
+capacity. ``--paced`` releases frames on the 20 ms WebRTC cadence instead,
+which shows latency at a given load; ``realtime x`` below 1.0 means the
+node could not keep up with N live sessions.
+
+Reported per run:
+
+* frames/s and ``realtime x`` (audio seconds processed per wall second / N)
+* CPU ms per audio second per session (``time.process_time``)
+* p50 / p99 ``handle_frame`` latency
+* gen-0 GC collections per 1k frames, a cheap proxy for allocation churn
+* with ``--trace-allocs``: tracemalloc peak and retained blocks per frame in a
+  separate pass (tracing slows everything down, so it never skews timing)
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+import av
+import numpy as np
+
+from app.core.config import Settings
+from app.sessions.audio_pipeline import AudioPipeline
+from benchmarks._audio import RTC_RATE, load_samples
+
+FRAME_SAMPLES = 960  # 20 ms @ 48 kHz
+FRAME_SECONDS = FRAME_SAMPLES / RTC_RATE
+
+
+@dataclass
+class RunResult:
+    sessions: int
+    frames: int = 0
+    wall: float = 0.0
+    cpu: float = 0.0
+    gen0: int = 0
+    latencies_ns: List[int] = field(default_factory=list)
+
+    @property
+    def audio_seconds(self) -> float:
+        return self.frames * FRAME_SECONDS
+
+    def percentile_us(self, q: float) -> float:
+        if not self.latencies_ns:
+            return 0.0
+        return float(np.percentile(np.asarray(self.latencies_ns), q)) / 1000
+
+
+def _build_frames(wavs: List[Path], seconds: float) -> List[List[av.AudioFrame]]:
+    """One frame list per input; sessions are assigned round-robin."""
+
+    sources = wavs or [None]
+    frame_sets: List[List[av.AudioFrame]] = []
+    for wav in sources:
+        samples = load_samples(wav, seconds)
+        frames: List[av.AudioFrame] = []
+        for offset in range(0, len(samples) - FRAME_SAMPLES + 1, FRAME_SAMPLES):
+            mono = samples[offset : offset + FRAME_SAMPLES]
+            stereo = np.repeat(mono, 2).reshape(1, -1)
+            frame = av.AudioFrame.from_ndarray(stereo, format="s16", layout="stereo")
+            frame.sample_rate = RTC_RATE
+            frames.append(frame)
+        frame_sets.append(frames)
+    return frame_sets
+
+
+async def _drain(queue: asyncio.Queue) -> None:
+    while True:
+        await queue.get()
+
+
+async def _drive(
+    pipeline: AudioPipeline,
+    frames: List[av.AudioFrame],
+    latencies: Optional[List[int]],
+    paced: bool,
+) -> int:
+    started = time.perf_counter()
+    for index, frame in enumerate(frames):
+        if paced:
+            delay = started + index * FRAME_SECONDS - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        t0 = time.perf_counter_ns()
+        await pipeline.handle_frame(frame)
+        if latencies is not None:
+            latencies.append(time.perf_counter_ns() - t0)
+        if not paced and index % 8 == 7:
+            # Give other sessions and the consumers a turn, as the real track.recv() await would.
+            await asyncio.sleep(0)
+    return len(frames)
+
+
+async def _run(settings: Settings, frame_sets: List[List[av.AudioFrame]], sessions: int, paced: bool,
+               measure: bool = True) -> RunResult:
+    queues = [asyncio.Queue(maxsize=64) for _ in range(sessions)]
+    pipelines = [AudioPipeline(f"bench-{sessions}-{index}", settings, queues[index]) for index in range(sessions)]
+    consumers = [asyncio.create_task(_drain(queue)) for queue in queues]
+    result = RunResult(sessions=sessions)
+
+    gc.collect()
+    gen0_before = gc.get_stats()[0]["collections"]
+    cpu_before = time.process_time()
+    wall_before = time.perf_counter()
+    counts = await asyncio.gather(
+        *(
+            _drive(pipeline, frame_sets[index % len(frame_sets)], result.latencies_ns if measure else None, paced)
+            for index, pipeline in enumerate(pipelines)
+        ),
+    )
+    result.wall = time.perf_counter() - wall_before
+    result.cpu = time.process_time() - cpu_before
+    result.gen0 = gc.get_stats()[0]["collections"] - gen0_before
+    result.frames = sum(counts)
+
+    for consumer in consumers:
+        consumer.cancel()
+    await asyncio.gather(*consumers, return_exceptions=True)
+    for pipeline in pipelines:
+        pipeline.close()
+    return result
+
+
+async def _trace_allocations(settings: Settings, frame_sets: List[List[av.AudioFrame]], sessions: int) -> str:
+    tracemalloc.start(1)
+    baseline = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    result = await _run(settings, frame_sets, sessions, paced=False, measure=False)
+    _, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    allocated = sum(stat.count_diff for stat in snapshot.compare_to(baseline, "lineno") if stat.count_diff > 0)
+    return (
+        f"  tracemalloc: peak {peak / 1024 / sessions:.0f} KiB/session, "
+        f"{allocated / max(result.frames, 1):.2f} retained blocks/frame"
+    )
+
+
+async def _main(args: argparse.Namespace) -> None:
+    frame_sets = _build_frames(args.wav, args.seconds)
+    session_counts = [int(item) for item in args.sessions.split(",") if item]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp)
+        settings = Settings(
+            STORAGE_DIR=base / "recordings",
+            ANALYSIS_DIR=base / "analysis",
+            LOGS_DIR=base / "logs",
+        )
+
+        mode = "paced (20 ms cadence)" if args.paced else "flat out"
+        print(f"inputs: {len(frame_sets)}, {len(frame_sets[0])} frames per session, {mode}")
+        print(
+            f"{'sessions':>8}{'frames/s':>12}{'realtime x':>12}{'cpu ms/s/sess':>15}"
+            f"{'p50 us':>10}{'p99 us':>10}{'gc0/1k fr':>11}"
+        )
+        for sessions in session_counts:
+            result = await _run(settings, frame_sets, sessions, args.paced)
+            realtime = result.audio_seconds / result.wall / sessions if result.wall else 0.0
+            cpu_per_audio = result.cpu / result.audio_seconds * 1000 if result.audio_seconds else 0.0
+            print(
+                f"{sessions:>8}{result.frames / result.wall:>12.0f}{realtime:>12.1f}{cpu_per_audio:>15.3f}"
+                f"{result.percentile_us(50):>10.0f}{result.percentile_us(99):>10.0f}"
+                f"{result.gen0 * 1000 / max(result.frames, 1):>11.2f}"
+            )
+            if args.trace_allocs:
+                print(await _trace_allocations(settings, frame_sets, sessions))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--wav", type=Path, action="append", default=[], help="16-bit PCM WAV input (repeatable)")
+    parser.add_argument("--sessions", default="1,4,16,64", help="comma-separated concurrent session counts")
+    parser.add_argument("--seconds", type=float, default=20.0, help="audio per session")
+    parser.add_argument("--paced", action="store_true", help="release frames every 20 ms like a live track")
+    parser.add_argument("--trace-allocs", action="store_true", help="add a tracemalloc pass per session count")
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
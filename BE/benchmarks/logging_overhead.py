@@ -0,0 +1,117 @@
+"""Caller-side cost of a per-frame log point, with debug logging off and on.
+
+Usage (from ``BE/``)::
+
+    python -m benchmarks.logging_overhead [--calls 200000] [--every 50]
+
+A 20 ms audio loop hits its log point 50 times a second per session, on the
+event loop. Each scenario below is timed with ``time.thread_time`` on the
+calling thread only, i.e. what the loop pays; work moved to a
+``QueueListener`` thread is excluded.
+
+* ``plain``: ``logger.debug(fmt, *args)`` on every call (previous code)
+* ``sampled``: guarded by ``SampledLog.due()`` (first 3 calls, then every N-th)
+* handler ``sync``: ``FileHandler`` on the logger, formatting and writes inline
+* handler ``queue``: ``InProcessQueueHandler`` -> ``QueueListener`` -> ``FileHandler``
+* ``append_debug_log``: the old open-append-close per message versus the
+  queued file logger that replaced it
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import logging.handlers
+import queue
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+from app.core.logging import InProcessQueueHandler, SampledLog, SessionContextFilter, file_logger, shutdown_logging
+
+
+def _legacy_append(base_dir: Path, message: str, filename: str = "stt_debug.log") -> None:
+    base_dir.mkdir(parents=True, exist_ok=True)
+    with (base_dir / filename).open("a", encoding="utf-8") as fp:
+        fp.write(f"[{datetime.utcnow().isoformat()}] {message}\n")
+
+
+def _logger(path: Optional[Path], mode: str) -> tuple[logging.Logger, Callable[[], None]]:
+    logger = logging.getLogger(f"bench.hot.{mode}.{time.monotonic_ns()}")
+    logger.propagate = False
+    if path is None:
+        logger.setLevel(logging.INFO)
+        return logger, lambda: None
+
+    logger.setLevel(logging.DEBUG)
+    file_handler = logging.FileHandler(path, encoding="utf-8")
+    file_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(session_id)s] %(name)s: %(message)s"))
+    if mode == "sync":
+        file_handler.addFilter(SessionContextFilter())
+        logger.addHandler(file_handler)
+        return logger, file_handler.close
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, file_handler)
+    listener.start()
+    queue_handler = InProcessQueueHandler(log_queue)
+    queue_handler.addFilter(SessionContextFilter())
+    logger.addHandler(queue_handler)
+
+    def _stop() -> None:
+        listener.stop()
+        file_handler.close()
+
+    return logger, _stop
+
+
+def _time_calls(calls: int, body: Callable[[int], None]) -> float:
+    started = time.thread_time_ns()
+    for index in range(calls):
+        body(index)
+    return (time.thread_time_ns() - started) / calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200_000)
+    parser.add_argument("--every", type=int, default=50, help="SampledLog sampling interval")
+    args = parser.parse_args()
+    session_id = "0123456789abcdef0123456789abcdef"
+
+    print(f"{'scenario':<34}{'ns/call':>10}{'lines':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp)
+        for debug, mode in ((False, "-"), (True, "sync"), (True, "queue")):
+            for style in ("plain", "sampled"):
+                path = base / f"{mode}-{style}.log" if debug else None
+                logger, stop = _logger(path, mode)
+                sampled = SampledLog(logger, every=args.every)
+
+                if style == "plain":
+                    def body(index: int) -> None:
+                        logger.debug("Session %s received frame #%d from track", session_id, index)
+                else:
+                    def body(index: int) -> None:
+                        if sampled.due():
+                            logger.debug("Session %s received frame #%d from track", session_id, index)
+
+                per_call = _time_calls(args.calls, body)
+                stop()
+                lines = sum(1 for _ in path.open(encoding="utf-8")) if path else 0
+                label = f"debug {'on ' + mode if debug else 'off'}, {style}"
+                print(f"{label:<34}{per_call:>10.0f}{lines:>10}")
+
+        calls = max(args.calls // 20, 1)
+        legacy = _time_calls(calls, lambda index: _legacy_append(base / "legacy", f"message {index}"))
+        queued_logger = file_logger(base / "queued" / "stt_debug.log")
+        queued = _time_calls(calls, lambda index: queued_logger.debug(f"message {index}"))
+        shutdown_logging()
+        print(f"{'append_debug_log, open per call':<34}{legacy:>10.0f}{calls:>10}")
+        print(f"{'append_debug_log, queued':<34}{queued:>10.0f}{calls:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""OCR parse prompt: full (indent=2) schema versus the compacted schema.
+
+Usage (from ``BE/``)::
+
+    python -m benchmarks.ocr_prompt [--text ocr.txt]
+    python -m benchmarks.ocr_prompt --live --text ocr.txt [--expected truth.json] [--runs 3]
+
+Without ``--live`` it only reports, per contract type, the schema size and
+the prompt's token count as counted locally (tiktoken, or a character
+estimate if it is not installed). ``--text`` is an OCR text dump (e.g. the
+``text`` of a stored ``ocr_raw``) that gets appended as the document.
+
+With ``--live`` each variant is sent to ``OPENAI_MODEL`` ``--runs`` times,
+alternating so that both variants see the same API conditions. The report
+shows mean and worst latency, the input and output tokens reported by the
+API, and accuracy. Accuracy is the share of leaf fields that match
+``--expected``. Without ``--expected`` it is measured against the first
+full-prompt answer instead.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.use_cases.ocr.services.openai_parser import get_openai_parser
+from app.use_cases.ocr.services.schema_loader import SchemaLoader
+from app.use_cases.ocr.services.token_counter import count_tokens
+
+VARIANTS = ("full", "compact")
+
+
+def _leaves(node: Any, path: str = "") -> Dict[str, Any]:
+    if isinstance(node, dict):
+        out: Dict[str, Any] = {}
+        for key, value in node.items():
+            out.update(_leaves(value, f"{path}/{key}"))
+        return out
+    if isinstance(node, list):
+        out = {}
+        for index, value in enumerate(node):
+            out.update(_leaves(value, f"{path}[{index}]"))
+        return out
+    return {path: node}
+
+
+def accuracy(parsed: Dict[str, Any], expected: Dict[str, Any]) -> float:
+    truth = _leaves(expected)
+    if not truth:
+        return 1.0
+    got = _leaves(parsed)
+    return sum(1 for path, value in truth.items() if got.get(path) == value) / len(truth)
+
+
+def _sizes(contract_types: List[str], text: str) -> None:
+    loaders = {variant: SchemaLoader(compact=variant == "compact") for variant in VARIANTS}
+    print(f"{'contract type':<22}{'variant':<9}{'schema chars':>14}{'prompt tokens':>15}{'compile ms':>12}")
+    for contract_type in contract_types:
+        for variant, loader in loaders.items():
+            started = time.perf_counter()
+            compiled = loader.compile(contract_type)
+            compile_ms = (time.perf_counter() - started) * 1000
+            prompt = loader.load_prompt(contract_type, text)
+            template_chars = len((loader.prompt_dir / f"{contract_type}.txt").read_text(encoding="utf-8"))
+            schema_chars = len(compiled.prefix) - template_chars + len("{JSON Schema}")
+            tokens = count_tokens(prompt, settings.openai_model)
+            print(f"{contract_type:<22}{variant:<9}{schema_chars:>14}{tokens:>15}{compile_ms:>12.1f}")
+
+
+async def _live(contract_type: str, text: str, expected: Optional[Dict[str, Any]], runs: int) -> None:
+    parser = get_openai_parser()
+    prompts = {variant: SchemaLoader(compact=variant == "compact").load_prompt(contract_type, text) for variant in VARIANTS}
+    results: Dict[str, List[tuple]] = {variant: [] for variant in VARIANTS}
+
+    for _ in range(runs):
+        for variant in VARIANTS:
+            started = time.perf_counter()
+            parsed, usage = await parser.parse_with_usage(prompts[variant])
+            results[variant].append((time.perf_counter() - started, usage, parsed))
+
+    reference = expected if expected is not None else results["full"][0][2]
+    print(f"model {parser.model}, {runs} run(s) per variant, accuracy vs {'expected' if expected else 'first full answer'}")
+    print(f"{'variant':<9}{'mean s':>9}{'max s':>9}{'in tok':>9}{'out tok':>9}{'accuracy':>10}")
+    for variant, rows in results.items():
+        latencies = [row[0] for row in rows]
+        print(
+            f"{variant:<9}{statistics.mean(latencies):>9.2f}{max(latencies):>9.2f}"
+            f"{statistics.mean(row[1].input_tokens for row in rows):>9.0f}"
+            f"{statistics.mean(row[1].output_tokens for row in rows):>9.0f}"
+            f"{statistics.mean(accuracy(row[2], reference) for row in rows):>10.1%}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contract-type", default=None, help="Default: every type with a prompt and schema")
+    parser.add_argument("--text", type=Path, default=None, help="OCR text to embed as the document")
+    parser.add_argument("--expected", type=Path, default=None, help="Ground-truth JSON for accuracy (--live)")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--live", action="store_true", help="Call OpenAI (needs OPENAI_API_KEY)")
+    args = parser.parse_args()
+
+    text = args.text.read_text(encoding="utf-8") if args.text else ""
+    contract_types = [args.contract_type] if args.contract_type else SchemaLoader().warm()
+    _sizes(contract_types, text)
+
+    if args.live:
+        if not args.text:
+            parser.error("--live needs --text")
+        expected = json.loads(args.expected.read_text(encoding="utf-8")) if args.expected else None
+        print()
+        asyncio.run(_live(args.contract_type or "주택임대차표준계약서", text, expected, args.runs))
+
+
+if __name__ == "__main__":
+    main()
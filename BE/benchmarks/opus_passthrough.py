@@ -0,0 +1,104 @@
+"""Compare the PCM (decode + resample + LINEAR16) path with Opus passthrough.
+
+Usage (from ``BE/``)::
+
+    python -m benchmarks.opus_passthrough [--wav path/to/input.wav] [--seconds 60]
+
+Without ``--wav`` a synthetic 48 kHz speech-like signal is generated. The input is
+encoded to 20 ms Opus packets the way a browser would send them, then both
+server-side paths are timed on the same packets. CPU is measured with
+``time.process_time`` so the numbers are per-core seconds per audio second.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from fractions import Fraction
+from pathlib import Path
+
+import av
+import numpy as np
+from av.audio.resampler import AudioResampler
+
+from app.sessions.opus_passthrough import OggOpusWriter
+from benchmarks._audio import RTC_RATE, load_samples
+
+STT_RATE = 16000
+FRAME_SAMPLES = 960  # 20 ms @ 48 kHz
+
+
+def _encode_packets(samples: np.ndarray) -> list[bytes]:
+    encoder = av.CodecContext.create("libopus", "w")
+    encoder.sample_rate = RTC_RATE
+    encoder.layout = "mono"
+    encoder.format = "s16"
+    encoder.bit_rate = 32000
+    encoder.time_base = Fraction(1, RTC_RATE)
+
+    packets: list[bytes] = []
+    for offset in range(0, len(samples) - FRAME_SAMPLES + 1, FRAME_SAMPLES):
+        frame = av.AudioFrame.from_ndarray(
+            samples[offset : offset + FRAME_SAMPLES].reshape(1, -1),
+            format="s16",
+            layout="mono",
+        )
+        frame.sample_rate = RTC_RATE
+        frame.pts = offset
+        packets.extend(bytes(packet) for packet in encoder.encode(frame))
+    packets.extend(bytes(packet) for packet in encoder.encode(None))
+    return packets
+
+
+def _run_pcm_path(packets: list[bytes]) -> tuple[float, int]:
+    decoder = av.CodecContext.create("opus", "r")
+    decoder.sample_rate = RTC_RATE
+    decoder.layout = "stereo"  # aiortc negotiates opus/48000/2
+    resampler = AudioResampler(format="s16", layout="mono", rate=STT_RATE)
+
+    sent = 0
+    started = time.process_time()
+    for payload in packets:
+        for frame in decoder.decode(av.Packet(payload)):
+            for resampled in resampler.resample(frame):
+                sent += len(resampled.to_ndarray().tobytes())
+    return time.process_time() - started, sent
+
+
+def _run_passthrough_path(packets: list[bytes]) -> tuple[float, int]:
+    writer = OggOpusWriter()
+    sent = 0
+    started = time.process_time()
+    for payload in packets:
+        page = writer.append(payload)
+        if page:
+            sent += len(writer.headers() + page)
+    sent += len(writer.flush(eos=True))
+    return time.process_time() - started, sent
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--wav", type=Path, default=None, help="16-bit PCM WAV input")
+    parser.add_argument("--seconds", type=float, default=60.0, help="audio duration to process")
+    args = parser.parse_args()
+
+    samples = load_samples(args.wav, args.seconds)
+    audio_seconds = len(samples) / RTC_RATE
+    packets = _encode_packets(samples)
+
+    results = {
+        "pcm (decode+resample, LINEAR16)": _run_pcm_path(packets),
+        "passthrough (OGG_OPUS)": _run_passthrough_path(packets),
+    }
+
+    print(f"audio: {audio_seconds:.1f}s, {len(packets)} opus packets")
+    print(f"{'path':<34}{'cpu ms/audio s':>16}{'upstream B/s':>16}{'sessions/core':>16}")
+    for name, (cpu, sent) in results.items():
+        cpu_per_second = cpu / audio_seconds if audio_seconds else 0.0
+        capacity = (1.0 / cpu_per_second) if cpu_per_second else float("inf")
+        print(f"{name:<34}{cpu_per_second * 1000:>16.3f}{sent / audio_seconds:>16.0f}{capacity:>16.0f}")
+
+
+if __name__ == "__main__":
+    main()
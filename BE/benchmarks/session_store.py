@@ -0,0 +1,150 @@
+"""Per-final CPU cost of keeping a session's transcript and Q&A in memory.
+
+Usage (from ``BE/``)::
+
+    python -m benchmarks.session_store [--finals 2000] [--segments-per-final 2] [--repeat 5]
+
+Compares the two ways ``Transcriber`` has kept session state:
+
+* ``models``: every final segment becomes a ``TranscriptSegment``, every Q&A
+  payload goes through ``QAPair.model_validate`` and is ``model_dump``-ed for
+  the delta event, the final event and again when ``STTResult`` is persisted.
+* ``stores``: ``SegmentStore`` / ``QAPairStore`` appends, plain dicts for the
+  events, one ``TypeAdapter`` validation pass at persistence.
+
+Only the bookkeeping is measured; diarization and Q&A extraction are the
+same in both paths and are excluded. Reported per path: microseconds per
+final while streaming, milliseconds for the stop-time persistence step, and
+retained bytes (``tracemalloc``) for the whole session.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from pydantic import TypeAdapter
+
+from app.models import QAPair, STTResult, TranscriptPayload, TranscriptSegment
+from app.sessions.diarization import Segment
+from app.sessions.session_store import QAPairStore, SegmentStore
+
+_QA_DOCUMENTS = TypeAdapter(List[QAPair])
+_SEGMENT_DOCUMENTS = TypeAdapter(List[TranscriptSegment])
+
+
+def _workload(finals: int, per_final: int) -> List[Tuple[List[Segment], List[Dict[str, Any]]]]:
+    """Synthetic finals; every other one completes a Q&A pair, as in a consultation."""
+    workload = []
+    for index in range(finals):
+        start = index * 3.0
+        segments = [
+            Segment(speaker=index % 2, text=f"문장 {index}-{part} 입니다.", start=start + part, end=start + part + 0.9)
+            for part in range(per_final)
+        ]
+        payloads = []
+        if index % 2:
+            payloads.append(
+                {
+                    "q_text": f"질문 {index} 인가요?",
+                    "q_speaker": 0,
+                    "q_time": start - 0.5,
+                    "a_text": f"답변 {index} 입니다.",
+                    "a_speaker": 1,
+                    "a_time": start,
+                    "confidence": 0.9,
+                },
+            )
+        workload.append((segments, payloads))
+    return workload
+
+
+def _models_path(workload) -> Tuple[Callable[[Any], None], Callable[[], Any]]:
+    segments: List[TranscriptSegment] = []
+    pairs: List[QAPair] = []
+    keys: set[str] = set()
+
+    def final(item) -> None:
+        built, payloads = item
+        for segment in built:
+            segments.append(TranscriptSegment.from_values(segment.speaker, segment.start, segment.end, segment.text))
+        new_pairs = []
+        for payload in payloads:
+            key = f"{payload.get('q_text')}|{payload.get('a_text')}|{payload.get('a_time')}"
+            if key in keys:
+                continue
+            keys.add(key)
+            pair = QAPair.model_validate(payload)
+            pairs.append(pair)
+            new_pairs.append(pair)
+        [pair.model_dump() for pair in new_pairs]
+
+    def persist() -> Any:
+        [pair.model_dump() for pair in pairs]
+        result = STTResult(room_id="bench", qa=list(pairs), transcript=TranscriptPayload(segments=list(segments)))
+        return result.model_dump()
+
+    return final, persist
+
+
+def _stores_path(workload) -> Tuple[Callable[[Any], None], Callable[[], Any]]:
+    segments = SegmentStore()
+    pairs = QAPairStore()
+
+    def final(item) -> None:
+        built, payloads = item
+        for segment in built:
+            segments.append(segment)
+        pairs.register(payloads)
+
+    def persist() -> Any:
+        qa_documents = pairs.to_documents()
+        segment_documents = segments.to_documents()
+        _QA_DOCUMENTS.validate_python(qa_documents)
+        _SEGMENT_DOCUMENTS.validate_python(segment_documents)
+        return {"qa": qa_documents, "transcript": {"segments": segment_documents}}
+
+    return final, persist
+
+
+def _measure(factory, workload, repeat: int) -> Tuple[float, float, int]:
+    best_final = best_persist = float("inf")
+    for _ in range(repeat):
+        final, persist = factory(workload)
+        started = time.process_time()
+        for item in workload:
+            final(item)
+        streamed = time.process_time()
+        persist()
+        best_final = min(best_final, (streamed - started) / len(workload))
+        best_persist = min(best_persist, time.process_time() - streamed)
+
+    tracemalloc.start()
+    final, _ = factory(workload)
+    before, _ = tracemalloc.get_traced_memory()
+    for item in workload:
+        final(item)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best_final, best_persist, after - before
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--finals", type=int, default=2000, help="final results per simulated session")
+    parser.add_argument("--segments-per-final", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=5, help="best-of-N timing")
+    args = parser.parse_args()
+
+    workload = _workload(args.finals, args.segments_per_final)
+    print(f"{args.finals} finals, {args.segments_per_final} segments each, {args.finals // 2} Q&A pairs")
+    print(f"{'path':<8}{'us/final':>10}{'persist ms':>12}{'retained KiB':>14}")
+    for name, factory in (("models", _models_path), ("stores", _stores_path)):
+        per_final, persist, retained = _measure(factory, workload, max(args.repeat, 1))
+        print(f"{name:<8}{per_final * 1e6:>10.2f}{persist * 1000:>12.2f}{retained / 1024:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Sessions-per-node scaling of the inline vs process-pool execution modes.
+
+Usage (from ``BE/``)::
+
+    python -m benchmarks.session_worker_scaling [--seconds 10] [--sessions-per-core 4] [--max-workers N]
+
+Every session is fed 20 ms 48 kHz stereo s16 frames (what aiortc's Opus decoder
+produces) as fast as its pipeline accepts them, with ``STT_BACKEND=null`` so
+Google is never called. Capacity is the amount of audio the node pushes through
+resample, WAV writing and the recognition request loop per wall-clock second,
+i.e. how many real-time sessions it could sustain.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import av
+import numpy as np
+
+from app.core.config import Settings
+from app.sessions.audio_pipeline import AudioPipeline
+from app.sessions.transcriber import Transcriber
+from app.sessions.worker_pool import SessionWorkerPool
+
+FRAME_SECONDS = 0.02
+FRAME_SAMPLES = 960
+
+
+class _NullWebSocket:
+    async def send_json(self, payload) -> None:
+        return None
+
+    async def send_text(self, text: str) -> None:
+        return None
+
+
+def _settings(base: Path) -> Settings:
+    return Settings(
+        STORAGE_DIR=base / "recordings",
+        ANALYSIS_DIR=base / "analysis",
+        LOGS_DIR=base / "logs",
+        STT_BACKEND="null",
+    )
+
+
+def _frame() -> av.AudioFrame:
+    t = np.arange(FRAME_SAMPLES) / 48000
+    mono = (np.sin(2 * np.pi * 220 * t) * 8000).astype(np.int16)
+    stereo = np.repeat(mono, 2).reshape(1, -1)
+    frame = av.AudioFrame.from_ndarray(stereo, format="s16", layout="stereo")
+    frame.sample_rate = 48000
+    return frame
+
+
+async def _run_inline(settings: Settings, sessions: int, seconds: float) -> float:
+    frame = _frame()
+    websocket = _NullWebSocket()
+    pipelines: list[tuple[AudioPipeline, Transcriber]] = []
+    for index in range(sessions):
+        queue: asyncio.Queue = asyncio.Queue(maxsize=64)
+        pipeline = AudioPipeline(f"inline-{index}", settings, queue)
+        transcriber = Transcriber(f"inline-{index}", settings, websocket, queue, pipeline)
+        await transcriber.start()
+        pipelines.append((pipeline, transcriber))
+
+    frames = 0
+    started = time.perf_counter()
+    deadline = started + seconds
+    while time.perf_counter() < deadline:
+        for pipeline, _ in pipelines:
+            await pipeline.handle_frame(frame)
+            frames += 1
+        await asyncio.sleep(0)
+
+    for pipeline, transcriber in pipelines:
+        await transcriber.stop()
+        pipeline.close()
+    elapsed = time.perf_counter() - started
+    return frames * FRAME_SECONDS / elapsed
+
+
+async def _run_pool(settings: Settings, workers: int, sessions: int, seconds: float) -> float:
+    pool = SessionWorkerPool(settings, processes=workers)
+    await pool.start()
+
+    frame = _frame()
+    websocket = _NullWebSocket()
+    remotes = [pool.open_session(f"pool-{workers}-{index}", websocket) for index in range(sessions)]
+
+    frames = 0
+    started = time.perf_counter()
+    deadline = started + seconds
+    while time.perf_counter() < deadline:
+        progressed = False
+        for remote in remotes:
+            if remote.write_frame(frame):
+                frames += 1
+                progressed = True
+        # Rings full means the workers are the bottleneck; yield instead of spinning.
+        await asyncio.sleep(0 if progressed else 0.001)
+
+    await asyncio.gather(*(remote.stop() for remote in remotes))
+    elapsed = time.perf_counter() - started
+    await pool.shutdown()
+    return frames * FRAME_SECONDS / elapsed
+
+
+async def _main(seconds: float, sessions_per_core: int, max_workers: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = _settings(Path(tmp))
+
+        print(f"{'mode':<10}{'workers':>8}{'sessions':>10}{'realtime sessions':>20}")
+        capacity = await _run_inline(settings, sessions_per_core, seconds)
+        print(f"{'inline':<10}{1:>8}{sessions_per_core:>10}{capacity:>20.1f}")
+
+        workers = 1
+        while workers <= max_workers:
+            sessions = workers * sessions_per_core
+            capacity = await _run_pool(settings, workers, sessions, seconds)
+            print(f"{'process':<10}{workers:>8}{sessions:>10}{capacity:>20.1f}")
+            workers *= 2
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--sessions-per-core", type=int, default=4)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    asyncio.run(_main(args.seconds, args.sessions_per_core, args.max_workers))
+
+
+if __name__ == "__main__":
+    main()
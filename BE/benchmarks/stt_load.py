@@ -0,0 +1,279 @@
+"""Synthetic WebRTC load against a running ``/v1/stt/ws`` endpoint.
+
+Start the server with the fake recognition backend and an admin token::
+
+    STT_BACKEND=fake ADMIN_TOKEN=bench uvicorn app.main:app --port 8000
+
+then, from ``BE/``::
+
+    python -m benchmarks.stt_load --sessions 20 --ramp 10 --seconds 60 \\
+        [--url ws://127.0.0.1:8000/v1/stt/ws] [--wav speech.wav] [--admin-token bench]
+
+Each virtual client is a real aiortc peer: it sends ``session.init``, offers
+an Opus audio track, applies trickled ICE candidates and streams 20 ms
+frames from the WAV (or a synthetic signal) in real time. The fake backend
+prefixes every transcript with the audio second it covers, so the client
+computes end-to-end event latency (audio sent -> stt.partial/final received).
+
+Reported:
+
+* session setup time: websocket open -> session.ready -> rtc.answer -> ICE connected
+* stt.partial / stt.final_segments latency (p50 / p95 / p99)
+* rejected sessions (SESSION_REJECTED) and other errors
+* dropped audio chunks, plus server CPU ms and RSS per session, taken from
+  ``/v1/admin/stt/sessions`` when ``--admin-token`` is given
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import fractions
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+import av
+import httpx
+import numpy as np
+import websockets
+from aiortc import RTCPeerConnection, RTCSessionDescription
+from aiortc.mediastreams import MediaStreamError, MediaStreamTrack
+from aiortc.sdp import candidate_from_sdp
+
+from benchmarks._audio import RTC_RATE, load_samples
+
+FRAME_SAMPLES = 960  # 20 ms @ 48 kHz
+FRAME_SECONDS = FRAME_SAMPLES / RTC_RATE
+_MARKER = re.compile(r"^\[(\d+(?:\.\d+)?)\]")
+
+
+class _WavTrack(MediaStreamTrack):
+    """Plays mono s16 samples as a live 48 kHz audio track."""
+
+    kind = "audio"
+
+    def __init__(self, samples: np.ndarray) -> None:
+        super().__init__()
+        self._samples = samples
+        self._index = 0
+        self.started_at: Optional[float] = None
+
+    async def recv(self) -> av.AudioFrame:
+        if self.readyState != "live":
+            raise MediaStreamError
+        if self.started_at is None:
+            self.started_at = time.monotonic()
+        due = self.started_at + self._index * FRAME_SECONDS
+        delay = due - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        offset = (self._index * FRAME_SAMPLES) % max(len(self._samples) - FRAME_SAMPLES, 1)
+        frame = av.AudioFrame.from_ndarray(
+            self._samples[offset : offset + FRAME_SAMPLES].reshape(1, -1),
+            format="s16",
+            layout="mono",
+        )
+        frame.sample_rate = RTC_RATE
+        frame.pts = self._index * FRAME_SAMPLES
+        frame.time_base = fractions.Fraction(1, RTC_RATE)
+        self._index += 1
+        return frame
+
+
+@dataclass
+class SessionResult:
+    session_id: Optional[str] = None
+    ready_ms: Optional[float] = None
+    answer_ms: Optional[float] = None
+    connected_ms: Optional[float] = None
+    partial_latency_ms: List[float] = field(default_factory=list)
+    final_latency_ms: List[float] = field(default_factory=list)
+    qa_pairs: int = 0
+    rejected: bool = False
+    error: Optional[str] = None
+
+
+async def _run_session(url: str, samples: np.ndarray, seconds: float, room_id: Optional[str]) -> SessionResult:
+    result = SessionResult()
+    started = time.monotonic()
+    track = _WavTrack(samples)
+    pc = RTCPeerConnection()
+    pc.addTrack(track)
+
+    @pc.on("connectionstatechange")
+    def _on_state() -> None:
+        if pc.connectionState == "connected" and result.connected_ms is None:
+            result.connected_ms = (time.monotonic() - started) * 1000
+
+    def _elapsed() -> float:
+        return (time.monotonic() - started) * 1000
+
+    def _latency(text: str) -> Optional[float]:
+        match = _MARKER.match(text)
+        if not match or track.started_at is None:
+            return None
+        # Audio second N left this client at started_at + N; the server has seen all of it by now.
+        return (time.monotonic() - (track.started_at + float(match.group(1)))) * 1000
+
+    try:
+        async with websockets.connect(url, max_size=None) as ws:
+            init: Dict[str, Any] = {"roomId": room_id} if room_id else {}
+            await ws.send(json.dumps({"event": "session.init", "data": init}))
+
+            offer_sent = False
+            deadline: Optional[float] = None
+            async for message in ws:
+                payload = json.loads(message)
+                event, data = payload.get("event"), payload.get("data") or {}
+
+                if event == "session.ready" and not offer_sent:
+                    result.session_id = data.get("session_id")
+                    result.ready_ms = _elapsed()
+                    await pc.setLocalDescription(await pc.createOffer())
+                    await ws.send(
+                        json.dumps(
+                            {"event": "rtc.offer", "data": {"sdp": pc.localDescription.sdp, "type": pc.localDescription.type}},
+                        ),
+                    )
+                    offer_sent = True
+                elif event == "rtc.answer":
+                    await pc.setRemoteDescription(RTCSessionDescription(sdp=data["sdp"], type=data["type"]))
+                    result.answer_ms = _elapsed()
+                    deadline = time.monotonic() + seconds
+                    asyncio.get_running_loop().call_later(seconds, lambda: asyncio.ensure_future(
+                        ws.send(json.dumps({"event": "rtc.stop", "data": {}})),
+                    ))
+                elif event == "rtc.candidate" and data.get("candidate"):
+                    sdp = data["candidate"]
+                    candidate = candidate_from_sdp(sdp[len("candidate:"):] if sdp.startswith("candidate:") else sdp)
+                    candidate.sdpMid = data.get("sdpMid")
+                    candidate.sdpMLineIndex = data.get("sdpMLineIndex")
+                    await pc.addIceCandidate(candidate)
+                elif event == "stt.partial":
+                    latency = _latency(data.get("text", ""))
+                    if latency is not None:
+                        result.partial_latency_ms.append(latency)
+                elif event == "stt.final_segments":
+                    for segment in data.get("segments", []):
+                        latency = _latency(segment.get("text", ""))
+                        if latency is not None:
+                            result.final_latency_ms.append(latency)
+                elif event == "stt.qa_pairs" and data.get("final"):
+                    result.qa_pairs = len(data.get("pairs", []))
+                elif event == "error":
+                    result.rejected = data.get("code") == "SESSION_REJECTED"
+                    result.error = data.get("code")
+                    break
+                elif event == "stt.error":
+                    result.error = data.get("code")
+                elif event == "session.close":
+                    break
+
+                if deadline is not None and time.monotonic() > deadline + 30:
+                    result.error = result.error or "STOP_TIMEOUT"
+                    break
+    except Exception as exc:
+        result.error = result.error or type(exc).__name__
+    finally:
+        track.stop()
+        await pc.close()
+    return result
+
+
+async def _admin_usage(url: str, token: Optional[str]) -> Optional[Dict[str, Any]]:
+    if not token:
+        return None
+    parts = urlsplit(url)
+    scheme = "https" if parts.scheme == "wss" else "http"
+    admin_url = urlunsplit((scheme, parts.netloc, "/v1/admin/stt/sessions", "", ""))
+    async with httpx.AsyncClient(timeout=10) as client:
+        response = await client.get(admin_url, headers={"X-Admin-Token": token})
+        response.raise_for_status()
+        return response.json()
+
+
+def _pct(values: List[float], q: float) -> str:
+    return f"{np.percentile(values, q):.0f}" if values else "-"
+
+
+def _report(
+    results: List[SessionResult],
+    before: Optional[Dict[str, Any]],
+    steady: Optional[Dict[str, Any]],
+    peak: Optional[Dict[str, Any]],
+    window: float,
+) -> None:
+    ok = [result for result in results if result.connected_ms is not None and not result.rejected]
+    print(f"sessions: {len(results)} started, {len(ok)} connected, "
+          f"{sum(result.rejected for result in results)} rejected, "
+          f"{sum(1 for result in results if result.error and not result.rejected)} errored")
+
+    errors: Dict[str, int] = {}
+    for result in results:
+        if result.error and not result.rejected:
+            errors[result.error] = errors.get(result.error, 0) + 1
+    if errors:
+        print(f"errors: {errors}")
+
+    print(f"{'metric (ms)':<28}{'p50':>8}{'p95':>8}{'p99':>8}{'n':>8}")
+    rows = {
+        "setup: session.ready": [r.ready_ms for r in results if r.ready_ms is not None],
+        "setup: rtc.answer": [r.answer_ms for r in results if r.answer_ms is not None],
+        "setup: ICE connected": [r.connected_ms for r in results if r.connected_ms is not None],
+        "latency: stt.partial": [v for r in results for v in r.partial_latency_ms],
+        "latency: stt.final": [v for r in results for v in r.final_latency_ms],
+    }
+    for name, values in rows.items():
+        print(f"{name:<28}{_pct(values, 50):>8}{_pct(values, 95):>8}{_pct(values, 99):>8}{len(values):>8}")
+
+    if before and steady and peak:
+        sessions = max(len(peak["sessions"]), 1)
+        cpu = peak["process"]["cpu_seconds"] - steady["process"]["cpu_seconds"]
+        rss = (peak["process"]["rss_bytes"] or 0) - (before["process"]["rss_bytes"] or 0)
+        dropped = sum(item.get("dropped", 0) for item in peak["sessions"])
+        print(f"server ({peak['worker_id']}): {sessions} live sessions at peak")
+        print(f"  cpu {cpu / window / sessions * 1000:.1f} ms/s per session, "
+              f"rss +{rss / sessions / 1024 / 1024:.1f} MiB per session, "
+              f"{peak['process']['threads']} threads, {peak['process']['open_fds']} fds")
+        print(f"  dropped audio chunks: {dropped}")
+
+
+async def _main(args: argparse.Namespace) -> None:
+    samples = load_samples(args.wav, max(args.seconds, 10.0))
+    before = await _admin_usage(args.url, args.admin_token)
+
+    async def _delayed(index: int) -> SessionResult:
+        await asyncio.sleep(args.ramp * index / max(args.sessions, 1))
+        return await _run_session(args.url, samples, args.seconds, args.room_id)
+
+    tasks = [asyncio.create_task(_delayed(index)) for index in range(args.sessions)]
+    # Two server samples while every session is streaming; CPU is the delta between them.
+    window = max(min(args.seconds / 2, 10.0), 1.0)
+    await asyncio.sleep(args.ramp + 2.0)
+    steady = await _admin_usage(args.url, args.admin_token)
+    await asyncio.sleep(window)
+    peak = await _admin_usage(args.url, args.admin_token)
+    results = await asyncio.gather(*tasks)
+    _report(results, before, steady, peak, window)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="ws://127.0.0.1:8000/v1/stt/ws")
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--ramp", type=float, default=5.0, help="seconds over which sessions are started")
+    parser.add_argument("--seconds", type=float, default=30.0, help="audio streamed per session")
+    parser.add_argument("--wav", type=Path, default=None, help="16-bit PCM WAV input")
+    parser.add_argument("--room-id", default=None, help="roomId sent in session.init (results are persisted)")
+    parser.add_argument("--admin-token", default=None, help="ADMIN_TOKEN of the server, enables server-side stats")
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
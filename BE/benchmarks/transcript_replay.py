@@ -0,0 +1,157 @@
+"""Replay recorded Google responses through the transcript-side pipeline.
+
+Usage (from ``BE/``)::
+
+    python -m benchmarks.transcript_replay data/logs/recognition/ [more.sttr ...] [--update] [--repeat 5]
+
+Recordings are written by sessions running with ``STT_RECORD_RESPONSES=true``
+(``logs_dir/recognition/{session_id}.sttr``). Each one is fed at maximum speed
+through ``Transcriber.handle_response``, i.e. ``DiarizationProcessor``,
+punctuation merging and ``QAExtractor``, exactly as the live recognition
+thread would. Reported per recording:
+
+* responses, final segments and Q&A pairs emitted
+* per-response processing time (p50 / p99 / max) and total
+* a diff of the emitted segments / Q&A against ``{name}.expected.json``
+
+``--update`` (re)writes the expected files instead of diffing. The exit code
+is non-zero when any recording differs from its expected output, so this can
+gate changes to the transcript-side code.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import difflib
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+from app.core.config import Settings
+from app.sessions.recognition_log import SUFFIX, read_responses
+from app.sessions.transcriber import Transcriber
+
+
+class _CollectingWebSocket:
+    def __init__(self) -> None:
+        self.segments: List[Dict[str, Any]] = []
+        self.qa_pairs: List[Dict[str, Any]] = []
+
+    async def send_json(self, payload: Dict[str, Any]) -> None:
+        event, data = payload.get("event"), payload.get("data") or {}
+        if event == "stt.final_segments":
+            self.segments.extend(data.get("segments", []))
+        elif event == "stt.qa_pairs" and data.get("final"):
+            self.qa_pairs = list(data.get("pairs", []))
+
+    async def send_text(self, text: str) -> None:
+        await self.send_json(json.loads(text))
+
+
+async def _replay(settings: Settings, path: Path) -> tuple[Dict[str, Any], List[int]]:
+    responses = [response for _, response in read_responses(path)]
+    websocket = _CollectingWebSocket()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=64)
+    transcriber = Transcriber(path.stem, settings, websocket, queue)
+
+    # With the null backend the streaming thread exits as soon as the queue is closed,
+    # leaving a started transcriber that is fed responses directly.
+    await transcriber.start()
+    queue.put_nowait(None)
+    await asyncio.sleep(0)
+
+    timings: List[int] = []
+    for response in responses:
+        started = time.perf_counter_ns()
+        transcriber.handle_response(response)
+        timings.append(time.perf_counter_ns() - started)
+        # Let the scheduled emits run so queued callbacks don't pile up across the whole file.
+        await asyncio.sleep(0)
+
+    await transcriber.stop()
+    await asyncio.sleep(0)
+    output = {"responses": len(responses), "segments": websocket.segments, "qa_pairs": websocket.qa_pairs}
+    return output, timings
+
+
+def _collect(paths: List[Path]) -> List[Path]:
+    recordings: List[Path] = []
+    for path in paths:
+        if path.is_dir():
+            recordings.extend(sorted(path.glob(f"*{SUFFIX}")))
+        else:
+            recordings.append(path)
+    return recordings
+
+
+def _diff(expected_path: Path, output: Dict[str, Any]) -> List[str]:
+    expected = json.loads(expected_path.read_text(encoding="utf-8"))
+    before = json.dumps(expected, ensure_ascii=False, indent=1, sort_keys=True).splitlines()
+    after = json.dumps(output, ensure_ascii=False, indent=1, sort_keys=True).splitlines()
+    return list(difflib.unified_diff(before, after, "expected", "replayed", lineterm="", n=2))
+
+
+async def _main(args: argparse.Namespace) -> int:
+    recordings = _collect(args.paths)
+    if not recordings:
+        print("no recordings found")
+        return 1
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp)
+        settings = Settings(
+            STORAGE_DIR=base / "recordings",
+            ANALYSIS_DIR=base / "analysis",
+            LOGS_DIR=base / "logs",
+            STT_BACKEND="null",
+        )
+
+        print(f"{'recording':<36}{'resp':>6}{'segs':>6}{'qa':>5}{'p50 us':>9}{'p99 us':>9}{'max us':>9}{'total ms':>10}  result")
+        for path in recordings:
+            timings: List[int] = []
+            output: Dict[str, Any] = {}
+            for _ in range(max(args.repeat, 1)):
+                output, run_timings = await _replay(settings, path)
+                timings.extend(run_timings)
+            samples = np.asarray(timings or [0]) / 1000
+
+            expected_path = path.with_suffix(".expected.json")
+            if args.update:
+                expected_path.write_text(json.dumps(output, ensure_ascii=False, indent=1), encoding="utf-8")
+                verdict = "updated"
+            elif not expected_path.exists():
+                verdict = "no expected output"
+            else:
+                diff = _diff(expected_path, output)
+                verdict = "ok" if not diff else f"DIFF ({len(diff)} lines)"
+                if diff:
+                    failures += 1
+                    if args.verbose:
+                        print("\n".join(diff))
+
+            print(
+                f"{path.stem[:35]:<36}{output['responses']:>6}{len(output['segments']):>6}{len(output['qa_pairs']):>5}"
+                f"{np.percentile(samples, 50):>9.0f}{np.percentile(samples, 99):>9.0f}{samples.max():>9.0f}"
+                f"{samples.sum() / 1000 / max(args.repeat, 1):>10.2f}  {verdict}"
+            )
+    return 1 if failures else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", type=Path, nargs="+", help=f"{SUFFIX} files or directories containing them")
+    parser.add_argument("--update", action="store_true", help="write {name}.expected.json instead of diffing")
+    parser.add_argument("--repeat", type=int, default=1, help="replay each recording N times for stable timings")
+    parser.add_argument("--verbose", action="store_true", help="print diffs")
+    sys.exit(asyncio.run(_main(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.core.config import Settings
+from app.core.logging import SampledLog, configure_logging, file_logger, session_context, shutdown_logging
+
+
+def test_sampled_log_is_silent_when_level_is_off() -> None:
+    logger = logging.getLogger("tests.sampled")
+    logger.setLevel(logging.INFO)
+    sampled = SampledLog(logger, every=10, burst=2)
+
+    assert not any(sampled.due() for _ in range(100))
+    assert sampled.count == 0
+
+    logger.setLevel(logging.DEBUG)
+    due = [index + 1 for index in range(30) if sampled.due()]
+    assert due == [1, 2, 10, 20, 30]
+
+
+@pytest.mark.asyncio
+async def test_records_carry_session_id_and_are_written_off_thread(tmp_path: Path) -> None:
+    log_file = tmp_path / "app.log"
+    configure_logging(Settings(LOG_FILE=log_file, LOG_LEVEL="INFO", LOGS_DIR=tmp_path))
+    logger = logging.getLogger("tests.context")
+
+    async def _session_work() -> None:
+        logger.info("inside task")
+        await asyncio.to_thread(logger.info, "inside recognition thread")
+
+    try:
+        await asyncio.create_task(_session_work(), context=session_context("abc123"))
+        logger.info("outside")
+        file_logger(tmp_path / "stt_debug.log").debug("debug line")
+    finally:
+        shutdown_logging()
+
+    lines = log_file.read_text(encoding="utf-8").splitlines()
+    assert any("[abc123] tests.context: inside task" in line for line in lines)
+    assert any("[abc123] tests.context: inside recognition thread" in line for line in lines)
+    assert any("[-] tests.context: outside" in line for line in lines)
+    debug_line = (tmp_path / "stt_debug.log").read_text(encoding="utf-8").rstrip()
+    assert debug_line.endswith("debug line")
+    stamp = datetime.fromisoformat(debug_line[1 : debug_line.index("]")])
+    assert abs(stamp - datetime.now(UTC).replace(tzinfo=None)) < timedelta(minutes=1)
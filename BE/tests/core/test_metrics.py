@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.core.metrics import EXTERNAL_CALL_ERRORS, REGISTRY, MetricsRegistry, track_call
+from app.sessions.flight_recorder import FlightRecorder
+from app.sessions.metrics import SESSION_ERRORS, TIME_TO_FIRST_WORD
+
+
+def test_registry_renders_prometheus_text() -> None:
+    registry = MetricsRegistry()
+    started = registry.counter("sessions_started_total", "Sessions started.")
+    stopped = registry.counter("sessions_stopped_total", "Sessions stopped.", ("reason",))
+    latency = registry.histogram("call_seconds", "Call latency.", ("service",), buckets=(0.1, 1.0))
+    registry.register_collector(lambda: [("sessions_active", "gauge", "Active sessions.", [({}, 3)])])
+
+    started.inc()
+    started.inc(2)
+    stopped.labels('idle "timeout"').inc()
+    for value in (0.05, 0.5, 0.5, 7.0):
+        latency.labels("s3").observe(value)
+
+    lines = registry.render().splitlines()
+    assert "# TYPE sessions_started_total counter" in lines
+    assert "sessions_started_total 3" in lines
+    assert 'sessions_stopped_total{reason="idle \\"timeout\\""} 1' in lines
+    assert 'call_seconds_bucket{service="s3",le="0.1"} 1' in lines
+    assert 'call_seconds_bucket{service="s3",le="1"} 3' in lines
+    assert 'call_seconds_bucket{service="s3",le="+Inf"} 4' in lines
+    assert 'call_seconds_sum{service="s3"} 8.05' in lines
+    assert 'call_seconds_count{service="s3"} 4' in lines
+    assert "sessions_active 3" in lines
+
+    assert registry.counter("sessions_started_total", "Sessions started.") is started
+    with pytest.raises(ValueError):
+        registry.gauge("sessions_started_total", "Clash.")
+
+
+def test_track_call_counts_errors_and_flight_events_feed_histograms() -> None:
+    errors = EXTERNAL_CALL_ERRORS.labels("upstage", "test_op")
+    with pytest.raises(RuntimeError):
+        with track_call("upstage", "test_op"):
+            raise RuntimeError("boom")
+    with track_call("upstage", "test_op"):
+        pass
+    assert errors.value == 1
+    assert 'external_call_duration_seconds_count{service="upstage",operation="test_op"} 2' in REGISTRY.render()
+
+    first_words = sum(TIME_TO_FIRST_WORD._default.counts)
+    auth_errors = SESSION_ERRORS.labels("TEST_CODE").value
+    flight = FlightRecorder("session-1")
+    flight.add((100.0, "audio.first_frame", {}))
+    flight.add((100.8, "stt.first_partial", {"chars": 3}))
+    flight.add((101.0, "error", {"code": "TEST_CODE"}))
+
+    assert sum(TIME_TO_FIRST_WORD._default.counts) == first_words + 1
+    assert SESSION_ERRORS.labels("TEST_CODE").value == auth_errors + 1
+
+
+def test_metrics_endpoint_requires_the_bearer_token_when_configured(monkeypatch: pytest.MonkeyPatch) -> None:
+    from fastapi import Depends, FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.api.dependencies import require_metrics_token
+    from app.core.config import settings
+
+    app = FastAPI()
+    app.get("/metrics", dependencies=[Depends(require_metrics_token)])(lambda: "ok")
+    client = TestClient(app)
+
+    monkeypatch.setattr(settings, "metrics_token", None)
+    assert client.get("/metrics").status_code == 200
+
+    monkeypatch.setattr(settings, "metrics_token", "scrape-secret")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"}).status_code == 200
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import io
+import sys
+from pathlib import Path
+from typing import List
+
+import pytest
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.core.config import settings
+from app.core.uploads import BodySizeLimitMiddleware, UploadSource
+from app.services.storage_service import StorageService
+
+
+class _FakeS3:
+    def __init__(self, fail_part: int = 0) -> None:
+        self.fail_part = fail_part
+        self.parts: List[tuple] = []
+        self.completed: List[dict] = []
+        self.aborted: List[str] = []
+
+    def create_multipart_upload(self, **params):
+        return {"UploadId": "upload-1"}
+
+    def upload_part(self, *, PartNumber, Body, **params):
+        if PartNumber == self.fail_part:
+            raise RuntimeError("part failed")
+        self.parts.append((PartNumber, Body))
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, *, MultipartUpload, **params):
+        self.completed = MultipartUpload["Parts"]
+
+    def abort_multipart_upload(self, *, UploadId, **params):
+        self.aborted.append(UploadId)
+
+
+def _storage(client: _FakeS3, monkeypatch: pytest.MonkeyPatch) -> StorageService:
+    monkeypatch.setattr("app.services.storage_service._MIN_PART_SIZE", 1)
+    monkeypatch.setattr(settings, "upload_part_size_bytes", 4)
+    monkeypatch.setattr(settings, "upload_part_concurrency", 2)
+    storage = StorageService.__new__(StorageService)
+    storage._bucket = "bucket"
+    storage._client = client
+    return storage
+
+
+@pytest.mark.asyncio
+async def test_large_source_is_uploaded_in_ordered_parts(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = _FakeS3()
+    source = UploadSource(io.BytesIO(b"0123456789"))
+
+    await _storage(client, monkeypatch).upload_source("ocr/key.pdf", source)
+
+    assert sorted(client.parts) == [(1, b"0123"), (2, b"4567"), (3, b"89")]
+    assert client.completed == [{"PartNumber": n, "ETag": f"etag-{n}"} for n in (1, 2, 3)]
+    assert client.aborted == []
+
+
+@pytest.mark.asyncio
+async def test_failed_part_aborts_the_multipart_upload(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = _FakeS3(fail_part=2)
+    source = UploadSource(io.BytesIO(b"0123456789"))
+
+    with pytest.raises(RuntimeError):
+        await _storage(client, monkeypatch).upload_source("ocr/key.pdf", source)
+
+    assert client.completed == []
+    assert client.aborted == ["upload-1"]
+
+
+def test_readers_keep_independent_positions() -> None:
+    source = UploadSource(io.BytesIO(b"abcdefgh"))
+    first, second = source.open(), source.open()
+
+    assert first.read(3) == b"abc"
+    assert second.read(5) == b"abcde"
+    assert first.read() == b"defgh"
+    second.seek(0)
+    assert second.read() == b"abcdefgh"
+    assert source.size == 8
+
+
+def test_body_limit_rejects_oversized_uploads() -> None:
+    app = FastAPI()
+    app.add_middleware(BodySizeLimitMiddleware, limits=[(r"^/upload$", 1024)])
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)) -> dict:
+        return {"size": UploadSource(file.file).size}
+
+    client = TestClient(app)
+    small = client.post("/upload", files={"file": ("a.pdf", b"x" * 100)})
+    assert small.status_code == 200
+    assert small.json() == {"size": 100}
+
+    large = client.post("/upload", files={"file": ("a.pdf", b"x" * 4096)})
+    assert large.status_code == 413
+
+    def chunked():
+        for _ in range(8):
+            yield b"x" * 512
+
+    streamed = client.post(
+        "/upload",
+        content=chunked(),
+        headers={"content-type": "multipart/form-data; boundary=b"},
+    )
+    assert streamed.status_code == 413
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.core.config import Settings
+from app.jobs.queue import Job, backoff_seconds
+from app.jobs.worker import JobWorker
+
+
+class _Queue:
+    """In-memory stand-in for JobQueue's lease protocol."""
+
+    def __init__(self, jobs: List[Job]) -> None:
+        self.pending = list(jobs)
+        self.completed: List[str] = []
+        self.failed: List[tuple[str, str]] = []
+        self.lease_valid = True
+
+    async def lease(self, worker_id: str, kinds: Sequence[str]) -> Optional[Job]:
+        for job in self.pending:
+            if job.kind in kinds:
+                self.pending.remove(job)
+                job.attempts += 1
+                return job
+        return None
+
+    async def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        return self.lease_valid
+
+    async def complete(self, job_id: str, worker_id: str) -> None:
+        self.completed.append(job_id)
+
+    async def fail(self, job: Job, worker_id: str, error: str) -> bool:
+        self.failed.append((job.job_id, error))
+        return job.final_attempt
+
+
+def _job(job_id: str, kind: str = "test.kind", payload: Optional[Dict[str, Any]] = None) -> Job:
+    return Job(job_id=job_id, kind=kind, payload=payload or {}, attempts=0, max_attempts=3)
+
+
+@pytest.mark.asyncio
+async def test_worker_completes_and_fails_jobs() -> None:
+    seen: List[str] = []
+
+    async def handler(job: Job) -> None:
+        seen.append(job.job_id)
+        if job.payload.get("boom"):
+            raise ValueError("bad document")
+
+    queue = _Queue([_job("ok"), _job("bad", payload={"boom": True}), _job("other", kind="unhandled")])
+    worker = JobWorker(queue, {"test.kind": handler}, Settings(JOB_WORKER_CONCURRENCY=2))  # type: ignore[arg-type]
+
+    assert await worker.run_once()
+    assert await worker.run_once()
+    assert not await worker.run_once()
+
+    assert seen == ["ok", "bad"]
+    assert queue.completed == ["ok"]
+    assert queue.failed == [("bad", "ValueError: bad document")]
+    assert [job.job_id for job in queue.pending] == ["other"]
+
+
+@pytest.mark.asyncio
+async def test_worker_abandons_job_when_lease_is_lost() -> None:
+    cancelled = asyncio.Event()
+
+    async def slow_handler(job: Job) -> None:
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    queue = _Queue([_job("slow")])
+    queue.lease_valid = False
+    settings = Settings(JOB_LEASE_SEC=0.1, JOB_POLL_INTERVAL_SEC=0.01)
+    worker = JobWorker(queue, {"test.kind": slow_handler}, settings)  # type: ignore[arg-type]
+
+    await asyncio.wait_for(worker.run_once(), timeout=5)
+    assert cancelled.is_set()
+    assert queue.completed == [] and queue.failed == []
+
+
+def test_backoff_grows_and_is_capped() -> None:
+    assert 2.5 <= backoff_seconds(1, base=5, cap=600) <= 5
+    assert 10 <= backoff_seconds(3, base=5, cap=600) <= 20
+    assert 300 <= backoff_seconds(20, base=5, cap=600) <= 600
+
+
+@pytest.mark.asyncio
+async def test_stopping_a_saturated_worker_leases_nothing_more() -> None:
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def handler(job: Job) -> None:
+        started.set()
+        await release.wait()
+
+    queue = _Queue([_job("running"), _job("next")])
+    leases = 0
+    lease = queue.lease
+
+    async def counting_lease(worker_id: str, kinds: Sequence[str]) -> Optional[Job]:
+        nonlocal leases
+        leases += 1
+        return await lease(worker_id, kinds)
+
+    queue.lease = counting_lease  # type: ignore[method-assign]
+    worker = JobWorker(queue, {"test.kind": handler}, Settings(JOB_WORKER_CONCURRENCY=1))  # type: ignore[arg-type]
+    run = asyncio.create_task(worker.run())
+    await asyncio.wait_for(started.wait(), timeout=1)
+
+    worker.stop()
+    release.set()
+    await asyncio.wait_for(run, timeout=1)
+
+    assert leases == 1
+    assert queue.completed == ["running"]
+    assert [job.job_id for job in queue.pending] == ["next"]
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pypdfium2 as pdfium
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.core.config import settings
+from app.use_cases.ocr.ocr_usecase import OCRUsecase
+from app.use_cases.ocr.services.chunking import ChunkPacker, pack_chunks
+from app.use_cases.ocr.services.pdf_pages import split_pdf
+from app.use_cases.ocr.services.schema_loader import CompiledPrompt
+from app.use_cases.ocr.services.upstage_client import merge_ocr_responses
+
+PROMPT = CompiledPrompt(prefix="", schema={}, version="v1", stamps=(), prefix_tokens=100)
+
+
+def _pdf(pages: int) -> bytes:
+    document = pdfium.PdfDocument.new()
+    for _ in range(pages):
+        document.new_page(595, 842)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    document.close()
+    return buffer.getvalue()
+
+
+def _page_count(data: bytes) -> int:
+    document = pdfium.PdfDocument(data)
+    try:
+        return len(document)
+    finally:
+        document.close()
+
+
+def test_split_pdf_into_page_ranges() -> None:
+    parts = split_pdf(_pdf(5), pages_per_part=2)
+
+    assert [_page_count(part) for part in parts] == [2, 2, 1]
+    assert split_pdf(io.BytesIO(_pdf(3)), pages_per_part=1) != []
+    assert split_pdf(_pdf(1), pages_per_part=1) == []
+    assert split_pdf(b"not a pdf", pages_per_part=1) == []
+
+
+def test_merged_responses_keep_page_order_and_numbering() -> None:
+    responses = [
+        {"text": "1쪽", "pages": [{"id": 1, "text": "1쪽"}], "metadata": {"pages": [{"page": 1}]},
+         "numBilledPages": 1, "confidence": 0.9},
+        {"text": "2쪽\n3쪽", "pages": [{"id": 1, "text": "2쪽"}, {"id": 2, "text": "3쪽"}],
+         "metadata": {"pages": [{"page": 1}, {"page": 2}]}, "numBilledPages": 2, "confidence": 0.6},
+    ]
+
+    merged = merge_ocr_responses(responses)
+
+    assert merged["text"] == "1쪽\n2쪽\n3쪽"
+    assert [page["id"] for page in merged["pages"]] == [1, 2, 3]
+    assert [page["page"] for page in merged["metadata"]["pages"]] == [1, 2, 3]
+    assert merged["numBilledPages"] == 3
+    assert merged["confidence"] == pytest.approx(0.7)
+
+
+def test_streaming_packer_matches_pack_chunks() -> None:
+    pages = [f"{n}페이지 " + "가" * (100 * n) for n in range(1, 7)]
+    packer = ChunkPacker(700, "gpt-4o-mini")
+    streamed = [chunk for page in pages for chunk in packer.add(page)] + [packer.flush()]
+
+    assert streamed == pack_chunks(pages, 700, "gpt-4o-mini")
+    assert packer.flush() is None
+
+
+def _usecase(page_texts: list, order: list, parsed_before_last: list) -> OCRUsecase:
+    usecase = OCRUsecase.__new__(OCRUsecase)
+    usecase.cache = MagicMock()
+    usecase.schema_loader = MagicMock()
+    usecase.schema_loader.compile = MagicMock(return_value=PROMPT)
+    usecase.openai_parser = MagicMock(model="gpt-4o-mini")
+    usecase.upstage_client = MagicMock()
+    usecase.upstage_client.ocr_document = AsyncMock()
+    delivered: list = []
+
+    async def ocr_parts(parts, concurrency):
+        assert concurrency == settings.ocr_page_concurrency
+        for index in order:
+            await asyncio.sleep(0.01)
+            delivered.append(index)
+            yield index, {"text": page_texts[index], "pages": [{"id": 1, "text": page_texts[index]}]}
+
+    async def parse(prompt: str):
+        if len(delivered) < len(page_texts):
+            parsed_before_last.append(prompt)
+        return {"페이지": [prompt.split("[입력 문서]\n", 1)[1].split("페이지", 1)[0]]}
+
+    usecase.upstage_client.ocr_parts = ocr_parts
+    usecase.openai_parser.parse_with_schema = AsyncMock(side_effect=parse)
+    return usecase
+
+
+@pytest.mark.asyncio
+async def test_pages_are_ocred_in_parallel_and_stitched_in_order(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "ocr_pages_per_request", 1)
+    monkeypatch.setattr(settings, "ocr_prompt_max_tokens", 16000)
+    page_texts = [f"{n}페이지 본문" for n in range(1, 5)]
+    parsed_early: list = []
+    usecase = _usecase(page_texts, [2, 0, 3, 1], parsed_early)
+
+    result = await usecase.run("ocr/key.pdf", document=io.BytesIO(_pdf(4)))
+
+    assert result.raw["text"] == "\n".join(page_texts)
+    assert [page["id"] for page in result.raw["pages"]] == [1, 2, 3, 4]
+    # Short documents still get a single parse call on the stitched text.
+    usecase.openai_parser.parse_with_schema.assert_awaited_once_with(PROMPT.render(result.raw["text"]))
+    usecase.upstage_client.ocr_document.assert_not_awaited()
+    assert parsed_early == []
+
+
+@pytest.mark.asyncio
+async def test_long_documents_start_parsing_before_the_last_page_arrives(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "ocr_pages_per_request", 1)
+    monkeypatch.setattr(settings, "ocr_prompt_max_tokens", 1000)
+    page_texts = [f"{n}페이지 " + "등기" * 300 for n in range(1, 6)]
+    parsed_early: list = []
+    usecase = _usecase(page_texts, [1, 0, 2, 4, 3], parsed_early)
+
+    result = await usecase.run("ocr/key.pdf", document=_pdf(5))
+
+    assert parsed_early
+    assert result.parsed["페이지"][0] == "1"
+    assert usecase.openai_parser.parse_with_schema.await_count > 1
+    assert result.raw["text"] == "\n".join(page_texts)
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.core.config import settings
+from app.use_cases.ocr.ocr_usecase import OCRUsecase, SectionParseError
+from app.use_cases.ocr.services.chunking import merge_partials, pack_chunks, split_pages
+from app.use_cases.ocr.services.openai_parser import LLM_TOKENS, OpenAIParser
+from app.use_cases.ocr.services.prompt_compactor import compact_schema, dump_compact
+from app.use_cases.ocr.services.schema_loader import SchemaLoader
+from app.use_cases.ocr.services.token_counter import count_tokens
+
+SCHEMA_DIR = Path(__file__).resolve().parents[2] / "app" / "use_cases" / "ocr" / "schema"
+
+
+def _resolve(node, defs):
+    if isinstance(node, dict):
+        if "$ref" in node:
+            return _resolve(defs[node["$ref"].rsplit("/", 1)[1]], defs)
+        return {key: _resolve(value, defs) for key, value in node.items() if key != "$defs"}
+    if isinstance(node, list):
+        return [_resolve(item, defs) for item in node]
+    return node
+
+
+@pytest.mark.parametrize("contract_type", ["주택임대차표준계약서", "중개대상물확인설명서", "등기사항전부증명서"])
+def test_compacted_schema_describes_the_same_structure(contract_type: str) -> None:
+    schema = json.loads((SCHEMA_DIR / f"{contract_type}.json").read_text(encoding="utf-8"))
+    compacted = compact_schema(schema)
+
+    assert _resolve(compacted, compacted.get("$defs", {})) == schema
+    assert len(dump_compact(compacted)) < len(json.dumps(schema, ensure_ascii=False, indent=2)) / 2
+
+
+def test_compaction_strips_annotations_but_keeps_fields_named_like_them() -> None:
+    person = {
+        "type": "object",
+        "description": "당사자",
+        "properties": {name: {"type": ["string", "null"], "title": name} for name in ("성명", "주소", "전화")},
+    }
+    schema = {
+        "title": "계약서",
+        "type": "object",
+        "properties": {"임대인": person, "임차인": person, "description": {"type": "string", "examples": ["x"]}},
+    }
+
+    compacted = compact_schema(schema, min_ref_chars=40)
+
+    assert compacted["title"] == "계약서"
+    assert compacted["properties"]["description"] == {"type": "string"}
+    assert compacted["properties"]["임대인"] == compacted["properties"]["임차인"] == {"$ref": "#/$defs/임대인"}
+    assert "description" not in compacted["$defs"]["임대인"]
+
+
+def test_compact_mode_changes_schema_version() -> None:
+    assert SchemaLoader(compact=True).schema_version("등기사항전부증명서") != SchemaLoader(
+        compact=False
+    ).schema_version("등기사항전부증명서")
+
+
+def test_section_schemas_only_version_section_parsing() -> None:
+    loader = SchemaLoader(compact=False)
+    contract_type = "주택임대차표준계약서"
+    prompt_dir = SCHEMA_DIR.parent / "prompt"
+    source = (prompt_dir / f"{contract_type}.txt").read_bytes() + (SCHEMA_DIR / f"{contract_type}.json").read_bytes()
+
+    # Section files exist for this type, but single-prompt results keep the version they had without them.
+    assert loader.schema_version(contract_type) == hashlib.sha256(source).hexdigest()[:12]
+    assert loader.compile(contract_type).section_version not in ("", loader.schema_version(contract_type))
+
+
+@pytest.mark.asyncio
+async def test_parser_records_token_usage() -> None:
+    parser = OpenAIParser.__new__(OpenAIParser)
+    parser.model = "test-model"
+    parser.client = MagicMock()
+    parser.client.chat.completions.create = AsyncMock(
+        return_value=SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content='{"rent": "1000"}'))],
+            usage=SimpleNamespace(prompt_tokens=1200, completion_tokens=30),
+        ),
+    )
+
+    parsed, usage = await parser.parse_with_usage("보증금 1000만원")
+
+    assert parsed == {"rent": "1000"}
+    assert (usage.input_tokens, usage.output_tokens) == (1200, 30)
+    assert usage.estimated_input_tokens > 0
+    assert LLM_TOKENS.labels("test-model", "input").value == 1200
+    assert LLM_TOKENS.labels("test-model", "output").value == 30
+
+
+@pytest.mark.asyncio
+async def test_section_parsing_merges_sections_and_retries_only_the_failed_one(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "ocr_parse_sections", True)
+    monkeypatch.setattr(settings, "ocr_section_max_attempts", 2)
+    usecase = OCRUsecase.__new__(OCRUsecase)
+    usecase.schema_loader = SchemaLoader()
+    usecase.openai_parser = MagicMock(model="model-a")
+    calls: list = []
+
+    async def parse(prompt: str):
+        section = prompt.split('문서 전체 중 "', 1)[1].split('"', 1)[0]
+        calls.append(section)
+        if section == "특약사항" and calls.count(section) == 1:
+            raise ValueError("invalid JSON")
+        if section == "서명란":
+            return {"서명란": {"임대인": {"성명": "홍길동"}}}
+        return {"section": section}
+
+    usecase.openai_parser.parse_with_schema = AsyncMock(side_effect=parse)
+
+    result = await usecase.reparse({"text": "계약서"}, "주택임대차표준계약서")
+
+    sections = ["기본정보", "임차주택의표시", "계약내용", "특약사항", "서명란", "별지"]
+    assert list(result.parsed) == sections
+    assert result.parsed["서명란"] == {"임대인": {"성명": "홍길동"}}
+    assert result.parsed["별지"] == {"section": "별지"}
+    assert sorted(calls) == sorted(sections + ["특약사항"])
+    assert result.schema_version.endswith("-sections")
+
+    monkeypatch.setattr(settings, "ocr_section_max_attempts", 1)
+    calls.clear()
+    with pytest.raises(SectionParseError) as failure:
+        await usecase.reparse({"text": "계약서"}, "주택임대차표준계약서")
+    assert failure.value.sections == ["특약사항"]
+
+
+@pytest.mark.asyncio
+async def test_prompt_is_resolved_once_per_document(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "ocr_parse_sections", True)
+    loader = SchemaLoader()
+    usecase = OCRUsecase.__new__(OCRUsecase)
+    usecase.schema_loader = MagicMock(wraps=loader)
+    usecase.openai_parser = MagicMock(model="model-a")
+    usecase.openai_parser.parse_with_schema = AsyncMock(return_value={})
+
+    result = await usecase.reparse({"text": "계약서"}, "주택임대차표준계약서")
+
+    # Six section prompts, one version and one chunk budget, all from a single compile() (file stats) call.
+    assert usecase.openai_parser.parse_with_schema.await_count == 6
+    assert result.schema_version == f"{loader.compile('주택임대차표준계약서').section_version}-sections"
+    assert usecase.schema_loader.compile.call_count == 1
+
+
+def test_chunks_respect_page_boundaries_and_the_token_budget() -> None:
+    pages = [{"text": f"{n}페이지 " + "가" * 300} for n in range(1, 6)]
+    ocr_result = {"text": "\n".join(page["text"] for page in pages), "pages": pages}
+
+    chunks = pack_chunks(split_pages(ocr_result), budget_tokens=700, model="gpt-4o-mini")
+
+    assert len(chunks) == 3
+    assert all(count_tokens(chunk, "gpt-4o-mini") <= 700 for chunk in chunks)
+    assert chunks[0].startswith("1페이지") and chunks[-1].startswith("5페이지")
+    assert pack_chunks(["줄" * 50 + "\n" + "말" * 50], budget_tokens=60, model="gpt-4o-mini") == ["줄" * 50, "말" * 50]
+
+
+def test_merge_partials_is_deterministic() -> None:
+    partials = [
+        {"문서정보": {"고유번호": "1101-2020", "발급일자": None}, "갑구": [{"순위번호": "1"}], "근저당": False},
+        {"문서정보": {"고유번호": "9999", "발급일자": "2024-01-02"}, "갑구": [{"순위번호": "1"}, {"순위번호": "2"}], "근저당": True},
+        {"문서정보": {}, "을구": ["말소"]},
+    ]
+
+    assert merge_partials(partials) == {
+        "문서정보": {"고유번호": "1101-2020", "발급일자": "2024-01-02"},
+        "갑구": [{"순위번호": "1"}, {"순위번호": "2"}],
+        "근저당": True,
+        "을구": ["말소"],
+    }
+
+
+@pytest.mark.asyncio
+async def test_long_documents_are_parsed_in_concurrent_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "ocr_prompt_max_tokens", 1500)
+    monkeypatch.setattr(settings, "ocr_chunk_concurrency", 2)
+    usecase = OCRUsecase.__new__(OCRUsecase)
+    usecase.schema_loader = SchemaLoader()
+    usecase.openai_parser = MagicMock(model="gpt-4o-mini")
+    in_flight = peak = 0
+
+    async def parse(prompt: str):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        page = prompt.split("[입력 문서]\n", 1)[1].split("페이지", 1)[0]
+        return {"갑구": [{"순위번호": page}]}
+
+    usecase.openai_parser.parse_with_schema = AsyncMock(side_effect=parse)
+    pages = [{"text": f"{n}페이지 " + "등기" * 400} for n in range(1, 6)]
+
+    ocr_result = {"text": "\n".join(page["text"] for page in pages), "pages": pages}
+
+    result = await usecase.reparse(ocr_result, "등기사항전부증명서")
+
+    calls = usecase.openai_parser.parse_with_schema.await_count
+    assert calls > 1 and peak == 2
+    assert [entry["순위번호"] for entry in result.parsed["갑구"]][0] == "1"
@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import io
+import os
+import sys
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Optional
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.api.v1 import admin
+from app.core.config import settings
+from app.core.uploads import UploadSource
+from app.models import OcrBase
+from app.services.ocr_service import OcrService, sweep_ocr_spool
+from app.use_cases.ocr.ocr_usecase import OCRUsecase, OcrResult
+from app.use_cases.ocr.services.schema_loader import CompiledPrompt
+from app.use_cases.ocr.services.schema_loader import SchemaLoader
+
+
+def _result(detail: dict) -> OcrResult:
+    return OcrResult(raw={"text": "계약서"}, parsed=detail, schema_version="v1", model="model-a")
+
+
+def _stub(monkeypatch: pytest.MonkeyPatch, detail: dict, cached: Optional[dict] = None) -> MagicMock:
+    usecase = MagicMock()
+    usecase.documents = []
+    usecase.lookup = AsyncMock(return_value=_result(cached) if cached is not None else None)
+
+    async def run(object_key, document=None, content_hash=None):
+        usecase.documents.append(document.read() if document is not None else None)
+        return _result(detail)
+
+    usecase.run = AsyncMock(side_effect=run)
+    monkeypatch.setattr("app.services.ocr_service.get_ocr_usecase", lambda: usecase)
+
+    @asynccontextmanager
+    async def session_ctx():
+        yield object()
+
+    monkeypatch.setattr("app.services.ocr_service.get_session", session_ctx)
+    return usecase
+
+
+def _storage() -> MagicMock:
+    storage = MagicMock()
+    storage.upload_source = AsyncMock()
+    storage.download_bytes = AsyncMock(return_value=b"from-s3")
+    storage.generate_presigned_url = AsyncMock(return_value="https://example/object")
+    return storage
+
+
+@pytest.mark.asyncio
+async def test_upload_runs_ocr_on_request_body(monkeypatch: pytest.MonkeyPatch) -> None:
+    usecase = _stub(monkeypatch, {"rent": 1000})
+    repository = MagicMock()
+    repository.upsert = AsyncMock()
+    repository.store_raw = AsyncMock()
+    storage = _storage()
+
+    response = await OcrService(repository, storage).upload_document(
+        "user-1", "room-1", "contract.pdf", None, UploadSource(io.BytesIO(b"%PDF-1.7")), "application/pdf",
+    )
+
+    storage.upload_source.assert_awaited_once()
+    assert usecase.run.await_args.args == ("ocr/user-1/contract.pdf",)
+    assert usecase.documents == [b"%PDF-1.7"]
+    assert usecase.run.await_args.kwargs["content_hash"] == hashlib.sha256(b"%PDF-1.7").hexdigest()
+    storage.download_bytes.assert_not_awaited()
+    record = repository.upsert.await_args.args[0]
+    assert (record.detail, record.schema_version, record.parse_model) == ({"rent": 1000}, "v1", "model-a")
+    repository.store_raw.assert_awaited_once_with("user-1", "contract", {"text": "계약서"})
+    assert response.status == "done"
+
+
+@pytest.mark.asyncio
+async def test_queued_document_prefers_spooled_copy(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    usecase = _stub(monkeypatch, {"rent": 1000})
+    record = OcrBase(ocr_id="contract", user_id="user-1", status="queued", object_key="ocr/user-1/contract.pdf")
+    repository = MagicMock()
+    repository.get = AsyncMock(return_value=record)
+    repository.update = AsyncMock(return_value=True)
+    repository.store_raw = AsyncMock()
+    service = OcrService(repository, _storage())
+
+    spool = tmp_path / "upload.pdf"
+    spool.write_bytes(b"%PDF-spooled")
+    await service.process_document("user-1", "contract", str(spool))
+    assert usecase.documents == [b"%PDF-spooled"]
+    assert not spool.exists()
+
+    # A retry on a node without the spool volume falls back to S3 (document=None).
+    await service.process_document("user-1", "contract", str(spool))
+    assert usecase.documents[-1] is None
+    assert repository.update.await_args.args[2]["detail"] == {"rent": 1000}
+    assert repository.store_raw.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_duplicate_upload_is_served_from_cache_without_queueing(monkeypatch: pytest.MonkeyPatch) -> None:
+    usecase = _stub(monkeypatch, {"rent": 1000}, cached={"rent": 900})
+    repository = MagicMock()
+    repository.upsert = AsyncMock()
+    repository.store_raw = AsyncMock()
+    storage = _storage()
+    jobs = MagicMock()
+    jobs.enqueue = AsyncMock()
+
+    response = await OcrService(repository, storage, jobs).upload_document(
+        "user-2", "room-2", "contract.pdf", None, UploadSource(io.BytesIO(b"%PDF-1.7")), "application/pdf",
+    )
+
+    usecase.lookup.assert_awaited_once_with(hashlib.sha256(b"%PDF-1.7").hexdigest())
+    usecase.run.assert_not_awaited()
+    jobs.enqueue.assert_not_awaited()
+    storage.upload_source.assert_awaited_once()
+    assert repository.upsert.await_args.args[0].detail == {"rent": 900}
+    assert response.status == "done"
+
+
+@pytest.mark.asyncio
+async def test_cache_miss_is_queued_with_its_content_hash(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(settings, "ocr_spool_dir", str(tmp_path))
+    usecase = _stub(monkeypatch, {"rent": 1000})
+    repository = MagicMock()
+    repository.upsert = AsyncMock()
+    jobs = MagicMock()
+    jobs.enqueue = AsyncMock()
+
+    response = await OcrService(repository, _storage(), jobs).upload_document(
+        "user-3", "room-3", "contract.pdf", None, UploadSource(io.BytesIO(b"%PDF-1.7")), "application/pdf",
+    )
+
+    usecase.run.assert_not_awaited()
+    assert response.status == "queued"
+    assert repository.upsert.await_args.args[0].detail == {}
+    kind, payload = jobs.enqueue.await_args.args
+    assert payload["content_hash"] == hashlib.sha256(b"%PDF-1.7").hexdigest()
+    assert Path(payload["spool_path"]).read_bytes() == b"%PDF-1.7"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("failing", ["upload", "enqueue"])
+async def test_spool_file_is_removed_when_the_job_is_not_queued(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, failing: str,
+) -> None:
+    monkeypatch.setattr(settings, "ocr_spool_dir", str(tmp_path))
+    _stub(monkeypatch, {"rent": 1000})
+    repository = MagicMock()
+    repository.upsert = AsyncMock()
+    storage = _storage()
+    jobs = MagicMock()
+    jobs.enqueue = AsyncMock()
+    failure = storage.upload_source if failing == "upload" else jobs.enqueue
+    failure.side_effect = RuntimeError(failing)
+
+    with pytest.raises(RuntimeError, match=failing):
+        await OcrService(repository, storage, jobs).upload_document(
+            "user-4", "room-4", "contract.pdf", None, UploadSource(io.BytesIO(b"%PDF-1.7")), "application/pdf",
+        )
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_sweep_removes_only_stale_spool_files(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(settings, "ocr_spool_dir", str(tmp_path))
+    stale, fresh = tmp_path / "stale.pdf", tmp_path / "fresh.pdf"
+    stale.write_bytes(b"%PDF")
+    fresh.write_bytes(b"%PDF")
+    os.utime(stale, (time.time() - 7200, time.time() - 7200))
+
+    assert sweep_ocr_spool(max_age_sec=3600) == 1
+    assert not stale.exists() and fresh.exists()
+
+
+class _Cache:
+    def __init__(self) -> None:
+        self.entries: dict = {}
+
+    cache_key = staticmethod(lambda *parts: ":".join(parts))
+
+    async def get(self, key):
+        return self.entries.get(key)
+
+    async def find_raw(self, content_hash):
+        return next((entry for key, entry in self.entries.items() if key.startswith(f"{content_hash}:")), None)
+
+    async def put(self, key, **entry):
+        self.entries.setdefault(key, entry)
+
+
+@pytest.mark.asyncio
+async def test_usecase_caches_by_content_schema_version_and_model() -> None:
+    usecase = OCRUsecase.__new__(OCRUsecase)
+    usecase.cache = _Cache()
+    usecase.storage_service = MagicMock()
+    usecase.upstage_client = MagicMock()
+    usecase.upstage_client.ocr_document = AsyncMock(return_value={"text": "보증금 1000"})
+    usecase.schema_loader = MagicMock()
+    usecase.schema_loader.compile = MagicMock(
+        return_value=CompiledPrompt(prefix="", schema={}, version="v1", stamps=(), prefix_tokens=100),
+    )
+    usecase.openai_parser = MagicMock(model="model-a")
+    usecase.openai_parser.parse_with_schema = AsyncMock(return_value={"rent": 1000})
+
+    assert await usecase.lookup("abc") is None
+    await usecase.process("ocr/key.pdf", document=b"%PDF", content_hash="abc")
+    assert (await usecase.lookup("abc")).parsed == {"rent": 1000}
+
+    # A new model misses the exact key but re-parses the cached Upstage response instead of re-running OCR.
+    usecase.openai_parser.model = "model-b"
+    assert await usecase.lookup("abc") is None
+    await usecase.process("ocr/key.pdf", document=b"%PDF", content_hash="abc")
+    usecase.upstage_client.ocr_document.assert_awaited_once()
+    assert usecase.openai_parser.parse_with_schema.await_count == 2
+    assert (await usecase.lookup("abc")).parsed == {"rent": 1000}
+
+
+@pytest.mark.asyncio
+async def test_reparse_reruns_only_the_parse_stage_with_bounded_concurrency(monkeypatch: pytest.MonkeyPatch) -> None:
+    usecase = _stub(monkeypatch, {})
+    usecase.current_version = MagicMock(return_value=("v2", "model-a"))
+    in_flight = peak = 0
+
+    async def reparse(raw, content_hash=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if raw["text"] == "broken":
+            raise ValueError("bad json")
+        return OcrResult(raw=raw, parsed={"text": raw["text"]}, schema_version="v2", model="model-a")
+
+    usecase.reparse = AsyncMock(side_effect=reparse)
+    stored = [{"_id": f"ocr-{n}", "user_id": "user-1", "ocr_raw": {"text": str(n)}} for n in range(10)]
+    stored.append({"_id": "ocr-broken", "user_id": "user-1", "ocr_raw": {"text": "broken"}})
+
+    async def candidates(schema_version, model, force=False):
+        assert (schema_version, model, force) == ("v2", "model-a", False)
+        for document in stored:
+            yield document
+
+    repository = MagicMock()
+    repository.iter_reparse_candidates = candidates
+    repository.update = AsyncMock(return_value=True)
+    monkeypatch.setattr(settings, "ocr_reparse_concurrency", 3)
+
+    counts = await OcrService(repository, _storage()).reparse_stored()
+
+    assert counts == {"reparsed": 10, "failed": 1}
+    assert peak == 3
+    usecase.run.assert_not_awaited()
+    assert repository.update.await_count == 10
+    assert repository.update.await_args_list[0].args[2]["schema_version"] == "v2"
+
+
+def test_schema_loader_reuses_compiled_prompt_until_files_change(tmp_path: Path) -> None:
+    loader = SchemaLoader(compact=False)
+    loader.prompt_dir = loader.schema_dir = tmp_path
+    (tmp_path / "lease.txt").write_text("스키마:\n{JSON Schema}", encoding="utf-8")
+    schema_path = tmp_path / "lease.json"
+    schema_path.write_text('{"rent": "number"}', encoding="utf-8")
+
+    assert loader.warm() == ["lease"]
+    compiled = loader.compile("lease")
+    assert loader.load_prompt("lease", "보증금") == '스키마:\n{\n  "rent": "number"\n}\n\n[입력 문서]\n보증금\n\n[출력]\n'
+    assert loader.compile("lease") is compiled
+
+    schema_path.write_text('{"deposit": "number"}', encoding="utf-8")
+    os.utime(schema_path, ns=(compiled.stamps[1][0] + 1_000_000_000,) * 2)
+    assert '"deposit"' in loader.load_prompt("lease", "보증금")
+    assert loader.schema_version("lease") != compiled.version
+
+
+def test_reparse_endpoint_refuses_when_no_worker_would_run_it(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "admin_token", "secret")
+    monkeypatch.setattr(settings, "jobs_enabled", False)
+    queue = MagicMock()
+    queue.enqueue = AsyncMock(return_value="job-1")
+    monkeypatch.setattr(admin, "get_job_queue", lambda: queue)
+    app = FastAPI()
+    app.include_router(admin.router)
+    client = TestClient(app)
+
+    response = client.post("/admin/ocr/reparse", headers={"X-Admin-Token": "secret"})
+    assert response.status_code == 409
+    queue.enqueue.assert_not_awaited()
+
+    monkeypatch.setattr(settings, "jobs_enabled", True)
+    response = client.post("/admin/ocr/reparse?force=true", headers={"X-Admin-Token": "secret"})
+    assert response.status_code == 202
+    queue.enqueue.assert_awaited_once_with(admin.OCR_REPARSE_JOB, {"force": True}, max_attempts=3)
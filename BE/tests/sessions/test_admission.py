@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.core.config import Settings
+from app.sessions.admission import AdmissionController, LoadMonitor, SessionAdmissionError
+from app.sessions.registry import HOSTNAME, SessionRecord, SessionRegistry
+
+
+class _FixedLoad(LoadMonitor):
+    def __init__(self, load: float) -> None:
+        super().__init__()
+        self._load = load
+
+    @property
+    def cpu_load(self) -> float:
+        return self._load
+
+
+def _settings(tmp_path: Path, **overrides) -> Settings:
+    return Settings(
+        STORAGE_DIR=tmp_path / "recordings",
+        ANALYSIS_DIR=tmp_path / "analysis",
+        LOGS_DIR=tmp_path / "logs",
+        **overrides,
+    )
+
+
+async def _register(registry: SessionRegistry, session_id: str, user_id: str) -> None:
+    now = time.time()
+    await registry.register(
+        SessionRecord(
+            session_id=session_id,
+            worker_id="w",
+            host=HOSTNAME,
+            user_id=user_id,
+            created_at=now,
+            heartbeat_at=now,
+        ),
+    )
+
+
+@pytest.mark.asyncio
+async def test_node_and_user_limits(tmp_path: Path) -> None:
+    registry = SessionRegistry()
+    settings = _settings(tmp_path, STT_MAX_SESSIONS_PER_NODE=3, STT_MAX_SESSIONS_PER_USER=2)
+    admission = AdmissionController(settings, registry, monitor=_FixedLoad(0.0))
+
+    await _register(registry, "s1", "alice")
+    await _register(registry, "s2", "alice")
+    with pytest.raises(SessionAdmissionError) as excinfo:
+        await admission.check("alice")
+    assert excinfo.value.reason == "USER_SESSION_LIMIT"
+
+    await admission.check("bob")
+    await _register(registry, "s3", "bob")
+    with pytest.raises(SessionAdmissionError) as excinfo:
+        await admission.check("carol")
+    assert excinfo.value.reason == "NODE_AT_CAPACITY"
+    assert excinfo.value.retry_after == settings.stt_admission_retry_after_sec
+
+
+@pytest.mark.asyncio
+async def test_load_signals(tmp_path: Path) -> None:
+    settings = _settings(tmp_path, STT_ADMISSION_CPU_THRESHOLD=0.8, STT_ADMISSION_BACKLOG_THRESHOLD=0.5)
+
+    busy = AdmissionController(settings, SessionRegistry(), monitor=_FixedLoad(0.95))
+    with pytest.raises(SessionAdmissionError) as excinfo:
+        await busy.check(None)
+    assert excinfo.value.reason == "NODE_OVERLOADED"
+
+    idle = AdmissionController(settings, SessionRegistry(), monitor=_FixedLoad(0.1))
+    await idle.check(None, backlog=0.2)
+    with pytest.raises(SessionAdmissionError):
+        await idle.check(None, backlog=0.75)
+
+    # Load-based rejection is opt-in: with default thresholds a saturated node still admits.
+    defaults = AdmissionController(_settings(tmp_path), SessionRegistry(), monitor=_FixedLoad(0.95))
+    await defaults.check(None, backlog=0.9)
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+import time
+import wave
+from datetime import timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, List
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+from google.cloud.speech_v1 import types as speech_types
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.core.config import Settings
+from app.sessions.batch import AudioChunk, BatchTranscriber, iter_pcm_chunks
+from app.use_cases.stt.batch_usecase import STT_BATCH_JOB, STTBatchTranscriptionUseCase
+
+SAMPLE_RATE = 16000
+
+
+class _ScriptedClient:
+    """Answers chunk N with ``lines[N]`` as a single final result at 0.5-1.5 s into the chunk."""
+
+    def __init__(self, lines: List[str]) -> None:
+        self._lines = lines
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def streaming_recognize(self, requests: Iterable[Any], config: Any = None):
+        audio = b"".join(request.audio_content for request in requests)
+        with self._lock:
+            index = self.calls
+            self.calls += 1
+        text = self._lines[index % len(self._lines)]
+        words = [
+            speech_types.WordInfo(word=text, start_time=timedelta(seconds=0.5), end_time=timedelta(seconds=1.5)),
+        ]
+        assert audio
+        result = speech_types.StreamingRecognitionResult(
+            alternatives=[speech_types.SpeechRecognitionAlternative(transcript=text, words=words)],
+            is_final=True,
+        )
+        return iter([speech_types.StreamingRecognizeResponse(results=[result])])
+
+
+def _write_wav(path: Path, seconds: float) -> None:
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    samples = (np.sin(2 * np.pi * 220 * t) * 8000).astype(np.int16)
+    with wave.open(str(path), "wb") as handle:
+        handle.setnchannels(1)
+        handle.setsampwidth(2)
+        handle.setframerate(SAMPLE_RATE)
+        handle.writeframes(samples.tobytes())
+
+
+def test_chunks_cover_the_whole_file(tmp_path: Path) -> None:
+    path = tmp_path / "tone.wav"
+    _write_wav(path, 7.3)
+
+    chunks = list(iter_pcm_chunks(path, SAMPLE_RATE, chunk_seconds=2.0))
+
+    # Cuts move to the quietest point within a quarter chunk of the target length.
+    assert all(1.5 <= len(chunk.pcm) / 2 / SAMPLE_RATE <= 2.5 for chunk in chunks[:-1])
+    assert sum(len(chunk.pcm) for chunk in chunks) == int(7.3 * SAMPLE_RATE) * 2
+    for previous, current in zip(chunks, chunks[1:]):
+        assert current.offset == pytest.approx(previous.offset + len(previous.pcm) / 2 / SAMPLE_RATE)
+
+
+@pytest.mark.asyncio
+async def test_batch_transcription_shifts_offsets_and_extracts_qa(tmp_path: Path) -> None:
+    path = tmp_path / "session.wav"
+    _write_wav(path, 6.0)
+    settings = Settings(
+        STORAGE_DIR=tmp_path / "recordings",
+        ANALYSIS_DIR=tmp_path / "analysis",
+        LOGS_DIR=tmp_path / "logs",
+        STT_BATCH_CHUNK_SEC=2.0,
+        STT_BATCH_CONCURRENCY=2,
+        STT_BATCH_STREAM_SPEED=0,
+    )
+    client = _ScriptedClient(["관리비는 얼마인가요?", "관리비는 십만원입니다."])
+
+    result = await BatchTranscriber(settings, client=client).transcribe(path)
+
+    assert result.chunks == client.calls
+    assert result.audio_seconds == pytest.approx(6.0)
+    starts = [segment.start for segment in result.segments]
+    assert starts == sorted(starts)
+    assert starts[0] == pytest.approx(0.5)
+    assert starts[1] > 2.0
+    assert result.qa_pairs
+    assert result.transcript_segments()[0].text == "관리비는 얼마인가요?"
+
+
+def test_chunk_audio_is_streamed_no_faster_than_the_configured_speed(tmp_path: Path) -> None:
+    settings = Settings(LOGS_DIR=tmp_path / "logs", STT_BATCH_STREAM_SPEED=4.0)
+    pcm = bytes(SAMPLE_RATE * 2)  # one second of audio, ten 100 ms requests
+    sent: List[float] = []
+
+    class _TimingClient:
+        def streaming_recognize(self, requests: Iterable[Any], config: Any = None):
+            started = time.monotonic()
+            for _ in requests:
+                sent.append(time.monotonic() - started)
+            return iter([])
+
+    BatchTranscriber(settings)._recognize_sync(_TimingClient(), AudioChunk(index=0, offset=0.0, pcm=pcm))
+
+    assert len(sent) == 10
+    # Request N carries audio starting at N * 100 ms, so at 4x it may not leave before N * 25 ms.
+    assert all(at >= index * 0.025 - 0.005 for index, at in enumerate(sent))
+    assert sent[-1] < 0.5
+
+
+class _Records:
+    """In-memory stand-in for STTBatchJobRepository (shared by every "API worker" in a test)."""
+
+    def __init__(self) -> None:
+        self.documents: Dict[str, Dict[str, Any]] = {}
+
+    async def create(self, job: Dict[str, Any]) -> None:
+        self.documents[job["job_id"]] = dict(job)
+
+    async def get(self, job_id: str):
+        document = self.documents.get(job_id)
+        return dict(document) if document is not None else None
+
+    async def update(self, job_id: str, fields: Dict[str, Any]) -> None:
+        self.documents[job_id].update(fields)
+
+    async def finish(self, job_id: str, fields: Dict[str, Any]) -> None:
+        self.documents[job_id].update(fields, finished_at=1.0, expires=True)
+
+
+def _batch_use_case(tmp_path: Path, records: _Records, delay: float = 0.0, jobs: Any = None):
+    settings = Settings(
+        STORAGE_DIR=tmp_path / "recordings",
+        ANALYSIS_DIR=tmp_path / "analysis",
+        LOGS_DIR=tmp_path / "logs",
+        STT_BATCH_SHUTDOWN_GRACE_SEC=0.05,
+    )
+    transcriber = MagicMock()
+
+    async def transcribe(path: Path):
+        await asyncio.sleep(delay)
+        return SimpleNamespace(
+            qa_pairs=[], segments=[1, 2], audio_seconds=6.0, elapsed_seconds=0.5, transcript_segments=lambda: [],
+        )
+
+    transcriber.transcribe = AsyncMock(side_effect=transcribe)
+    result_use_case = MagicMock()
+    result_use_case.persist_session_store = AsyncMock()
+    return STTBatchTranscriptionUseCase(settings, result_use_case, records, jobs, transcriber)
+
+
+@pytest.mark.asyncio
+async def test_batch_jobs_are_visible_to_every_worker_and_drained_on_shutdown(tmp_path: Path) -> None:
+    records = _Records()
+    upload = tmp_path / "upload.wav"
+    upload.write_bytes(b"RIFF")
+    api_worker, other_worker = _batch_use_case(tmp_path, records), _batch_use_case(tmp_path, records)
+
+    job = await api_worker.submit("room-1", upload, delete_after=True)
+    await api_worker.shutdown()
+
+    stored = await other_worker.get_job(job.job_id)
+    assert stored.status == "completed" and stored.segments == 2
+    assert records.documents[job.job_id]["expires"]
+    assert not upload.exists()
+
+
+@pytest.mark.asyncio
+async def test_shutdown_marks_unfinished_jobs_failed(tmp_path: Path) -> None:
+    records = _Records()
+    use_case = _batch_use_case(tmp_path, records, delay=5.0)
+
+    job = await use_case.submit("room-1", tmp_path / "session.wav")
+    await use_case.shutdown()
+
+    assert (await use_case.get_job(job.job_id)).status == "failed"
+    assert records.documents[job.job_id]["error"] == "interrupted by shutdown"
+
+
+@pytest.mark.asyncio
+async def test_batch_jobs_go_to_the_job_queue_when_enabled(tmp_path: Path) -> None:
+    jobs = MagicMock()
+    jobs.enqueue = AsyncMock()
+    use_case = _batch_use_case(tmp_path, _Records(), jobs=jobs)
+
+    job = await use_case.submit("room-1", tmp_path / "session.wav")
+
+    jobs.enqueue.assert_awaited_once_with(
+        STT_BATCH_JOB, {"job_id": job.job_id, "path": str(tmp_path / "session.wav"), "delete_after": False},
+    )
+    use_case._transcriber.transcribe.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_batch_from_a_session_recording_requires_the_session_owner(monkeypatch: pytest.MonkeyPatch) -> None:
+    from app.api.v1 import stt as stt_api
+
+    live = {"live-1": SimpleNamespace(user_id="owner")}
+    monkeypatch.setattr(stt_api, "session_manager", SimpleNamespace(lookup=AsyncMock(side_effect=live.get)))
+    rooms = MagicMock()
+    rooms.get_room = AsyncMock(side_effect=lambda user_id, room_id: {"room_id": room_id} if user_id == "owner" else None)
+    stt = MagicMock()
+    stt.get_session_room_id = AsyncMock(side_effect={"done-1": "room-1"}.get)
+
+    assert await stt_api._owns_session("owner", "live-1", rooms, stt)
+    assert not await stt_api._owns_session("intruder", "live-1", rooms, stt)
+    assert await stt_api._owns_session("owner", "done-1", rooms, stt)
+    assert not await stt_api._owns_session("intruder", "done-1", rooms, stt)
+    assert not await stt_api._owns_session("owner", "unknown", rooms, stt)
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.sessions import events
+from app.sessions.broadcast import SessionBroadcast
+
+
+class _TextWebSocket:
+    def __init__(self, gate: Optional[asyncio.Event] = None) -> None:
+        self.frames: List[str] = []
+        self.close_code: Optional[int] = None
+        self._gate = gate
+
+    async def send_text(self, text: str) -> None:
+        if self._gate is not None:
+            await self._gate.wait()
+        self.frames.append(text)
+
+    async def close(self, code: int = 1000) -> None:
+        self.close_code = code
+
+
+@pytest.mark.asyncio
+async def test_events_are_encoded_once_and_fanned_out() -> None:
+    primary, observer_ws = _TextWebSocket(), _TextWebSocket()
+    hub = SessionBroadcast(primary)
+    observer = hub.subscribe(observer_ws)
+    assert observer is not None
+
+    await events.emit_partial(hub, "안녕하세요")
+    await events.emit_rtc_candidate(hub, {"candidate": None})
+    await hub.close()
+
+    assert len(primary.frames) == 2
+    # Same bytes as starlette's send_json; signalling stays with the primary client.
+    assert observer_ws.frames == [primary.frames[0]]
+    assert primary.frames[0] == events.encode({"event": "stt.partial", "data": {"text": "안녕하세요"}})
+
+
+@pytest.mark.asyncio
+async def test_lagging_observer_is_dropped_without_blocking_primary() -> None:
+    primary, stuck = _TextWebSocket(), _TextWebSocket(gate=asyncio.Event())
+    hub = SessionBroadcast(primary, max_queue=2)
+    observer = hub.subscribe(stuck)
+    assert observer is not None
+
+    for index in range(5):
+        await events.emit_partial(hub, str(index))
+    await asyncio.gather(observer.done, return_exceptions=True)
+
+    assert len(primary.frames) == 5
+    assert hub.observer_count == 0
+    assert stuck.close_code == 1013
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+from typing import List
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.sessions.flight_recorder import Entry, FlightRecorder
+
+
+def test_ring_wraps_but_keeps_milestones() -> None:
+    recorder = FlightRecorder("s1", capacity=4)
+    recorder.record("offer.received")
+    recorder.record("audio.first_frame")
+    recorder.record("stt.first_partial", chars=3)
+    for index in range(10):
+        recorder.record("stt.final", index=index)
+
+    snapshot = recorder.snapshot()
+
+    assert [event["index"] for event in snapshot["events"]] == [6, 7, 8, 9]
+    assert snapshot["overwritten"] == 9
+    assert set(snapshot["milestones"]) == {"offer.received", "audio.first_frame", "stt.first_partial"}
+    assert snapshot["time_to_first_word_ms"] >= 0
+    assert not snapshot["failed"]
+
+
+def test_sink_forwards_entries_and_errors_mark_failure(tmp_path: Path) -> None:
+    forwarded: List[Entry] = []
+    worker_side = FlightRecorder("s1", sink=forwarded.append)
+    api_side = FlightRecorder("s1")
+
+    worker_side.record("stream.opened", backend="fake")
+    worker_side.record("error", code="UPSTREAM_FAIL")
+    for entry in forwarded:
+        api_side.add(entry)
+
+    assert worker_side.snapshot()["events"] == []
+    assert api_side.failed
+    path = api_side.dump(tmp_path)
+    dumped = json.loads(path.read_text(encoding="utf-8"))
+    assert [event["event"] for event in dumped["events"]] == ["stream.opened", "error"]
+    assert "stream.opened" in dumped["milestones"]
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.core.config import Settings
+from app.core.metrics import REGISTRY
+from app.sessions.manager import SessionManager
+from app.sessions.registry import SessionRegistry
+
+
+class _RecordingWebSocket:
+    def __init__(self) -> None:
+        self.sent: List[Any] = []
+
+    async def send_json(self, payload: Any) -> None:
+        self.sent.append(payload)
+
+    async def send_text(self, text: str) -> None:
+        self.sent.append(json.loads(text))
+
+
+@pytest.mark.asyncio
+async def test_reaper_stops_sessions_without_signalling(tmp_path: Path) -> None:
+    settings = Settings(
+        STORAGE_DIR=tmp_path / "recordings",
+        ANALYSIS_DIR=tmp_path / "analysis",
+        LOGS_DIR=tmp_path / "logs",
+        STT_IDLE_SIGNAL_TIMEOUT_SEC=30,
+    )
+    registry = SessionRegistry()
+    manager = SessionManager(settings, registry=registry)
+    websocket = _RecordingWebSocket()
+
+    stale = await manager.create_session(websocket, user_id="u1")
+    fresh = await manager.create_session(websocket, user_id="u1")
+    stale._last_signal_at -= 31
+
+    usage = await manager.resource_usage()
+    by_id = {item["session_id"]: item for item in usage["sessions"]}
+    assert by_id[stale.session_id]["audio_idle_sec"] is None
+    assert by_id[stale.session_id]["signal_idle_sec"] >= 31
+    assert by_id[fresh.session_id]["open_files"] >= 1
+
+    await manager.start()
+    metrics = REGISTRY.render().splitlines()
+    assert "stt_sessions_active 2" in metrics
+    assert any(line.startswith("executor_threads{state=") for line in metrics)
+
+    assert await manager.reap_idle() == [stale.session_id]
+    assert await manager.get(stale.session_id) is None
+    assert await registry.get(stale.session_id) is None
+    assert await manager.get(fresh.session_id) is fresh
+    closes = [item for item in websocket.sent if item["event"] == "session.close"]
+    assert closes[0]["data"]["reason"].startswith("idle timeout")
+    assert "stt_sessions_active 1" in REGISTRY.render().splitlines()
+
+    await manager.shutdown()
+    assert "stt_sessions_active" not in REGISTRY.render()
+
+
+@pytest.mark.asyncio
+async def test_finished_session_timeline_is_retained(tmp_path: Path) -> None:
+    settings = Settings(
+        STORAGE_DIR=tmp_path / "recordings",
+        ANALYSIS_DIR=tmp_path / "analysis",
+        LOGS_DIR=tmp_path / "logs",
+        STT_FLIGHT_RETAINED_SESSIONS=1,
+    )
+    manager = SessionManager(settings, registry=SessionRegistry())
+    first = await manager.create_session(_RecordingWebSocket())
+    second = await manager.create_session(_RecordingWebSocket())
+    first.flight.record("error", code="RTC_FAILED")
+
+    assert (await manager.flight_record(first.session_id))["live"] is True
+    await manager.remove(first.session_id, reason="test")
+    await manager.remove(second.session_id, reason="test")
+
+    # Only the most recent finished session is kept; the failed one was also dumped to disk.
+    assert await manager.flight_record(first.session_id) is None
+    timeline = await manager.flight_record(second.session_id)
+    assert timeline["live"] is False
+    assert timeline["events"][-1]["event"] == "session.closed"
+    assert (tmp_path / "logs" / "flight" / f"{first.session_id}.json").exists()
+
+    await manager.shutdown()
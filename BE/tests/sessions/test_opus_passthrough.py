@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import queue
+import struct
+import sys
+from fractions import Fraction
+from pathlib import Path
+from types import SimpleNamespace
+
+import av
+import numpy as np
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.sessions.opus_passthrough import OggOpusWriter, OpusPassthroughTap, opus_packet_samples
+
+
+def _encode(seconds: float) -> list[bytes]:
+    encoder = av.CodecContext.create("libopus", "w")
+    encoder.sample_rate = 48000
+    encoder.layout = "mono"
+    encoder.format = "s16"
+    encoder.time_base = Fraction(1, 48000)
+    samples = (np.sin(np.arange(int(seconds * 48000)) / 10) * 8000).astype(np.int16)
+
+    packets: list[bytes] = []
+    for offset in range(0, len(samples), 960):
+        frame = av.AudioFrame.from_ndarray(samples[offset : offset + 960].reshape(1, -1), format="s16", layout="mono")
+        frame.sample_rate = 48000
+        frame.pts = offset
+        packets.extend(bytes(packet) for packet in encoder.encode(frame))
+    return packets
+
+
+def test_opus_packet_samples_reads_toc() -> None:
+    assert opus_packet_samples(b"") == 0
+    assert opus_packet_samples(bytes([0xF8, 0x00])) == 960  # CELT FB 20 ms, 1 frame
+    assert opus_packet_samples(bytes([0xF9, 0x00])) == 1920  # two 20 ms frames
+    assert opus_packet_samples(bytes([0x1B, 0x03])) == 3 * 2880  # SILK 60 ms, code 3 with 3 frames
+
+
+def test_ogg_stream_round_trips_through_decoder(tmp_path: Path) -> None:
+    packets = _encode(1.0)
+    writer = OggOpusWriter(packets_per_page=5)
+
+    stream = bytearray()
+    for packet in packets:
+        stream += writer.append(packet)
+    stream += writer.flush(eos=True)
+
+    path = tmp_path / "stream.ogg"
+    path.write_bytes(bytes(stream))
+
+    decoded = 0
+    with av.open(str(path)) as container:
+        for frame in container.decode(audio=0):
+            decoded += frame.samples
+
+    assert stream.startswith(b"OggS")
+    assert decoded == pytest.approx(sum(opus_packet_samples(p) for p in packets) - 312, abs=960)
+
+
+def _pages(stream: bytes) -> list[tuple[int, int]]:
+    """(header_type, sequence) of every Ogg page in ``stream``."""
+    pages: list[tuple[int, int]] = []
+    offset = 0
+    while offset < len(stream):
+        assert stream[offset : offset + 4] == b"OggS"
+        (sequence,) = struct.unpack_from("<I", stream, offset + 18)
+        segments = stream[offset + 26]
+        body = sum(stream[offset + 27 : offset + 27 + segments])
+        pages.append((stream[offset + 5], sequence))
+        offset += 27 + segments + body
+    return pages
+
+
+def test_ogg_pages_are_in_sequence_with_headers_first() -> None:
+    writer = OggOpusWriter(packets_per_page=3)
+    stream = bytearray()
+    for packet in _encode(0.5):
+        stream += writer.append(packet)
+    stream += writer.flush(eos=True)
+
+    pages = _pages(bytes(stream))
+    assert [sequence for _, sequence in pages] == list(range(len(pages)))
+    assert pages[0][0] & 0x02 and not any(header_type & 0x02 for header_type, _ in pages[1:])
+    assert stream[28:36] == b"OpusHead"
+    assert pages[-1][0] & 0x04
+    assert writer.headers() == b""
+
+
+@pytest.mark.asyncio
+async def test_tap_diverts_opus_frames_and_forwards_sentinel() -> None:
+    decoder_queue: queue.Queue = queue.Queue()
+    receiver = SimpleNamespace(_RTCRtpReceiver__decoder_queue=decoder_queue)
+    tap = OpusPassthroughTap.install(receiver)
+    assert tap is not None
+    assert OpusPassthroughTap.install(receiver) is tap
+
+    opus = SimpleNamespace(name="opus")
+    pcmu = SimpleNamespace(name="PCMU")
+    tap.put((opus, SimpleNamespace(data=b"\xf8abc")))
+    tap.put((pcmu, SimpleNamespace(data=b"raw")))
+    tap.put(None)
+
+    assert await tap.recv() == b"\xf8abc"
+    assert await tap.recv() is None
+    assert decoder_queue.get_nowait()[0] is pcmu
+    assert decoder_queue.get_nowait() is None
+
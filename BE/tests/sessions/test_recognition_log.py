@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import sys
+from datetime import timedelta
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from google.cloud.speech_v1 import types as speech_types
+
+from app.sessions.recognition_log import ResponseRecorder, read_responses
+from app.sessions.speech_backends import ReplaySpeechClient
+
+
+def _response(text: str, final: bool) -> speech_types.StreamingRecognizeResponse:
+    word = speech_types.WordInfo(word=text, start_time=timedelta(seconds=1.25), end_time=timedelta(seconds=2))
+    return speech_types.StreamingRecognizeResponse(
+        results=[
+            speech_types.StreamingRecognitionResult(
+                alternatives=[speech_types.SpeechRecognitionAlternative(transcript=text, words=[word])],
+                is_final=final,
+            ),
+        ],
+    )
+
+
+def test_recording_round_trips_and_tolerates_truncated_tail(tmp_path: Path) -> None:
+    recorder = ResponseRecorder.for_session(tmp_path, "s1")
+    responses = [_response("관리비", False), _response("관리비는 얼마인가요?", True)]
+    for response in responses:
+        recorder.write(response)
+    recorder.close()
+
+    with recorder.path.open("ab") as handle:
+        handle.write(b"\x40\x00\x00\x00")  # half a record header, as after a crash
+
+    replayed = list(read_responses(recorder.path))
+    assert [response for _, response in replayed] == responses
+    assert replayed[0][0] <= replayed[1][0]
+    assert replayed[1][1].results[0].alternatives[0].words[0].start_time == timedelta(seconds=1.25)
+
+
+def test_replay_client_drains_requests_and_yields_recording(tmp_path: Path) -> None:
+    recorder = ResponseRecorder(tmp_path / "session.sttr")
+    recorder.write(_response("네", True))
+    recorder.close()
+
+    consumed = []
+    requests = (consumed.append(index) or speech_types.StreamingRecognizeRequest() for index in range(3))
+    client = ReplaySpeechClient(recorder.path, realtime=False)
+
+    replies = list(client.streaming_recognize(requests=requests))
+
+    assert [reply.results[0].alternatives[0].transcript for reply in replies] == ["네"]
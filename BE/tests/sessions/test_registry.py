@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.sessions.registry import SessionRecord, SessionRegistry, SQLiteSessionRegistry
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def registry(request: pytest.FixtureRequest, tmp_path: Path) -> SessionRegistry:
+    if request.param == "sqlite":
+        return SQLiteSessionRegistry(tmp_path / "sessions.db")
+    return SessionRegistry()
+
+
+@pytest.mark.asyncio
+async def test_cross_worker_stop_is_delivered_to_owner(registry: SessionRegistry) -> None:
+    now = time.time()
+    await registry.register(SessionRecord("s1", "worker-a", "host", user_id="u1", created_at=now, heartbeat_at=now))
+    await registry.register(SessionRecord("s2", "worker-b", "host", user_id="u1", created_at=now, heartbeat_at=now))
+
+    assert await registry.count(user_id="u1") == 2
+    assert await registry.request_stop("s2") is True
+    assert await registry.request_stop("missing") is False
+
+    assert await registry.heartbeat("worker-a", ["s1"]) == []
+    assert await registry.heartbeat("worker-b", ["s2"]) == ["s2"]
+
+
+@pytest.mark.asyncio
+async def test_purge_stale_drops_dead_worker_records(registry: SessionRegistry) -> None:
+    now = time.time()
+    await registry.register(SessionRecord("alive", "worker-a", "host", created_at=now, heartbeat_at=now))
+    await registry.register(SessionRecord("dead", "worker-b", "host", created_at=now, heartbeat_at=now - 60))
+
+    assert await registry.purge_stale(15) == 1
+    assert await registry.get("dead") is None
+    assert (await registry.get("alive")).worker_id == "worker-a"
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pytest
+from pydantic import ValidationError
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.models import QAPair, TranscriptSegment
+from app.services.stt_service import STTService
+from app.core.config import Settings
+from app.sessions.diarization import Segment
+from app.sessions.qa_extractor import QAExtractor
+from app.sessions.session_store import QAPairStore, SegmentStore, SpillLog
+
+_PAIR = {
+    "q_text": "관리비는 얼마인가요?",
+    "q_speaker": 1,
+    "q_time": 2.0,
+    "a_text": "관리비는 십만원입니다.",
+    "a_speaker": 2,
+    "a_time": 2.4,
+    "confidence": 0.9,
+}
+
+
+class _Repository:
+    def __init__(self) -> None:
+        self.saved: List[Dict[str, Any]] = []
+
+    async def upsert_documents(
+        self,
+        room_id: str,
+        qa: List[Dict[str, Any]],
+        transcript: Dict[str, Any],
+        session_id: Optional[str] = None,
+    ) -> None:
+        self.saved.append({"room_id": room_id, "qa": qa, "transcript": transcript})
+
+
+def test_segment_store_matches_model_documents() -> None:
+    store = SegmentStore([Segment(speaker=1, text="안녕하세요", start=0.5, end=1.25)])
+    store.append(Segment(speaker=None, text="네", start=1.5, end=2.0))
+
+    assert len(store) == 2
+    assert store.last_end == 2.0
+    assert store[0] == Segment(speaker=1, text="안녕하세요", start=0.5, end=1.25)
+    assert store.to_documents() == [
+        TranscriptSegment.from_values(1, 0.5, 1.25, "안녕하세요").model_dump(),
+        TranscriptSegment.from_values(None, 1.5, 2.0, "네").model_dump(),
+    ]
+
+
+def test_qa_store_returns_only_new_pairs() -> None:
+    store = QAPairStore()
+
+    assert store.register([_PAIR]) == [_PAIR]
+    assert store.register([dict(_PAIR), {**_PAIR, "a_time": 3.0}]) == [{**_PAIR, "a_time": 3.0}]
+    assert len(store) == 2
+    assert store.to_documents()[0] == QAPair.model_validate(_PAIR).model_dump()
+
+
+@pytest.mark.asyncio
+async def test_save_documents_validates_once_before_writing() -> None:
+    repository = _Repository()
+    service = STTService(repository)
+    segments = SegmentStore([Segment(speaker=None, text="네", start=0.0, end=0.5)])
+
+    await service.save_documents("room-1", [_PAIR], segments.to_documents())
+    assert repository.saved[0]["transcript"] == {"segments": segments.to_documents()}
+
+    with pytest.raises(ValidationError):
+        await service.save_documents("room-1", [{**_PAIR, "confidence": 1.5}], [])
+    assert len(repository.saved) == 1
+
+
+def test_spilled_segments_are_merged_back_in_order(tmp_path: Path) -> None:
+    spill = SpillLog(tmp_path / "session.segments")
+    store = SegmentStore(spill=spill, memory_limit=4)
+    segments = [Segment(speaker=index % 3 or None, text=f"문장 {index}", start=index, end=index + 0.5) for index in range(23)]
+    for segment in segments:
+        store.append(segment)
+
+    assert store.spilled >= 18
+    assert len(store) == 23
+    assert store[0] == segments[0] and store[-1] == segments[-1]
+    assert list(store) == segments
+    assert store.to_documents() == SegmentStore(segments).to_documents()
+    assert store.memory_bytes < SegmentStore(segments).memory_bytes
+
+    store.close()
+    assert not spill.path.exists()
+
+
+def test_spilled_qa_pairs_are_merged_back_in_order(tmp_path: Path) -> None:
+    store = QAPairStore(spill=SpillLog(tmp_path / "session.qa"), memory_limit=2)
+    pairs = [{**_PAIR, "a_time": float(index)} for index in range(9)]
+    for pair in pairs:
+        store.register([pair])
+
+    assert store.spilled
+    assert store.to_documents() == pairs
+    store.close(delete=False)
+    assert (tmp_path / "session.qa").exists()
+
+
+def test_qa_extractor_ignores_blank_segments_and_never_repeats_a_pair(tmp_path: Path) -> None:
+    extractor = QAExtractor(Settings(LOGS_DIR=tmp_path, QA_SENTENCE_WINDOW=2))
+
+    assert extractor.append_segments([Segment(speaker=1, text="관리비는 얼마인가요?", start=0.0, end=1.0)]) == []
+    # Silence finals carry no text; they must not take the question's place in the window.
+    extractor.append_segments([Segment(speaker=2, text="  ", start=1.0, end=1.2) for _ in range(3)])
+    pairs = extractor.append_segments([Segment(speaker=2, text="십만원입니다.", start=1.5, end=2.5)])
+
+    assert [(pair["q_text"], pair["a_text"]) for pair in pairs] == [("관리비는 얼마인가요?", "십만원입니다.")]
+    assert extractor.append_segments([Segment(speaker=1, text="네 알겠습니다.", start=3.0, end=3.5)]) == []
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.sessions.shm_ring import SharedAudioRing
+
+
+def test_ring_wraps_and_rejects_when_full() -> None:
+    ring = SharedAudioRing.create(capacity=64)
+    reader = SharedAudioRing.attach(ring.name)
+    try:
+        assert reader.read() is None
+        assert ring.write(b"a" * 20, 48000, 2)
+        assert ring.write(b"b" * 20, 48000, 2)
+        # 2 x (10-byte header + 20) = 60 of 64 bytes used.
+        assert not ring.write(b"c" * 20, 48000, 2)
+
+        assert reader.read() == (b"a" * 20, 48000, 2)
+        # This record straddles the end of the buffer.
+        assert ring.write(b"d" * 20, 16000, 0)
+        assert reader.read() == (b"b" * 20, 48000, 2)
+        assert reader.read() == (b"d" * 20, 16000, 0)
+        assert reader.read() is None
+        assert ring.pending_bytes == 0
+    finally:
+        reader.close()
+        ring.close()